@@ -6,8 +6,8 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 from pydantic import BaseModel
 import logging
-import openai
 from config import Config
+from llm_client import llm_client
 
 logger = logging.getLogger(__name__)
 
@@ -39,12 +39,12 @@ class BaseAgent(ABC):
     def _setup_llm(self):
         """LLM 설정"""
         try:
-            # Azure OpenAI 설정은 이미 mvp_main.py에서 설정됨
+            # 공용 클라이언트 사용 (연결 풀·재시도·타임아웃 공유)
             logger.debug(f"🔧 [DEBUG] Azure OpenAI 설정 확인")
             logger.debug(f"🔧 [DEBUG] Endpoint: {Config.AZURE_ENDPOINT}")
             logger.debug(f"🔧 [DEBUG] Deployment: {Config.DEPLOYMENT_NAME}")
             
-            return openai
+            return llm_client
         except Exception as e:
             logger.error(f"❌ LLM 설정 실패: {e}")
             raise
@@ -8,8 +8,6 @@ import re
 from typing import Dict, Any, List, Tuple
 from .base_agent import BaseAgent, AgentState
 from prompt import ExamPrompts
-import openai
-from config import Config
 
 logger = logging.getLogger(__name__)
 
@@ -159,9 +157,8 @@ class InformationValidationAgent(BaseAgent):
             # 검증 프롬프트 생성
             prompt = self._create_validation_prompt(query, chunk, chunk_index, metadata)
             
-            # 직접 OpenAI API 호출
-            response = self.llm.chat.completions.create(
-                model=Config.DEPLOYMENT_NAME,
+            # 공용 클라이언트로 OpenAI API 호출 (재시도·타임아웃 적용)
+            response = self.llm.create(
                 messages=[
                     {"role": "system", "content": ExamPrompts.get_system_prompts("정보시스템감리사")["validation_assistant"]},
                     {"role": "user", "content": prompt}
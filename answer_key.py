@@ -0,0 +1,184 @@
+"""
+기출문제 PDF 정답표 파싱
+수집 시 정답표(문항 번호 → 정답 보기)를 찾아 문제 은행의 문제별 correct_option으로 연결합니다.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# 원문자 보기 번호
+OPTION_SYMBOLS = {"①": 1, "②": 2, "③": 3, "④": 4, "⑤": 5}
+OPTION_NUMERALS = {number: symbol for symbol, number in OPTION_SYMBOLS.items()}
+
+# 정답표 머리글 (번호 행/열과 정답 행/열)
+NUMBER_LABELS = ("문항", "번호", "문제", "문항번호")
+ANSWER_LABELS = ("정답", "답", "가답안", "최종정답", "최종답안")
+
+# 정답표 구역 제목 (예: "정답", "[정답표]", "## 최종 정답")
+ANSWER_HEADING_PATTERN = re.compile(r'^[#\s\[(【<*]*(?:최종\s*)?(?:가?정답|답안)(?:표|\s*및\s*해설)?[\s\])】>*]*$')
+
+# 본문형 정답 쌍 (예: "1. ③", "2-①", "3 ④")
+INLINE_PAIR_PATTERN = re.compile(r'(?<!\d)(\d{1,3})\s*[.)\-:]?\s*([①②③④⑤])')
+
+# 정답표로 인정할 최소 문항 수 (보기 줄을 정답표로 오인하지 않도록)
+MIN_ANSWER_ENTRIES = 5
+# 정답 구역 밖의 줄은 연속 번호 쌍이 이 개수 이상이어야 정답 줄로 인정
+INLINE_MIN_PAIRS = 4
+
+
+def parse_option(value: str, allow_digits: bool = False) -> Optional[int]:
+    """정답 값을 보기 번호로 변환 (①, allow_digits면 3/3번도 허용, 복수 정답·빈 값은 None)"""
+    value = re.sub(r'\s+', '', value or "")
+    if value in OPTION_SYMBOLS:
+        return OPTION_SYMBOLS[value]
+    match = re.fullmatch(r'([1-5])번?', value) if allow_digits else None
+    return int(match.group(1)) if match else None
+
+
+def _parse_number(value: str) -> Optional[int]:
+    """문항 번호 셀 값을 정수로 변환"""
+    match = re.fullmatch(r'(\d{1,3})번?\.?', re.sub(r'\s+', '', value or ""))
+    return int(match.group(1)) if match else None
+
+
+def _cell_label(value: str) -> Optional[str]:
+    """머리글 셀 종류 (number / answer / None)"""
+    value = re.sub(r'\s+', '', value or "")
+    if value in NUMBER_LABELS:
+        return "number"
+    if value in ANSWER_LABELS:
+        return "answer"
+    return None
+
+
+def _split_cells(line: str) -> Optional[List[str]]:
+    """Markdown 표 행을 셀 목록으로 분리 (표 행이 아니거나 구분선이면 None)"""
+    stripped = line.strip()
+    if not stripped.startswith('|'):
+        return None
+    cells = [cell.strip() for cell in stripped.strip('|').split('|')]
+    if all(re.fullmatch(r':?-{3,}:?', cell) or not cell for cell in cells):
+        return None
+    return cells
+
+
+def _parse_table(rows: List[Tuple[int, List[str]]], answers: Dict[int, int], used_lines: set):
+    """Markdown 표 하나에서 정답 쌍 수집 (가로형: 번호 행 + 정답 행, 세로형: 번호 열 + 정답 열)"""
+    column_pairs = None
+    k = 0
+    while k < len(rows):
+        line_idx, cells = rows[k]
+        labels = [_cell_label(cell) for cell in cells]
+        
+        # 세로형 머리글 (예: | 번호 | 정답 | 번호 | 정답 |)
+        pairs = [(i, i + 1) for i in range(len(cells) - 1) if labels[i] == "number" and labels[i + 1] == "answer"]
+        if pairs:
+            column_pairs = pairs
+            used_lines.add(line_idx)
+            k += 1
+            continue
+        
+        # 가로형 (예: | 문항 | 1 | 2 | ... 다음 줄 | 정답 | ③ | ① | ...)
+        body = cells[1:] if labels[0] else cells
+        numbers = [_parse_number(cell) for cell in body]
+        if (k + 1 < len(rows) and labels[0] != "answer" and sum(n is not None for n in numbers) >= 2
+                and all(n is not None or not cell for n, cell in zip(numbers, body))):
+            next_idx, next_cells = rows[k + 1]
+            next_label = _cell_label(next_cells[0])
+            next_body = next_cells[1:] if next_label else next_cells
+            found = [(n, parse_option(cell, allow_digits=next_label == "answer")) for n, cell in zip(numbers, next_body)]
+            found = [(n, option) for n, option in found if n is not None and option is not None]
+            if found:
+                for n, option in found:
+                    answers.setdefault(n, option)
+                used_lines.update((line_idx, next_idx))
+                k += 2
+                continue
+        
+        # 세로형 데이터 행 (머리글이 없으면 번호 셀 바로 뒤의 원문자 셀만 인정)
+        candidates = column_pairs or [(i, i + 1) for i in range(len(cells) - 1)]
+        found_row = False
+        for number_col, answer_col in candidates:
+            if answer_col >= len(cells):
+                continue
+            n = _parse_number(cells[number_col])
+            option = parse_option(cells[answer_col], allow_digits=column_pairs is not None)
+            if n is not None and option is not None:
+                answers.setdefault(n, option)
+                found_row = True
+        if found_row:
+            used_lines.add(line_idx)
+        k += 1
+
+
+def _parse_inline(line: str, in_answer_section: bool) -> List[Tuple[int, int]]:
+    """본문형 정답 줄에서 (번호, 보기) 쌍 추출 (정답 줄이 아니면 빈 목록)"""
+    pairs = [(int(number), OPTION_SYMBOLS[symbol]) for number, symbol in INLINE_PAIR_PATTERN.findall(line)]
+    if not pairs:
+        return []
+    
+    # 쌍 이외의 내용이 남아 있으면 문제/보기 본문으로 판단
+    residue = re.sub(r'[\s.,)\-:|/]', '', INLINE_PAIR_PATTERN.sub('', line))
+    if residue:
+        return []
+    
+    numbers = [number for number, _ in pairs]
+    if in_answer_section:
+        return pairs if all(a < b for a, b in zip(numbers, numbers[1:])) else []
+    # 정답 구역 밖에서는 연속 번호가 충분히 이어질 때만 인정 (예: "① 10 ② 20" 보기 줄 제외)
+    if len(pairs) >= INLINE_MIN_PAIRS and all(b == a + 1 for a, b in zip(numbers, numbers[1:])):
+        return pairs
+    return []
+
+
+def parse_answer_key(full_text: str) -> Dict[str, Any]:
+    """Markdown 원문에서 정답표 파싱 ({"answers": {문항 번호: 보기 번호}, "lines": 정답표 줄 번호 목록})"""
+    lines = full_text.split('\n')
+    answers: Dict[int, int] = {}
+    used_lines: set = set()
+    
+    in_answer_section = False
+    table_rows: List[Tuple[int, List[str]]] = []
+    for line_idx, line in enumerate(lines + [""]):
+        stripped = line.strip()
+        if stripped.startswith('|'):
+            cells = _split_cells(line)
+            if cells:
+                table_rows.append((line_idx, cells))
+            continue
+        if table_rows:
+            _parse_table(table_rows, answers, used_lines)
+            table_rows = []
+        
+        if not stripped:
+            continue
+        if ANSWER_HEADING_PATTERN.match(stripped):
+            in_answer_section = True
+            used_lines.add(line_idx)
+            continue
+        
+        pairs = _parse_inline(stripped, in_answer_section)
+        if pairs:
+            for number, option in pairs:
+                answers.setdefault(number, option)
+            used_lines.add(line_idx)
+        else:
+            in_answer_section = False
+    
+    if len(answers) < MIN_ANSWER_ENTRIES:
+        return {"answers": {}, "lines": []}
+    return {
+        "answers": {str(number): option for number, option in sorted(answers.items())},
+        "lines": sorted(used_lines)
+    }
+
+
+def link_answer_key(questions: List[Dict[str, Any]], answers: Dict[str, int]) -> int:
+    """문제별 correct_option 설정 (연결된 문제 수 반환)"""
+    linked = 0
+    for question in questions:
+        option = answers.get(str(question.get("number")))
+        if option is not None:
+            question["correct_option"] = option
+            linked += 1
+    return linked
@@ -0,0 +1,229 @@
+"""
+추출된 기출문제 정답·해설 사전 계산
+문제 은행(<base>_questions.json)의 문제마다 정답·해설·검토 결과를 한 번만 계산해 <base>_answers.json에 저장합니다.
+중단되어도 저장된 문제는 건너뛰고 이어서 계산하며, 기출문제 그대로 출제 모드는 이 결과를 모델 호출 없이 조회합니다.
+"""
+
+import os
+import json
+import hashlib
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from config import Config
+from prompt import ExamPrompts
+from review_agent_simple import review_agent
+from llm_client import llm_client
+from rate_limiter import rate_limiter, PRIORITY_BACKGROUND
+from answer_key import OPTION_NUMERALS
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+def parse_question_sections(result: str) -> Dict[str, str]:
+    """모델 응답에서 정답과 해설 추출 (=== 정답 === / === 해설 === 구역)"""
+    answer = ""
+    explanation_lines = []
+    section = None
+    
+    for line in result.split('\n'):
+        if "=== 정답 ===" in line:
+            section = "answer"
+            continue
+        elif "=== 해설 ===" in line:
+            section = "explanation"
+            continue
+        elif "===" in line:
+            section = None
+            continue
+        
+        if section == "answer" and line.strip():
+            answer = line.strip()
+        elif section == "explanation" and line.strip():
+            explanation_lines.append(line.strip())
+    
+    return {"answer": answer, "explanation": "\n".join(explanation_lines)}
+
+
+def question_hash(text: str) -> str:
+    """문제 본문 해시 (재추출로 본문이 바뀐 문제는 다시 계산)"""
+    return hashlib.md5((text or "").encode()).hexdigest()
+
+
+class AnswerPrecomputer:
+    """문제 은행 단위 정답·해설 사전 계산기 (모델 호출 동시 실행 수 제한)"""
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max(1, max_workers or Config.PRECOMPUTE_MAX_CONCURRENCY)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="precompute")
+        self._lock = threading.Lock()
+        self._file_locks: Dict[str, threading.Lock] = {}
+        self._cache: Dict[str, tuple] = {}  # {answers_file: (mtime, entries)}
+    
+    @staticmethod
+    def answers_file_for(bank_file: Path) -> Path:
+        """문제 은행에 대응하는 정답·해설 파일 경로"""
+        bank_file = Path(bank_file)
+        return bank_file.with_name(bank_file.name.replace("_questions.json", "_answers.json"))
+    
+    def _file_lock(self, path: Path) -> threading.Lock:
+        """파일별 쓰기 잠금"""
+        with self._lock:
+            return self._file_locks.setdefault(str(path), threading.Lock())
+    
+    def load_answers(self, answers_file: Path) -> Dict[str, Dict[str, Any]]:
+        """저장된 정답·해설 로드 (문제 번호별, 파일이 바뀌지 않았으면 캐시 사용)"""
+        answers_file = Path(answers_file)
+        try:
+            mtime = answers_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        
+        cached = self._cache.get(str(answers_file))
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(answers_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get("answers", {})
+        except Exception as e:
+            logger.warning(f"⚠️ 정답·해설 파일 로드 실패 ({answers_file.name}): {e}")
+            return {}
+        self._cache[str(answers_file)] = (mtime, entries)
+        return entries
+    
+    def _write_answers(self, answers_file: Path, bank: Dict[str, Any], entries: Dict[str, Dict[str, Any]]):
+        """정답·해설 파일 저장 (임시 파일 교체 방식, 문제 하나 계산할 때마다 기록하여 중단 후 재개 가능)"""
+        tmp_file = answers_file.with_suffix(".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "subject": bank.get("subject"),
+                "source_file": bank.get("source_file"),
+                "updated_at": datetime.now().isoformat(),
+                "answers": entries
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, answers_file)
+    
+    def lookup(self, question: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """문제의 사전 계산 결과 조회 (없거나 문제 본문이 바뀌었으면 None)"""
+        bank_file = question.get("bank_file")
+        if not bank_file:
+            return None
+        entry = self.load_answers(self.answers_file_for(Path(bank_file))).get(str(question.get("number")))
+        if entry and entry.get("question_hash") == question_hash(question.get("text", "")):
+            return entry
+        return None
+    
+    def pending_count(self, bank_file: Path) -> int:
+        """아직 계산되지 않은 문제 수"""
+        try:
+            with open(bank_file, 'r', encoding='utf-8') as f:
+                questions = json.load(f).get("questions", [])
+        except Exception:
+            return 0
+        entries = self.load_answers(self.answers_file_for(bank_file))
+        return sum(1 for question in questions if not self._is_current(entries.get(str(question["number"])), question))
+    
+    @staticmethod
+    def _is_current(entry: Optional[Dict[str, Any]], question: Dict[str, Any]) -> bool:
+        """저장된 결과가 현재 문제 본문 기준인지 여부"""
+        return bool(entry) and entry.get("question_hash") == question_hash(question.get("text", ""))
+    
+    def precompute_bank(self, bank_file: Path, progress_callback: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """문제 은행의 미계산 문제만 정답·해설·검토를 계산해 저장"""
+        bank_file = Path(bank_file)
+        answers_file = self.answers_file_for(bank_file)
+        if progress_callback:
+            progress_callback("precomputing")
+        
+        try:
+            with open(bank_file, 'r', encoding='utf-8') as f:
+                bank = json.load(f)
+        except Exception as e:
+            return {"success": False, "error": f"문제 은행 로드 실패: {e}"}
+        
+        exam_name = bank.get("subject") or "정보시스템감리사"
+        questions: List[Dict[str, Any]] = bank.get("questions", [])
+        entries = dict(self.load_answers(answers_file))
+        # 문제 본문이 바뀌었거나 사라진 문제의 결과는 정리
+        current_numbers = {str(question["number"]) for question in questions}
+        entries = {number: entry for number, entry in entries.items() if number in current_numbers}
+        pending = [question for question in questions if not self._is_current(entries.get(str(question["number"])), question)]
+        if not pending:
+            return {"success": True, "message": f"✅ {bank_file.name}: 모든 문제의 정답·해설이 준비되어 있습니다.", "computed": 0}
+        
+        logger.info(f"🧠 [사전 계산] {bank_file.name}: {len(pending)}/{len(questions)}개 문제 계산 시작 (동시 실행: {self.max_workers})")
+        futures = {self._executor.submit(self._compute_in_background, question, exam_name): question for question in pending}
+        computed, failed = 0, 0
+        for future in as_completed(futures):
+            question = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                failed += 1
+                logger.warning(f"⚠️ [사전 계산] {question['number']}번 실패: {e}")
+                continue
+            
+            with self._file_lock(answers_file):
+                entries[str(question["number"])] = entry
+                self._write_answers(answers_file, bank, entries)
+            computed += 1
+        
+        message = f"🧠 {bank_file.name}: 정답·해설 {computed}개 계산" + (f" (실패 {failed}개, 다음 실행 시 재시도)" if failed else "")
+        logger.info(f"✅ [사전 계산] {message}")
+        if computed == 0:
+            return {"success": False, "error": message}
+        return {"success": True, "message": message, "computed": computed, "failed": failed}
+    
+    def _compute_in_background(self, question: Dict[str, Any], exam_name: str) -> Dict[str, Any]:
+        """백그라운드 레인에서 정답·해설 계산 (대화형 요청이 먼저 처리되도록)"""
+        with rate_limiter.lane(PRIORITY_BACKGROUND):
+            return self._compute_entry(question, exam_name)
+    
+    def _compute_entry(self, question: Dict[str, Any], exam_name: str) -> Dict[str, Any]:
+        """문제 하나의 정답·해설 생성 및 검토 (기출문제 그대로 출제 모드와 같은 프롬프트 사용)"""
+        result = llm_client.complete(
+            messages=[
+                {"role": "system", "content": ExamPrompts.get_system_prompts(exam_name)["question_generator"]},
+                {"role": "user", "content": ExamPrompts.get_exact_question_prompt(question["text"], exam_name)}
+            ],
+            temperature=0.7,
+        )
+        if not result:
+            raise RuntimeError("모델 응답이 비어 있습니다.")
+        
+        question_text = result
+        sections = parse_question_sections(result)
+        answer, explanation = sections["answer"], sections["explanation"]
+        
+        review = review_agent.review_question(question=question_text, answer=answer, explanation=explanation, exam_name=exam_name)
+        if not review.get("is_valid", False) and review.get("suggestions"):
+            corrected = review_agent.apply_corrections(question=question_text, answer=answer, explanation=explanation,
+                                                       suggestions=review["suggestions"])
+            if corrected:
+                question_text = corrected.get("question", question_text)
+                answer = corrected.get("answer", answer)
+                explanation = corrected.get("explanation", explanation)
+        
+        # 정답표에서 연결된 공식 정답이 있으면 우선 사용
+        official_option = question.get("correct_option")
+        if official_option in OPTION_NUMERALS:
+            answer = OPTION_NUMERALS[official_option]
+        
+        return {
+            "number": str(question["number"]),
+            "question_hash": question_hash(question.get("text", "")),
+            "question": question_text,
+            "answer": answer,
+            "explanation": explanation,
+            "review": {"is_valid": review.get("is_valid", False), "score": review.get("score", 0)},
+            "computed_at": datetime.now().isoformat()
+        }
+
+
+# 전역 사전 계산기 인스턴스
+answer_precomputer = AnswerPrecomputer()
@@ -0,0 +1,4 @@
+"""
+성능 측정 스크립트 모음
+저장소 루트에서 python -m benchmarks.<스크립트명> 으로 실행합니다.
+"""
@@ -0,0 +1,77 @@
+"""
+Docling 프로필별 PDF 처리 성능 측정
+sample_exam/ PDF를 프로필별로 변환하여 처리 시간과 추출된 문제 수를 비교합니다.
+
+사용법:
+    python -m benchmarks.docling_profiles
+    python -m benchmarks.docling_profiles --pdf-dir sample_exam --profiles fast full --no-fast-path
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from config import Config
+from pdf_processor import pdf_processor, DOCLING_PROFILES
+
+
+def run_benchmark(pdf_dir: str, profiles: list, use_fast_path: bool) -> list:
+    """프로필별 변환 시간 및 문제 추출 수 측정"""
+    Config.PDF_FAST_PATH = use_fast_path
+    pdf_files = sorted(Path(pdf_dir).glob("*.pdf"))
+    if not pdf_files:
+        print(f"❌ PDF 파일이 없습니다: {pdf_dir}")
+        return []
+    
+    results = []
+    for profile in profiles:
+        # 모델 로딩 시간은 측정에서 제외
+        started = time.perf_counter()
+        pdf_processor._get_docling_converter(profile)
+        init_seconds = time.perf_counter() - started
+        
+        total = {"profile": profile, "init_seconds": init_seconds, "seconds": 0.0,
+                 "pages": 0, "fast_pages": 0, "questions": 0, "files": []}
+        for pdf_file in pdf_files:
+            started = time.perf_counter()
+            full_text, page_stats = pdf_processor._convert_pdf_to_markdown(str(pdf_file), profile)
+            questions = pdf_processor._extract_questions_from_text(full_text, "benchmark", pdf_file.name)
+            elapsed = time.perf_counter() - started
+            
+            fast_pages = sum(1 for stat in page_stats if stat["path"] == "fast")
+            total["seconds"] += elapsed
+            total["pages"] += len(page_stats)
+            total["fast_pages"] += fast_pages
+            total["questions"] += len(questions)
+            total["files"].append((pdf_file.name, elapsed, len(page_stats), len(questions)))
+            print(f"  [{profile}] {pdf_file.name}: {elapsed:.2f}초, {len(page_stats)}페이지, 문제 {len(questions)}개")
+        results.append(total)
+    return results
+
+
+def print_summary(results: list):
+    """프로필별 요약 출력"""
+    print("\n=== Docling 프로필 벤치마크 ===")
+    print(f"{'프로필':<8} {'초기화(초)':>10} {'처리(초)':>10} {'페이지':>8} {'빠른경로':>8} {'초/페이지':>10} {'문제 수':>8}")
+    for total in results:
+        per_page = total["seconds"] / total["pages"] if total["pages"] else 0.0
+        print(f"{total['profile']:<8} {total['init_seconds']:>10.2f} {total['seconds']:>10.2f} {total['pages']:>8} "
+              f"{total['fast_pages']:>8} {per_page:>10.3f} {total['questions']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Docling 프로필별 PDF 처리 성능 측정")
+    parser.add_argument("--pdf-dir", default="sample_exam", help="측정할 PDF 폴더 (기본값: sample_exam)")
+    parser.add_argument("--profiles", nargs="+", default=list(DOCLING_PROFILES.keys()),
+                        choices=list(DOCLING_PROFILES.keys()), help="측정할 프로필 목록")
+    parser.add_argument("--no-fast-path", action="store_true",
+                        help="텍스트 레이어 빠른 경로를 끄고 모든 페이지를 Docling으로 처리")
+    args = parser.parse_args()
+    
+    results = run_benchmark(args.pdf_dir, args.profiles, not args.no_fast_path)
+    if results:
+        print_summary(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+문제 경계 스캐너 성능 측정
+sample_exam/ PDF의 Markdown 변환 결과에서 기존 패턴별 re.match 루프와 단일 컴파일 스캐너의 처리량(lines/sec)을 비교합니다.
+
+사용법:
+    python -m benchmarks.question_scanner
+    python -m benchmarks.question_scanner --pdf-dir sample_exam --profile fast --repeat 20
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+
+from pdf_processor import pdf_processor
+from question_scanner import get_scanner, QUESTION_FORMAT_PROFILES
+
+# 기존 _extract_questions_from_text의 패턴 목록 (비교 기준)
+LEGACY_PATTERNS = [
+    r'^\s*(\d{1,3})\.\s+',
+    r'^\s*-\s*(\d{1,3})\.\s+',
+    r'^\s*(\d{1,3})\)\s+',
+    r'^\s*-\s*(\d{1,3})\)\s+',
+    r'^\s*(\d{1,3})\.\s*$',
+    r'^\s*-\s*(\d{1,3})\.\s*$',
+    r'^\s*\((\d{1,3})\)\s*',
+    r'^\s*\[(\d{1,3})\]\s*',
+    r'^\s*【(\d{1,3})】\s*',
+    r'^\s*〈(\d{1,3})〉\s*',
+    r'^\s*문제\s*(\d{1,3})\s*[\.\)]?\s*',
+    r'^\s*(\d{1,3})\s*번\s*[\.\)]?\s*',
+    r'^\s*문항\s*(\d{1,3})\s*[\.\)]?\s*',
+    r'^\s*(\d{1,3})\.\s*다음\s*중',
+    r'^\s*(\d{1,3})\.\s*올바른\s*것은',
+    r'^\s*(\d{1,3})\.\s*틀린\s*것은',
+    r'^\s*(\d{1,3})\.\s*적절한\s*것은',
+    r'^\s*(\d{1,3})\.\s*가장\s*적절한',
+    r'^\s*-\s*(\d{1,3})\.\s*다음\s*중',
+    r'^\s*-\s*(\d{1,3})\.\s*올바른\s*것은',
+    r'^\s*-\s*(\d{1,3})\.\s*틀린\s*것은',
+    r'^\s*-\s*(\d{1,3})\.\s*적절한\s*것은',
+    r'^\s*-\s*(\d{1,3})\.\s*가장\s*적절한',
+]
+
+
+def legacy_scan(lines: list) -> list:
+    """기존 방식: 줄마다 패턴을 순서대로 re.match"""
+    candidates = []
+    for line_idx, line in enumerate(lines):
+        line = line.strip('\r')
+        if not line:
+            continue
+        for pattern in LEGACY_PATTERNS:
+            match = re.match(pattern, line)
+            if match:
+                number = int(match.group(1))
+                if 1 <= number <= 999:
+                    candidates.append((line_idx, number))
+                break
+    return candidates
+
+
+def scanner_scan(lines: list, format_profile: str) -> list:
+    """단일 컴파일 스캐너"""
+    return [(c["line_idx"], c["number"]) for c in get_scanner(format_profile).scan(lines)]
+
+
+def measure(func, lines: list, repeat: int) -> float:
+    """반복 실행 후 lines/sec 반환"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(lines)
+    elapsed = time.perf_counter() - started
+    return len(lines) * repeat / elapsed if elapsed else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문제 경계 스캐너 벤치마크")
+    parser.add_argument("--pdf-dir", default="sample_exam", help="PDF 폴더")
+    parser.add_argument("--profile", default="fast", help="Markdown 변환에 사용할 Docling 프로필")
+    parser.add_argument("--format-profile", default="default", choices=list(QUESTION_FORMAT_PROFILES), help="문제 형식 프로필")
+    parser.add_argument("--repeat", type=int, default=10, help="파일당 반복 횟수")
+    args = parser.parse_args()
+    
+    pdf_files = sorted(Path(args.pdf_dir).glob("*.pdf"))
+    if not pdf_files:
+        print(f"❌ PDF 파일이 없습니다: {args.pdf_dir}")
+        return
+    
+    print(f"{'파일':<50} {'줄 수':>8} {'기존(lines/s)':>14} {'스캐너(lines/s)':>16} {'배율':>6} {'결과 일치':>8}")
+    total_lines = total_legacy = total_scanner = 0.0
+    for pdf_file in pdf_files:
+        full_text, _ = pdf_processor._convert_pdf_to_markdown(str(pdf_file), args.profile)
+        lines = full_text.split('\n')
+        
+        same = legacy_scan(lines) == scanner_scan(lines, "default")
+        legacy_rate = measure(legacy_scan, lines, args.repeat)
+        scanner_rate = measure(lambda ls: scanner_scan(ls, args.format_profile), lines, args.repeat)
+        
+        total_lines += len(lines)
+        total_legacy += len(lines) / legacy_rate if legacy_rate else 0.0
+        total_scanner += len(lines) / scanner_rate if scanner_rate else 0.0
+        speedup = scanner_rate / legacy_rate if legacy_rate else 0.0
+        print(f"{pdf_file.name[:50]:<50} {len(lines):>8} {legacy_rate:>14,.0f} {scanner_rate:>16,.0f} {speedup:>5.1f}x {str(same):>8}")
+    
+    legacy_total = total_lines / total_legacy if total_legacy else 0.0
+    scanner_total = total_lines / total_scanner if total_scanner else 0.0
+    print(f"\n전체: 기존 {legacy_total:,.0f} lines/s → 스캐너 {scanner_total:,.0f} lines/s "
+          f"({scanner_total / legacy_total if legacy_total else 0.0:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
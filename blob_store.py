@@ -0,0 +1,92 @@
+"""
+PDF 원본 내용 주소 저장소
+업로드 파일을 한 번만 읽으면서 SHA-256 해시 계산과 blobs/<sha256>.pdf 저장을 함께 수행
+"""
+
+import os
+import hashlib
+import tempfile
+import logging
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 스트리밍 읽기 단위 (1MB)
+BLOB_BLOCK_SIZE = 1024 * 1024
+
+
+class BlobStore:
+    """SHA-256 해시를 파일명으로 하는 PDF 원본 저장소"""
+    
+    def __init__(self, root: str = "blobs"):
+        self.root = Path(root)
+        self.root.mkdir(exist_ok=True)
+    
+    def path_for(self, sha256: str) -> Path:
+        """해시에 해당하는 블롭 경로"""
+        return self.root / f"{sha256}.pdf"
+    
+    def get(self, sha256: str) -> Optional[str]:
+        """저장된 블롭 경로 (없으면 None)"""
+        path = self.path_for(sha256)
+        return str(path) if path.exists() else None
+    
+    def put(self, source) -> Tuple[str, str]:
+        """경로/파일 객체/바이트를 한 번 읽으면서 해시 계산과 저장을 동시에 수행 ((해시, 블롭 경로) 반환)"""
+        fd, part_path = tempfile.mkstemp(suffix=".part", dir=self.root)
+        sha256 = hashlib.sha256()
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for block in self._iter_blocks(source):
+                    sha256.update(block)
+                    f.write(block)
+            
+            digest = sha256.hexdigest()
+            target = self.path_for(digest)
+            if target.exists():
+                # 같은 내용이 이미 저장되어 있으면 새로 쓴 파일은 버림
+                os.unlink(part_path)
+            else:
+                os.replace(part_path, target)
+                logger.info(f"📦 [블롭 저장소] 원본 저장: {target.name}")
+            return digest, str(target)
+        except Exception:
+            Path(part_path).unlink(missing_ok=True)
+            raise
+    
+    def delete(self, sha256: str) -> bool:
+        """블롭 삭제"""
+        path = self.path_for(sha256)
+        if not path.exists():
+            return False
+        path.unlink()
+        return True
+    
+    @classmethod
+    def hash_stream(cls, source) -> str:
+        """저장 없이 스트리밍으로 SHA-256 해시만 계산"""
+        sha256 = hashlib.sha256()
+        for block in cls._iter_blocks(source):
+            sha256.update(block)
+        return sha256.hexdigest()
+    
+    @staticmethod
+    def _iter_blocks(source) -> Iterator[bytes]:
+        """파일 경로/파일 객체/바이트를 고정 크기 블록으로 읽기"""
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as f:
+                yield from iter(lambda: f.read(BLOB_BLOCK_SIZE), b"")
+        elif isinstance(source, (bytes, bytearray)):
+            yield bytes(source)
+        elif hasattr(source, 'read') and callable(source.read):
+            if hasattr(source, 'seek'):
+                source.seek(0)  # 파일 포인터를 처음으로
+            yield from iter(lambda: source.read(BLOB_BLOCK_SIZE), b"")
+        else:
+            raise TypeError(f"지원하지 않는 PDF 입력 형식: {type(source)}")
+
+
+# 전역 인스턴스
+blob_store = BlobStore()
@@ -0,0 +1,144 @@
+"""
+PDF 일괄 수집 CLI
+폴더 또는 여러 PDF 파일을 병렬로 처리하여 시험에 등록하고, 마지막에 인덱스를 한 번만 저장합니다.
+
+사용법:
+    python bulk_ingest.py --exam 정보시스템감리사 sample_exam
+    python bulk_ingest.py --exam 리눅스마스터1급 a.pdf b.pdf --workers 4 --profile fast
+    python bulk_ingest.py --exam 리눅스마스터1급 a.pdf --skip-precompute
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from config import Config
+from ingestion_queue import IngestionQueue, INGEST_STAGE_LABELS, precompute_queue
+from mvp_main import generator
+from pdf_processor import pdf_processor, DOCLING_PROFILES
+
+
+def collect_pdf_files(paths: List[str]) -> List[Path]:
+    """입력 경로(폴더/파일)에서 PDF 파일 목록 수집"""
+    pdf_files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            pdf_files.extend(sorted(path.glob("*.pdf")))
+        elif path.suffix.lower() == ".pdf" and path.exists():
+            pdf_files.append(path)
+        else:
+            print(f"⚠️ PDF가 아닌 경로는 건너뜁니다: {path}")
+    return pdf_files
+
+
+def bulk_ingest(exam_name: str, pdf_files: List[Path], workers: int, profile: str = "default",
+                precompute: bool = True) -> dict:
+    """PDF 파일을 병렬 처리 후 인덱스를 한 번에 저장 (저장에 성공하면 정답·해설 사전 계산까지 실행)"""
+    queue = IngestionQueue(max_workers=workers)
+    jobs = []
+    skipped = []
+    seen_hashes = set()
+    
+    started = time.perf_counter()
+    for pdf_file in pdf_files:
+        # 중복 체크 및 블롭 저장소 보관 (업로드와 동일한 경로)
+        prepared, error_msg = generator._prepare_upload(str(pdf_file), exam_name, profile)
+        if prepared is None or prepared["pdf_hash"] in seen_hashes:
+            skipped.append(pdf_file.name)
+            print(f"⏭️ {pdf_file.name}: {error_msg.splitlines()[0] if error_msg else '같은 배치 내 중복 파일'}")
+            continue
+        
+        seen_hashes.add(prepared["pdf_hash"])
+        job, _ = queue.submit(
+            f"{exam_name} / {prepared['actual_filename']}",
+            lambda progress_callback, prepared=prepared: generator._ingest_prepared(prepared, progress_callback, persist=False),
+            dedupe_key=prepared["pdf_hash"]
+        )
+        jobs.append(job)
+    
+    queue.wait_all()
+    queue.shutdown()
+    
+    # 인덱스 및 메타데이터 일괄 저장 후 체크포인트 완료 처리
+    done_jobs = [job for job in jobs if job.stage == "done"]
+    index_saved = not done_jobs or pdf_processor._save_metadata()
+    if not index_saved:
+        # 시험 등록을 되돌리고 체크포인트는 완료 처리하지 않으므로 같은 파일로 다시 실행하면 임베딩 결과부터 재개
+        print("❌ 인덱스 저장 실패 - 처리된 파일이 검색 인덱스에 반영되지 않았습니다. 같은 명령으로 다시 실행하세요.")
+        for job in done_jobs:
+            result = job.result["result"]
+            generator._unrecord_ingested(exam_name, result["filename"], result["pdf_hash"])
+    else:
+        for job in done_jobs:
+            result = job.result["result"]
+            pdf_processor.commit_checkpoint(result["checkpoint_id"], result)
+    
+    # 저장된 파일의 기출문제 정답·해설 사전 계산 (업로드 경로와 동일, 끝날 때까지 대기)
+    precomputed = 0
+    if index_saved and precompute:
+        for job in done_jobs:
+            precomputed += int(generator.schedule_answer_precompute(exam_name, job.result["result"]["filename"]))
+        if precomputed:
+            print(f"🧠 [일괄 수집] 정답·해설 사전 계산 {precomputed}건 진행 중...")
+            precompute_queue.wait_all()
+    elapsed = time.perf_counter() - started
+    
+    summary = {"seconds": elapsed, "files": len(jobs), "skipped": skipped, "failed": [],
+               "pages": 0, "chunks": 0, "questions": 0, "index_saved": index_saved, "precomputed": precomputed}
+    for job in jobs:
+        if job.stage != "done":
+            summary["failed"].append((job.label, job.message))
+            continue
+        if not index_saved:
+            summary["failed"].append((job.label, "인덱스 저장 실패"))
+            continue
+        result = job.result["result"]
+        summary["pages"] += result.get("pages_count", 0)
+        summary["chunks"] += result.get("chunks_count", 0)
+        summary["questions"] += result.get("questions_count", 0)
+        print(f"  {INGEST_STAGE_LABELS[job.stage]} {job.label}: {job.elapsed():.1f}초, "
+              f"{result.get('pages_count', 0)}페이지, 청크 {result.get('chunks_count', 0)}개")
+    return summary
+
+
+def print_summary(summary: dict):
+    """처리량 요약 출력"""
+    seconds = summary["seconds"] or 1e-9
+    print("\n=== PDF 일괄 수집 결과 ===")
+    print(f"처리 파일: {summary['files'] - len(summary['failed'])}/{summary['files']}개 (건너뜀 {len(summary['skipped'])}개)")
+    print(f"총 소요 시간: {summary['seconds']:.2f}초")
+    print(f"페이지: {summary['pages']}개 ({summary['pages'] / seconds:.2f} pages/sec)")
+    print(f"청크: {summary['chunks']}개 ({summary['chunks'] / seconds:.2f} chunks/sec)")
+    print(f"추출된 문제: {summary['questions']}개")
+    if summary["precomputed"]:
+        print(f"정답·해설 사전 계산: {summary['precomputed']}개 파일")
+    for label, message in summary["failed"]:
+        print(f"❌ {label}: {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 일괄 수집")
+    parser.add_argument("paths", nargs="+", help="PDF 파일 또는 PDF가 들어 있는 폴더")
+    parser.add_argument("--exam", required=True, help="등록할 시험 이름")
+    parser.add_argument("--workers", type=int, default=Config.INGEST_MAX_CONCURRENCY, help="병렬 처리 작업 수")
+    parser.add_argument("--profile", default="default", choices=["default"] + list(DOCLING_PROFILES),
+                        help="Docling 처리 프로필 (default: 시험 기본값)")
+    parser.add_argument("--skip-precompute", action="store_true", help="기출문제 정답·해설 사전 계산 생략")
+    args = parser.parse_args()
+    
+    pdf_files = collect_pdf_files(args.paths)
+    if not pdf_files:
+        print("❌ 처리할 PDF 파일이 없습니다.")
+        return
+    
+    print(f"📚 [일괄 수집] 시험: {args.exam}, 파일: {len(pdf_files)}개, 작업 수: {args.workers}")
+    summary = bulk_ingest(args.exam, pdf_files, args.workers, args.profile, precompute=not args.skip_precompute)
+    print_summary(summary)
+    if not summary["index_saved"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,31 @@ class Config:
     OPENAI_API_VERSION = os.getenv("OPENAI_API_VERSION", "2024-02-15-preview")
     DEPLOYMENT_NAME = os.getenv("DEPLOYMENT_NAME", "")
     
+    # Azure OpenAI 연결 풀·재시도·타임아웃 설정 (llm_client.py 공용 클라이언트)
+    LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))  # 요청별 타임아웃
+    LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "10"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+    LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "8"))
+    LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+    LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    LLM_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    
+    # Azure OpenAI 클라이언트 측 속도 제한 (배포 할당량에 맞춤, 0이면 제한 없음)
+    LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "60"))
+    LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "60000"))
+    LLM_MAX_CONCURRENT_REQUESTS = int(os.getenv("LLM_MAX_CONCURRENT_REQUESTS", "8"))
+    LLM_COMPLETION_TOKEN_ESTIMATE = int(os.getenv("LLM_COMPLETION_TOKEN_ESTIMATE", "800"))  # max_tokens가 없을 때 응답 토큰 추정치
+    
+    # LLM 응답 캐시 설정 (response_cache.json)
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "True").lower() == "true"
+    LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "604800"))  # 기본 7일
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+    LLM_CACHE_SEMANTIC_ENABLED = os.getenv("LLM_CACHE_SEMANTIC_ENABLED", "True").lower() == "true"  # AI 챗봇 유사 질문 답변 재사용
+    LLM_CACHE_SEMANTIC_THRESHOLD = float(os.getenv("LLM_CACHE_SEMANTIC_THRESHOLD", "0.95"))
+    LLM_CACHE_SEMANTIC_MAX_PER_EXAM = int(os.getenv("LLM_CACHE_SEMANTIC_MAX_PER_EXAM", "200"))
+    LLM_CACHE_FLUSH_SECONDS = float(os.getenv("LLM_CACHE_FLUSH_SECONDS", "2"))  # 변경분을 묶어서 파일에 저장하는 간격
+    
     # AI 챗봇 설정
     AI_CHATBOT_TOP_K = int(os.getenv("AI_CHATBOT_TOP_K", "10"))
     AI_CHATBOT_SIMILARITY_THRESHOLD = float(os.getenv("AI_CHATBOT_SIMILARITY_THRESHOLD", "0.3"))
@@ -33,9 +58,68 @@ class Config:
     AI_CHATBOT_FREQUENCY_PENALTY = float(os.getenv("AI_CHATBOT_FREQUENCY_PENALTY", "0.0"))
     AI_CHATBOT_PRESENCE_PENALTY = float(os.getenv("AI_CHATBOT_PRESENCE_PENALTY", "0.0"))
     
+    # AI 챗봇 대화 기록 롤링 요약 (최근 메시지는 그대로, 그 이전은 세션 요약으로 압축)
+    CHAT_COMPACTION_ENABLED = os.getenv("CHAT_COMPACTION_ENABLED", "True").lower() == "true"
+    CHAT_RECENT_MESSAGES = int(os.getenv("CHAT_RECENT_MESSAGES", "6"))  # 그대로 둘 최근 메시지 수 (질문·답변 3쌍)
+    CHAT_COMPACTION_TRIGGER_MESSAGES = int(os.getenv("CHAT_COMPACTION_TRIGGER_MESSAGES", "4"))  # 요약되지 않은 오래된 메시지가 이만큼 쌓이면 요약 갱신
+    CHAT_SUMMARY_MAX_CHARS = int(os.getenv("CHAT_SUMMARY_MAX_CHARS", "800"))
+    CHAT_SUMMARY_MAX_TOKENS = int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", "600"))
+    
+    # 프롬프트 토큰 예산 (호출 유형별, 0이면 제한 없음) 및 로컬 토크나이저 인코딩 (tiktoken)
+    PROMPT_TOKENIZER_ENCODING = os.getenv("PROMPT_TOKENIZER_ENCODING", "o200k_base")
+    CHAT_PROMPT_TOKEN_BUDGET = int(os.getenv("CHAT_PROMPT_TOKEN_BUDGET", "6000"))
+    GENERATION_PROMPT_TOKEN_BUDGET = int(os.getenv("GENERATION_PROMPT_TOKEN_BUDGET", "4000"))
+    
+    # 문제 생성 파이프라인 마감 시간(초, 검색·검증·생성·검토 전체)
+    GENERATION_DEADLINE_SECONDS = float(os.getenv("GENERATION_DEADLINE_SECONDS", "90"))
+    
+    # 규칙 기반 컨텍스트 사전 검증 (확실한 경우 LLM 검증 생략)
+    CONTEXT_RULES_ENABLED = os.getenv("CONTEXT_RULES_ENABLED", "True").lower() == "true"
+    CONTEXT_RULES_MIN_CHARS = int(os.getenv("CONTEXT_RULES_MIN_CHARS", "30"))
+    CONTEXT_RULES_MAX_CHARS = int(os.getenv("CONTEXT_RULES_MAX_CHARS", "15000"))
+    
+    # 생성 문제 정적 검사 (기계적인 결함은 로컬에서 처리, 신뢰도가 낮을 때만 LLM 검토)
+    QUESTION_CHECK_ENABLED = os.getenv("QUESTION_CHECK_ENABLED", "True").lower() == "true"
+    QUESTION_CHECK_MIN_CONFIDENCE = float(os.getenv("QUESTION_CHECK_MIN_CONFIDENCE", "0.8"))
+    
+    # 구조화 생성 모드 (문제·정답·해설·자체 검토를 JSON 한 번으로 생성, 스키마 오류 시에만 수리 호출)
+    STRUCTURED_GENERATION = os.getenv("STRUCTURED_GENERATION", "False").lower() == "true"
+    
+    # 사전 생성 문제 풀 설정 (시험·난이도·유형별)
+    QUESTION_POOL_ENABLED = os.getenv("QUESTION_POOL_ENABLED", "True").lower() == "true"
+    QUESTION_POOL_SIZE = int(os.getenv("QUESTION_POOL_SIZE", "2"))  # 목표 크기
+    QUESTION_POOL_LOW_WATER = int(os.getenv("QUESTION_POOL_LOW_WATER", "1"))  # 이 개수 아래로 줄면 보충
+    QUESTION_POOL_MAX_WORKERS = int(os.getenv("QUESTION_POOL_MAX_WORKERS", "2"))
+    
     # 정보 검증 에이전트 설정
     USE_VALIDATION_AGENT = os.getenv("USE_VALIDATION_AGENT", "False").lower() == "true"
     
+    # 채점 설정 (객관식은 로컬 채점, AI 해설은 백그라운드로 생성할지 여부)
+    GRADING_LLM_FEEDBACK = os.getenv("GRADING_LLM_FEEDBACK", "True").lower() == "true"
+    # 추출된 기출문제 정답·해설 사전 계산 여부, 모델 호출 동시 실행 수, 동시에 처리할 문제 은행 수 (PDF 수집 큐와 별도)
+    PRECOMPUTE_ANSWERS = os.getenv("PRECOMPUTE_ANSWERS", "True").lower() == "true"
+    PRECOMPUTE_MAX_CONCURRENCY = int(os.getenv("PRECOMPUTE_MAX_CONCURRENCY", "4"))
+    PRECOMPUTE_QUEUE_CONCURRENCY = int(os.getenv("PRECOMPUTE_QUEUE_CONCURRENCY", "1"))
+    
+    # PDF 처리 설정 (텍스트 레이어 빠른 경로)
+    PDF_FAST_PATH = os.getenv("PDF_FAST_PATH", "True").lower() == "true"
+    PDF_FAST_PATH_MIN_CHARS = int(os.getenv("PDF_FAST_PATH_MIN_CHARS", "50"))
+    PDF_FAST_PATH_MIN_SCORE = float(os.getenv("PDF_FAST_PATH_MIN_SCORE", "0.85"))
+    PDF_FAST_PATH_MAX_IMAGE_RATIO = float(os.getenv("PDF_FAST_PATH_MAX_IMAGE_RATIO", "0.3"))
+    # Docling 파이프라인 기본 프로필 (fast/tables/full)
+    DOCLING_PROFILE = os.getenv("DOCLING_PROFILE", "full")
+    # 문제 번호 형식 프로필 (default, numbered, bracketed, keyword)
+    QUESTION_FORMAT_PROFILE = os.getenv("QUESTION_FORMAT_PROFILE", "default")
+    # 임베딩 배치 크기 (청크를 배치 단위로 임베딩하여 바로 인덱스에 반영)
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    # 청크 최대 토큰 수 (0이면 임베딩 모델 최대 입력 길이) 및 분할 시 겹침 토큰 수
+    CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "0"))
+    CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "32"))
+    # 문제 시작 몇 줄 앞까지의 그림을 해당 문제의 그림으로 볼지 (requires_figure 판정)
+    FIGURE_LOOKBEHIND_LINES = int(os.getenv("FIGURE_LOOKBEHIND_LINES", "3"))
+    # 백그라운드 PDF 수집 작업 동시 실행 수
+    INGEST_MAX_CONCURRENCY = int(os.getenv("INGEST_MAX_CONCURRENCY", "2"))
+    
     # 서버 및 외부 접속 설정
     PORT = int(os.getenv("PORT", "7860"))
     USE_NGROK = os.getenv("USE_NGROK", "true").lower() == "true"
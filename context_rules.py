@@ -0,0 +1,115 @@
+"""
+컨텍스트 사전 검증 규칙
+get_context_validation_prompt의 구조 기준(문제 번호, 보기 4개, 정답 정보, 길이)을 미리 컴파일한 규칙으로 확인하여
+확실히 적합하거나 부적합한 컨텍스트는 LLM 검증 없이 판정하고, 애매한 컨텍스트만 LLM 검증으로 넘깁니다.
+"""
+
+import re
+import threading
+import logging
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from question_scanner import get_scanner
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 보기 번호 (원문자 또는 줄 앞의 가./나./다./라.)
+CIRCLED_OPTION_PATTERN = re.compile(r'[①②③④⑤]')
+HANGUL_OPTION_PATTERN = re.compile(r'^\s*([가나다라마])\s*[.)]\s*\S', re.MULTILINE)
+
+# 정답 표시 (정답: ③, 답) 2, [정답] ② 등)
+ANSWER_LINE_PATTERN = re.compile(r'(?:정\s*답|답\s*안|^\s*답)\s*[:：)\]】]?\s*[①②③④⑤1-5]', re.MULTILINE)
+
+# 객관식 완전한 문제로 볼 최소 보기 개수
+MIN_OPTIONS = 4
+
+
+def _count_options(block: str) -> int:
+    """문제 한 덩어리의 서로 다른 보기 번호 개수"""
+    circled = set(CIRCLED_OPTION_PATTERN.findall(block))
+    hangul = set(HANGUL_OPTION_PATTERN.findall(block))
+    return max(len(circled), len(hangul))
+
+
+def _result(valid: bool, problem_number: str, options: int, issues: List[str]) -> Dict[str, Any]:
+    """LLM 검증 결과(_parse_validation_result)와 같은 형식의 판정 결과"""
+    return {
+        "valid": valid,
+        "problem_number": problem_number or "없음",
+        "question_type": "객관식" if options >= MIN_OPTIONS else "기타",
+        "options_count": str(options) if options else "해당없음",
+        "issues": issues,
+        "suggestions": [],
+        "source": "rules"
+    }
+
+
+class ContextPrevalidator:
+    """규칙 기반 컨텍스트 사전 검증기 (확실한 경우만 판정, 애매하면 None)"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {"passed": 0, "failed": 0, "escalated": 0}
+    
+    def check(self, context: str, metadata: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+        """컨텍스트 판정 (확실히 적합/부적합하면 결과 dict, LLM 검증이 필요하면 None)"""
+        text = (context or "").strip()
+        length = len(text)
+        
+        lines = text.split('\n')
+        candidates = get_scanner(Config.QUESTION_FORMAT_PROFILE).scan(lines)
+        
+        # 문제 번호 위치로 나눈 문제 덩어리마다 보기 개수 확인 (번호가 없으면 전체를 한 덩어리로)
+        starts = [candidate["line_idx"] for candidate in candidates] or [0]
+        bounds = zip(starts, starts[1:] + [len(lines)])
+        best_options = max(_count_options('\n'.join(lines[start:end])) for start, end in bounds)
+        problem_number = str(candidates[0]["number"]) if candidates else ""
+        has_answer = bool(ANSWER_LINE_PATTERN.search(text)) or any(
+            meta.get("correct_option") for meta in (metadata or []) if isinstance(meta, dict)
+        )
+        
+        # 확실한 부적합: 길이가 범위를 벗어나거나 문제 구조가 전혀 없음
+        issues = []
+        if length < Config.CONTEXT_RULES_MIN_CHARS:
+            issues.append(f"컨텍스트가 너무 짧습니다 ({length}자)")
+        elif length > Config.CONTEXT_RULES_MAX_CHARS:
+            issues.append(f"컨텍스트가 너무 깁니다 ({length}자)")
+        elif not candidates and best_options == 0:
+            issues.append("문제 번호와 보기를 찾을 수 없습니다")
+        if issues:
+            return self._decide(_result(False, problem_number, best_options, issues))
+        
+        # 확실한 적합: 문제 번호, 보기 4개 이상, 정답 정보가 모두 있음
+        if candidates and best_options >= MIN_OPTIONS and has_answer:
+            return self._decide(_result(True, problem_number, best_options, []))
+        
+        # 그 외(주관식, 정답 정보 없음, 보기 일부만 있음 등)는 LLM 검증
+        with self._lock:
+            self._stats["escalated"] += 1
+        logger.info(f"🤔 [컨텍스트 사전 검증] 애매한 컨텍스트, LLM 검증으로 넘김 "
+                    f"(번호 {len(candidates)}개, 보기 {best_options}개, 정답 정보 {'있음' if has_answer else '없음'})")
+        return None
+    
+    def _decide(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """규칙 판정 기록 및 생략한 LLM 호출 수 로그"""
+        with self._lock:
+            self._stats["passed" if result["valid"] else "failed"] += 1
+            avoided = self._stats["passed"] + self._stats["failed"]
+            total = avoided + self._stats["escalated"]
+        reason = f" - {', '.join(result['issues'])}" if result["issues"] else ""
+        logger.info(f"⚡ [컨텍스트 사전 검증] 규칙으로 {'적합' if result['valid'] else '부적합'} 판정{reason} "
+                    f"(LLM 검증 생략 누적 {avoided}/{total}회)")
+        return result
+    
+    def stats(self) -> Dict[str, int]:
+        """판정 통계 (규칙 적합/부적합, LLM 위임, 생략한 LLM 호출 수)"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["avoided_llm_calls"] = stats["passed"] + stats["failed"]
+        return stats
+
+
+# 전역 컨텍스트 사전 검증기 인스턴스
+context_prevalidator = ContextPrevalidator()
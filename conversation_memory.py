@@ -0,0 +1,103 @@
+"""
+AI 챗봇 대화 기록 롤링 요약
+최근 대화는 그대로 두고, 그보다 오래된 대화는 세션 상태(gr.State)의 요약에 점진적으로 합칩니다.
+요약 갱신은 답변이 끝난 뒤 백그라운드 레인에서 실행되어 응답 시간에 영향을 주지 않고, 긴 학습 세션에서도 프롬프트 크기가 일정하게 유지됩니다.
+"""
+
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from prompt import ChatPrompts
+from llm_client import llm_client
+from rate_limiter import rate_limiter, PRIORITY_BACKGROUND
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 요약 대상 대화의 메시지당 최대 글자 수 (긴 답변·표는 앞부분만 요약에 사용)
+MAX_MESSAGE_CHARS = 1500
+
+
+def new_memory(epoch: int = 0) -> Dict[str, Any]:
+    """세션별 대화 요약 상태 (summary: 요약, covered: 요약에 반영된 메시지 수, pending: 요약 갱신 중 여부, epoch: 초기화 횟수)"""
+    return {"summary": "", "covered": 0, "pending": False, "epoch": epoch}
+
+
+class ConversationCompactor:
+    """대화 기록 롤링 요약 관리 (세션 상태 딕셔너리를 백그라운드에서 갱신)"""
+    
+    def __init__(self, max_workers: int = 1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="compact")
+        self._lock = threading.Lock()
+    
+    def context_for(self, history: List[Dict[str, Any]], memory: Optional[Dict[str, Any]]) -> tuple:
+        """프롬프트에 넣을 (요약, 그대로 둘 대화 기록) 반환 (아직 요약되지 않은 기록은 모두 그대로 포함)"""
+        if not Config.CHAT_COMPACTION_ENABLED or memory is None:
+            return "", history[-5:]
+        with self._lock:
+            if memory.get("covered", 0) > len(history):
+                # 대화가 초기화된 세션이면 요약도 초기화
+                memory.update(new_memory(memory.get("epoch", 0) + 1))
+            return memory.get("summary", ""), history[memory.get("covered", 0):]
+    
+    def schedule(self, history: List[Dict[str, Any]], memory: Optional[Dict[str, Any]]):
+        """최근 대화 밖으로 밀려난 메시지가 충분히 쌓이면 백그라운드로 요약 갱신"""
+        if not Config.CHAT_COMPACTION_ENABLED or memory is None:
+            return
+        with self._lock:
+            covered = memory.get("covered", 0)
+            end = len(history) - Config.CHAT_RECENT_MESSAGES
+            if memory.get("pending") or end - covered < Config.CHAT_COMPACTION_TRIGGER_MESSAGES:
+                return
+            memory["pending"] = True
+            epoch = memory.get("epoch", 0)
+            previous_summary = memory.get("summary", "")
+            # 요청이 끝난 뒤에도 기록이 바뀔 수 있으므로 요약할 구간만 복사
+            messages = [dict(message) for message in history[covered:end]]
+        
+        self._executor.submit(self._compact, memory, epoch, previous_summary, end, messages)
+    
+    def _compact(self, memory: Dict[str, Any], epoch: int, previous_summary: str, end: int,
+                 messages: List[Dict[str, Any]]):
+        """이전 요약과 새로 밀려난 대화를 합쳐 요약 갱신 (백그라운드 레인, 실패하면 다음 요청에서 재시도)"""
+        summary = None
+        try:
+            with rate_limiter.lane(PRIORITY_BACKGROUND):
+                summary = llm_client.complete(
+                    messages=[{"role": "user", "content": ChatPrompts.get_conversation_summary_prompt(
+                        previous_summary, self._format_messages(messages), Config.CHAT_SUMMARY_MAX_CHARS
+                    )}],
+                    temperature=0.2,
+                    max_tokens=Config.CHAT_SUMMARY_MAX_TOKENS,
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ [대화 요약] 요약 갱신 실패: {e}")
+        
+        with self._lock:
+            # 그 사이 대화가 초기화됐으면 결과를 버림
+            if memory.get("epoch", 0) != epoch:
+                return
+            memory["pending"] = False
+            if summary and summary.strip():
+                memory["summary"] = summary.strip()
+                memory["covered"] = end
+                logger.info(f"🗜️ [대화 요약] 메시지 {end}개까지 요약 반영 (요약 {len(memory['summary'])}자)")
+    
+    @staticmethod
+    def _format_messages(messages: List[Dict[str, Any]]) -> str:
+        """요약 프롬프트용 대화 텍스트"""
+        lines = []
+        for message in messages:
+            speaker = "사용자" if message.get("role") == "user" else "도우미"
+            content = str(message.get("content") or "")
+            if len(content) > MAX_MESSAGE_CHARS:
+                content = content[:MAX_MESSAGE_CHARS] + " …"
+            lines.append(f"{speaker}: {content}")
+        return "\n".join(lines)
+
+
+# 전역 대화 요약 인스턴스
+conversation_compactor = ConversationCompactor()
@@ -0,0 +1,36 @@
+"""
+그림 의존 문제 판별 규칙
+PDF 수집 시 문제·청크마다 한 번 계산하는 requires_figure 판정과, 판정값이 없는 기존 데이터용 판정을 공유합니다.
+"""
+
+from typing import Any, Dict, Optional
+
+# Docling Markdown의 그림 자리 표시자
+IMAGE_PLACEHOLDER = "<!-- image -->"
+
+# 그림이 있어야 풀 수 있는 문제 지시문
+FIGURE_PHRASES = [
+    "다음 그림", "위의 그림", "아래 그림", "그림과 같이", "그림에서 보는 바와 같이",
+    "다음 도표", "아래 도표", "다음 차트", "다음 화면", "아래 화면",
+]
+
+# 그림과 함께 쓰이는 일반 키워드 (주변에 실제 그림이 있을 때만 그림 의존으로 판정)
+FIGURE_KEYWORDS = ["그림", "도표", "차트", "이미지", "사진", "화면", "스크린샷"]
+
+
+def detect_figure_dependency(text: str, has_nearby_image: bool = False) -> Optional[str]:
+    """그림 의존 사유 반환 (picture / phrase / keyword_image), 해당 없으면 None"""
+    if IMAGE_PLACEHOLDER in text:
+        return "picture"
+    if any(phrase in text for phrase in FIGURE_PHRASES):
+        return "phrase"
+    if has_nearby_image and any(keyword in text for keyword in FIGURE_KEYWORDS):
+        return "keyword_image"
+    return None
+
+
+def requires_figure(item: Dict[str, Any], text: Optional[str] = None) -> bool:
+    """저장된 requires_figure 값 반환 (값이 없는 기존 데이터는 텍스트 규칙으로 판정)"""
+    if "requires_figure" in item:
+        return bool(item["requires_figure"])
+    return detect_figure_dependency(text if text is not None else item.get("text", "")) is not None
@@ -0,0 +1,113 @@
+"""
+객관식 답안 로컬 채점
+사용자 입력(숫자, 원문자, 보기 텍스트)을 보기 번호로 정규화해 정답 보기와 바로 비교합니다.
+"""
+
+import re
+from typing import Any, Dict, Optional
+
+from answer_key import OPTION_SYMBOLS, OPTION_NUMERALS, parse_option
+
+# 문제 본문의 보기 (예: "① 보기 내용")
+OPTION_TEXT_PATTERN = re.compile(r'([①②③④⑤])\s*([^①②③④⑤\n]*)')
+
+# === 보기 === 구역의 번호 보기 줄 (예: "1) 보기 내용", "2. 보기 내용", "(3) 보기 내용", 생성 프롬프트 형식)
+NUMBERED_OPTION_PATTERN = re.compile(r'^\s*[(\[]?\s*([1-5])\s*(?:\)|\]|\.(?!\d))\s*(.*)$')
+
+# 번호로 입력한 답 (예: "3", "3번", "(3)", "3번입니다", "정답: 3")
+CHOICE_NUMBER_PATTERN = re.compile(r'^(?:정답\s*[:：]?\s*)?[(\[]?\s*([1-5])\s*[)\]]?\s*(?:번)?\s*(?:입니다|이요|요)?\s*[.!]?$')
+
+# 정답 문자열 앞부분의 보기 번호 (예: "③ 보기 내용", "3번", "정답: 3")
+ANSWER_NUMBER_PATTERN = re.compile(r'^\s*(?:정답\s*[:：]?\s*)?([1-5])\s*(?:번|\)|\.|$)')
+
+
+def _compact(text: str) -> str:
+    """비교용 문자열 (공백·문장부호 제거, 소문자)"""
+    return re.sub(r'[\s.,·:;!?()\[\]"\'`]', '', text or "").lower()
+
+
+def parse_options(question_text: str) -> Dict[int, str]:
+    """문제 본문에서 보기 번호별 텍스트 추출 (원문자 보기, 없으면 === 보기 === 구역의 1) / 1. 형식)"""
+    options = {}
+    for symbol, text in OPTION_TEXT_PATTERN.findall(question_text or ""):
+        options.setdefault(OPTION_SYMBOLS[symbol], text.strip())
+    if options:
+        return options
+    
+    in_options = False
+    for line in (question_text or "").split('\n'):
+        if "===" in line:
+            in_options = "=== 보기 ===" in line
+            continue
+        match = NUMBERED_OPTION_PATTERN.match(line) if in_options else None
+        if match:
+            options.setdefault(int(match.group(1)), match.group(2).strip())
+    return options
+
+
+def normalize_choice(user_answer: str, options: Optional[Dict[int, str]] = None) -> Optional[int]:
+    """사용자 답을 보기 번호로 정규화 (숫자, 원문자, 보기 텍스트 지원, 판단할 수 없으면 None)"""
+    answer = (user_answer or "").strip()
+    if not answer:
+        return None
+    
+    option = parse_option(answer)
+    if option is None and answer[0] in OPTION_SYMBOLS:
+        # "③ 보기 내용"처럼 원문자로 시작하는 답
+        option = OPTION_SYMBOLS[answer[0]]
+    if option is None:
+        match = CHOICE_NUMBER_PATTERN.match(answer)
+        option = int(match.group(1)) if match else None
+    if option is not None:
+        return option
+    
+    # 보기 텍스트로 입력한 답 (일치하거나 한 보기에만 포함되는 경우)
+    compact = _compact(answer)
+    if not options or len(compact) < 2:
+        return None
+    exact = [number for number, text in options.items() if _compact(text) == compact]
+    if len(exact) == 1:
+        return exact[0]
+    partial = [number for number, text in options.items() if compact in _compact(text)]
+    return partial[0] if len(partial) == 1 else None
+
+
+def parse_correct_option(correct_answer: str) -> Optional[int]:
+    """저장된 정답 문자열에서 보기 번호 추출 (객관식 정답이 아니면 None)"""
+    answer = (correct_answer or "").strip()
+    if not answer:
+        return None
+    option = parse_option(answer, allow_digits=True)
+    if option is not None:
+        return option
+    symbols = [symbol for symbol in answer if symbol in OPTION_SYMBOLS]
+    if symbols and len(set(symbols)) == 1:
+        return OPTION_SYMBOLS[symbols[0]]
+    match = ANSWER_NUMBER_PATTERN.match(answer)
+    return int(match.group(1)) if match else None
+
+
+def grade_choice(user_answer: str, correct_answer: str, question_text: str = "") -> Optional[Dict[str, Any]]:
+    """객관식 답안 로컬 채점 (정답이나 사용자 답을 보기 번호로 해석할 수 없으면 None)"""
+    correct = parse_correct_option(correct_answer)
+    if correct is None:
+        return None
+    selected = normalize_choice(user_answer, parse_options(question_text))
+    if selected is None:
+        return None
+    return {"is_correct": selected == correct, "selected": selected, "correct": correct}
+
+
+def format_verdict(grade: Dict[str, Any], explanation: str = "") -> str:
+    """로컬 채점 결과 표시 (정답 여부 줄은 오답 판정 파서와 같은 형식)"""
+    verdict = "정답" if grade["is_correct"] else "오답"
+    lines = [
+        f"### {'✅ 정답입니다!' if grade['is_correct'] else '❌ 오답입니다.'}",
+        "",
+        f"- 정답 여부: {verdict}",
+        f"- 선택한 답: {OPTION_NUMERALS[grade['selected']]}",
+        f"- 정답: {OPTION_NUMERALS[grade['correct']]}",
+    ]
+    if explanation:
+        lines += ["", "#### 📖 해설", explanation]
+    return "\n".join(lines)
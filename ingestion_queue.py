@@ -0,0 +1,160 @@
+"""
+백그라운드 PDF 수집 작업 큐
+업로드된 PDF를 작업 ID 단위로 제한된 동시성으로 처리하고 단계별 진행 상황을 제공
+"""
+
+import threading
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from config import Config
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 작업 단계별 표시 이름
+INGEST_STAGE_LABELS = {
+    "queued": "⏳ 대기 중",
+    "converting": "📄 PDF 변환 중",
+    "extracting": "🔍 문제 추출 중",
+    "chunking": "✂️ 청크 분할 중",
+    "embedding": "🧮 임베딩 생성 중",
+    "indexing": "🗂️ 인덱스 저장 중",
+    "precomputing": "🧠 정답·해설 계산 중",
+    "done": "✅ 완료",
+    "failed": "❌ 실패",
+}
+
+# 종료 단계
+FINISHED_STAGES = ("done", "failed")
+
+
+class IngestionJob:
+    """PDF 수집 작업 상태"""
+    
+    def __init__(self, label: str, dedupe_key: Optional[str] = None):
+        self.job_id = uuid.uuid4().hex[:8]
+        self.label = label
+        self.dedupe_key = dedupe_key
+        self.stage = "queued"
+        self.message = ""
+        self.result: Optional[Dict[str, Any]] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.stage_times: Dict[str, float] = {}
+    
+    @property
+    def finished(self) -> bool:
+        """작업 종료 여부"""
+        return self.stage in FINISHED_STAGES
+    
+    def elapsed(self) -> float:
+        """작업 경과 시간(초)"""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.time()
+        return end - self.started_at
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """작업 상태를 딕셔너리로 반환"""
+        return {
+            "job_id": self.job_id,
+            "label": self.label,
+            "stage": self.stage,
+            "stage_label": INGEST_STAGE_LABELS.get(self.stage, self.stage),
+            "message": self.message,
+            "created_at": self.created_at.isoformat(),
+            "elapsed": round(self.elapsed(), 2),
+            "stage_times": dict(self.stage_times),
+        }
+
+
+class IngestionQueue:
+    """제한된 동시성의 백그라운드 PDF 수집 작업 큐"""
+    
+    def __init__(self, max_workers: Optional[int] = None, name: str = "수집 큐", thread_name_prefix: str = "ingest"):
+        self.max_workers = max(1, max_workers or Config.INGEST_MAX_CONCURRENCY)
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=thread_name_prefix)
+        self._jobs: Dict[str, IngestionJob] = {}
+        self._lock = threading.Lock()
+        logger.info(f"✅ 백그라운드 작업 큐 초기화 완료 ({self.name}, 동시 실행: {self.max_workers})")
+    
+    def submit(self, label: str, func: Callable[[Callable[[str], None]], Dict[str, Any]],
+               dedupe_key: Optional[str] = None) -> tuple[IngestionJob, bool]:
+        """작업 등록 (동일 dedupe_key 작업이 진행 중이면 기존 작업 반환)"""
+        with self._lock:
+            if dedupe_key:
+                for job in self._jobs.values():
+                    if job.dedupe_key == dedupe_key and not job.finished:
+                        logger.info(f"⚠️ [{self.name}] 이미 처리 중인 작업: {job.job_id} ({job.label})")
+                        return job, False
+            
+            job = IngestionJob(label, dedupe_key)
+            self._jobs[job.job_id] = job
+        
+        logger.info(f"📥 [{self.name}] 작업 등록: {job.job_id} ({label})")
+        self._executor.submit(self._run, job, func)
+        return job, True
+    
+    def _run(self, job: IngestionJob, func: Callable[[Callable[[str], None]], Dict[str, Any]]):
+        """작업 실행 (작업 스레드)"""
+        job.started_at = time.time()
+        
+        def progress_callback(stage: str):
+            job.stage_times[job.stage] = round(time.time() - job.started_at, 2)
+            job.stage = stage
+            logger.info(f"🔄 [{self.name}] {job.job_id} → {INGEST_STAGE_LABELS.get(stage, stage)}")
+        
+        try:
+            result = func(progress_callback) or {}
+            job.result = result
+            if result.get("success"):
+                job.message = result.get("message", "")
+                progress_callback("done")
+            else:
+                job.message = result.get("error", "알 수 없는 오류")
+                progress_callback("failed")
+        except Exception as e:
+            logger.error(f"❌ [{self.name}] {job.job_id} 처리 중 오류: {e}")
+            job.message = str(e)
+            progress_callback("failed")
+        finally:
+            job.finished_at = time.time()
+            logger.info(f"🏁 [{self.name}] {job.job_id} 종료 ({job.stage}, {job.elapsed():.1f}초)")
+    
+    def get_job(self, job_id: str) -> Optional[IngestionJob]:
+        """작업 ID로 작업 조회"""
+        return self._jobs.get(job_id)
+    
+    def list_jobs(self, limit: int = 10) -> List[IngestionJob]:
+        """최근 작업 목록 (최신순)"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)[:limit]
+    
+    def active_count(self) -> int:
+        """진행 중(대기 포함) 작업 수"""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.finished)
+    
+    def wait_all(self, poll_interval: float = 0.5):
+        """모든 작업 종료까지 대기"""
+        while self.active_count() > 0:
+            time.sleep(poll_interval)
+    
+    def shutdown(self, wait: bool = True):
+        """작업 큐 종료"""
+        self._executor.shutdown(wait=wait)
+
+
+# 전역 작업 큐 인스턴스
+ingestion_queue = IngestionQueue()
+
+# 전역 정답·해설 사전 계산 큐 인스턴스 (PDF 수집 작업 슬롯을 차지하지 않도록 분리)
+precompute_queue = IngestionQueue(Config.PRECOMPUTE_QUEUE_CONCURRENCY, name="사전 계산 큐", thread_name_prefix="precompute")
@@ -0,0 +1,298 @@
+"""
+공용 Azure OpenAI 클라이언트
+모든 호출부가 연결 풀(httpx, keep-alive)을 공유하는 동기/비동기 클라이언트를 사용하고,
+재시도(지터가 있는 지수 백오프)와 요청별 타임아웃은 Config 설정을 따릅니다.
+모든 요청은 rate_limiter의 RPM/TPM·동시 요청 제한을 거쳐 나가며, cached_* 호출은 response_cache를 먼저 확인합니다.
+비동기 호출은 전용 이벤트 루프 스레드에서 실행되며, 동기 코드(Gradio 핸들러, 작업 스레드)는 run()으로 호출합니다.
+"""
+
+import asyncio
+import random
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import httpx
+import openai
+from openai import AzureOpenAI, AsyncAzureOpenAI
+
+from config import Config
+from rate_limiter import rate_limiter, estimate_tokens
+from response_cache import response_cache
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """파이프라인 단계별 소요 시간 기록"""
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+    
+    @contextmanager
+    def stage(self, name: str):
+        """단계 구간 측정 (같은 이름은 누적)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+    
+    def total(self) -> float:
+        """전체 경과 시간(초)"""
+        return time.perf_counter() - self.started
+    
+    def summary(self) -> str:
+        """단계별 소요 시간 요약 문자열"""
+        parts = [f"{name} {seconds:.2f}초" for name, seconds in self.stages.items()]
+        parts.append(f"전체 {self.total():.2f}초")
+        return ", ".join(parts)
+
+
+# 재시도 대상 오류 (연결 실패, 타임아웃, 429, 5xx)
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class LLMClient:
+    """연결 풀을 공유하는 Azure OpenAI 클라이언트 팩토리 (동기/비동기)"""
+    
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[AsyncAzureOpenAI] = None
+        self._sync_client: Optional[AzureOpenAI] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _http_options() -> Dict[str, Any]:
+        """httpx 연결 풀·타임아웃 설정"""
+        return {
+            "limits": httpx.Limits(
+                max_connections=Config.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=Config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=Config.LLM_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            "timeout": httpx.Timeout(Config.LLM_TIMEOUT_SECONDS, connect=Config.LLM_CONNECT_TIMEOUT_SECONDS),
+            "follow_redirects": True,
+        }
+    
+    @staticmethod
+    def _client_options() -> Dict[str, Any]:
+        """Azure OpenAI 클라이언트 공통 설정 (SDK 자체 재시도는 끄고 여기서 백오프 처리)"""
+        return {
+            "api_key": Config.OPENAI_API_KEY,
+            "azure_endpoint": Config.AZURE_ENDPOINT,
+            "api_version": Config.OPENAI_API_VERSION,
+            "max_retries": 0,
+        }
+    
+    @staticmethod
+    def _backoff_delay(attempt: int, error: Exception) -> float:
+        """재시도 대기 시간 (서버의 Retry-After 우선, 없으면 지수 백오프 + 전체 지터)"""
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), Config.LLM_BACKOFF_MAX_SECONDS)
+            except ValueError:
+                pass
+        return random.uniform(0, min(Config.LLM_BACKOFF_MAX_SECONDS, Config.LLM_BACKOFF_BASE_SECONDS * (2 ** attempt)))
+    
+    @property
+    def sync_client(self) -> AzureOpenAI:
+        """동기 AzureOpenAI 클라이언트 (최초 사용 시 생성, 모든 스레드가 연결 풀 공유)"""
+        with self._lock:
+            if self._sync_client is None:
+                self._sync_client = AzureOpenAI(
+                    http_client=httpx.Client(**self._http_options()),
+                    **self._client_options()
+                )
+                logger.info(f"✅ Azure OpenAI 연결 풀 생성 (최대 연결 {Config.LLM_MAX_CONNECTIONS}개)")
+            return self._sync_client
+    
+    def create(self, timeout: Optional[float] = None, **kwargs: Any):
+        """채팅 완성 요청 (재시도 포함, 응답 객체 반환)"""
+        kwargs.setdefault("model", str(Config.DEPLOYMENT_NAME))
+        cost = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens"))
+        for attempt in range(Config.LLM_MAX_RETRIES + 1):
+            with rate_limiter.slot(cost):
+                try:
+                    return self.sync_client.chat.completions.create(timeout=timeout or Config.LLM_TIMEOUT_SECONDS, **kwargs)
+                except RETRYABLE_ERRORS as e:
+                    if attempt >= Config.LLM_MAX_RETRIES:
+                        raise
+                    delay = self._backoff_delay(attempt, e)
+                    if isinstance(e, openai.RateLimitError):
+                        rate_limiter.pause(delay)
+                    logger.warning(f"⚠️ Azure OpenAI 요청 실패 ({type(e).__name__}), {delay:.2f}초 후 재시도 ({attempt + 1}/{Config.LLM_MAX_RETRIES})")
+            time.sleep(delay)
+    
+    def complete(self, messages: List[Dict[str, str]], temperature: float = 0.7, **kwargs: Any) -> Optional[str]:
+        """채팅 완성 요청 (응답 본문 반환)"""
+        response = self.create(messages=messages, temperature=temperature, **kwargs)
+        return response.choices[0].message.content
+    
+    def stream(self, messages: List[Dict[str, str]], temperature: float = 0.7, timeout: Optional[float] = None, **kwargs: Any) -> Iterator[str]:
+        """스트리밍 채팅 완성 요청 (응답 조각을 도착하는 대로 반환, 첫 조각을 받기 전 실패만 재시도)"""
+        kwargs.setdefault("model", str(Config.DEPLOYMENT_NAME))
+        cost = estimate_tokens(messages, kwargs.get("max_tokens"))
+        for attempt in range(Config.LLM_MAX_RETRIES + 1):
+            started = False
+            with rate_limiter.slot(cost):
+                try:
+                    response = self.sync_client.chat.completions.create(
+                        messages=messages, temperature=temperature, stream=True,
+                        timeout=timeout or Config.LLM_TIMEOUT_SECONDS, **kwargs
+                    )
+                    for chunk in response:
+                        # Azure는 콘텐츠 필터 결과만 담긴 빈 조각을 보내기도 함
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            started = True
+                            yield chunk.choices[0].delta.content
+                    return
+                except RETRYABLE_ERRORS as e:
+                    if started or attempt >= Config.LLM_MAX_RETRIES:
+                        raise
+                    delay = self._backoff_delay(attempt, e)
+                    if isinstance(e, openai.RateLimitError):
+                        rate_limiter.pause(delay)
+                    logger.warning(f"⚠️ Azure OpenAI 스트리밍 요청 실패 ({type(e).__name__}), {delay:.2f}초 후 재시도 ({attempt + 1}/{Config.LLM_MAX_RETRIES})")
+            time.sleep(delay)
+    
+    def cached_stream(self, messages: List[Dict[str, str]], temperature: float = 0.7, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        """응답 캐시를 거치는 스트리밍 요청 ({"delta", "cache_hit"} 반환, 캐시 적중 시 전체 응답을 한 번에 반환)"""
+        key = response_cache.make_key(str(Config.DEPLOYMENT_NAME), messages, temperature, kwargs)
+        if Config.LLM_CACHE_ENABLED:
+            cached = response_cache.get(key)
+            if cached is not None:
+                logger.info("♻️ 응답 캐시 적중 (모델 호출 생략)")
+                yield {"delta": cached, "cache_hit": True}
+                return
+        chunks = []
+        for delta in self.stream(messages, temperature, **kwargs):
+            chunks.append(delta)
+            yield {"delta": delta, "cache_hit": False}
+        content = "".join(chunks)
+        if content and Config.LLM_CACHE_ENABLED:
+            response_cache.put(key, content)
+    
+    def cached_complete(self, messages: List[Dict[str, str]], temperature: float = 0.7, **kwargs: Any) -> Dict[str, Any]:
+        """응답 캐시를 거치는 채팅 완성 요청 ({"content", "cache_hit"})"""
+        key = response_cache.make_key(str(Config.DEPLOYMENT_NAME), messages, temperature, kwargs)
+        if Config.LLM_CACHE_ENABLED:
+            cached = response_cache.get(key)
+            if cached is not None:
+                logger.info("♻️ 응답 캐시 적중 (모델 호출 생략)")
+                return {"content": cached, "cache_hit": True}
+        content = self.complete(messages, temperature, **kwargs)
+        if content and Config.LLM_CACHE_ENABLED:
+            response_cache.put(key, content)
+        return {"content": content, "cache_hit": False}
+    
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """전용 이벤트 루프 스레드 시작 (최초 호출 시)"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="llm-loop", daemon=True).start()
+                logger.info("✅ 비동기 LLM 이벤트 루프 시작")
+            return self._loop
+    
+    @property
+    def client(self) -> AsyncAzureOpenAI:
+        """AsyncAzureOpenAI 클라이언트 (최초 사용 시 생성, 전용 이벤트 루프에서만 사용)"""
+        if self._client is None:
+            self._client = AsyncAzureOpenAI(
+                http_client=httpx.AsyncClient(**self._http_options()),
+                **self._client_options()
+            )
+        return self._client
+    
+    async def acreate(self, timeout: Optional[float] = None, **kwargs: Any):
+        """비동기 채팅 완성 요청 (재시도 포함, 응답 객체 반환)"""
+        kwargs.setdefault("model", str(Config.DEPLOYMENT_NAME))
+        cost = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens"))
+        for attempt in range(Config.LLM_MAX_RETRIES + 1):
+            async with rate_limiter.aslot(cost):
+                try:
+                    return await self.client.chat.completions.create(timeout=timeout or Config.LLM_TIMEOUT_SECONDS, **kwargs)
+                except RETRYABLE_ERRORS as e:
+                    if attempt >= Config.LLM_MAX_RETRIES:
+                        raise
+                    delay = self._backoff_delay(attempt, e)
+                    if isinstance(e, openai.RateLimitError):
+                        rate_limiter.pause(delay)
+                    logger.warning(f"⚠️ Azure OpenAI 요청 실패 ({type(e).__name__}), {delay:.2f}초 후 재시도 ({attempt + 1}/{Config.LLM_MAX_RETRIES})")
+            await asyncio.sleep(delay)
+    
+    async def chat(self, messages: List[Dict[str, str]], temperature: float = 0.7, **kwargs: Any) -> Optional[str]:
+        """비동기 채팅 완성 요청 (응답 본문 반환)"""
+        response = await self.acreate(messages=messages, temperature=temperature, **kwargs)
+        return response.choices[0].message.content
+    
+    async def astream(self, messages: List[Dict[str, str]], temperature: float = 0.7, timeout: Optional[float] = None, **kwargs: Any) -> AsyncIterator[str]:
+        """비동기 스트리밍 채팅 완성 요청 (응답 조각을 도착하는 대로 반환, 첫 조각을 받기 전 실패만 재시도)"""
+        kwargs.setdefault("model", str(Config.DEPLOYMENT_NAME))
+        cost = estimate_tokens(messages, kwargs.get("max_tokens"))
+        for attempt in range(Config.LLM_MAX_RETRIES + 1):
+            started = False
+            async with rate_limiter.aslot(cost):
+                try:
+                    response = await self.client.chat.completions.create(
+                        messages=messages, temperature=temperature, stream=True,
+                        timeout=timeout or Config.LLM_TIMEOUT_SECONDS, **kwargs
+                    )
+                    async for chunk in response:
+                        # Azure는 콘텐츠 필터 결과만 담긴 빈 조각을 보내기도 함
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            started = True
+                            yield chunk.choices[0].delta.content
+                    return
+                except RETRYABLE_ERRORS as e:
+                    if started or attempt >= Config.LLM_MAX_RETRIES:
+                        raise
+                    delay = self._backoff_delay(attempt, e)
+                    if isinstance(e, openai.RateLimitError):
+                        rate_limiter.pause(delay)
+                    logger.warning(f"⚠️ Azure OpenAI 스트리밍 요청 실패 ({type(e).__name__}), {delay:.2f}초 후 재시도 ({attempt + 1}/{Config.LLM_MAX_RETRIES})")
+            await asyncio.sleep(delay)
+    
+    async def cached_chat(self, messages: List[Dict[str, str]], temperature: float = 0.7, **kwargs: Any) -> Dict[str, Any]:
+        """응답 캐시를 거치는 비동기 채팅 완성 요청 ({"content", "cache_hit"})"""
+        key = response_cache.make_key(str(Config.DEPLOYMENT_NAME), messages, temperature, kwargs)
+        if Config.LLM_CACHE_ENABLED:
+            cached = response_cache.get(key)
+            if cached is not None:
+                logger.info("♻️ 응답 캐시 적중 (모델 호출 생략)")
+                return {"content": cached, "cache_hit": True}
+        content = await self.chat(messages, temperature, **kwargs)
+        if content and Config.LLM_CACHE_ENABLED:
+            response_cache.put(key, content)
+        return {"content": content, "cache_hit": False}
+    
+    def run(self, coro, timeout: Optional[float] = None):
+        """동기 코드에서 코루틴 실행 (전용 이벤트 루프에서 실행하고 결과 대기, 시간 초과 시 취소)"""
+        # 호출한 스레드의 우선순위 레인을 이벤트 루프 태스크에도 적용
+        priority = rate_limiter.current_priority()
+        
+        async def with_lane():
+            with rate_limiter.lane(priority):
+                return await coro
+        
+        future = asyncio.run_coroutine_threadsafe(with_lane(), self._ensure_loop())
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+
+# 전역 LLM 클라이언트 인스턴스 (모든 Azure OpenAI 호출이 공유)
+llm_client = LLMClient()
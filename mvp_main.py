@@ -3,20 +3,22 @@ import gradio as gr
 import os
 import json
 import random
-import tempfile
 import logging
 import time
 import uuid
 import hashlib
 import re
 import traceback
+import threading
+import asyncio
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Iterator
 
 # Third-party imports
 from dotenv import load_dotenv
-import openai
 
 # Optional imports (handled with try-except)
 try:
@@ -30,17 +32,29 @@ from config import Config
 from logger import UserLogger
 from prompt import ExamPrompts, ChatPrompts, AnalysisPrompts, PDFProcessingPrompts
 from vector_store import vector_store
-from pdf_processor import pdf_processor
+from pdf_processor import pdf_processor, DOCLING_PROFILES
 from review_agent_simple import review_agent
+from ingestion_queue import ingestion_queue, precompute_queue
+from blob_store import blob_store, BlobStore
+from figure_rules import requires_figure
+from answer_key import OPTION_NUMERALS
+from grading import grade_choice, format_verdict
+from answer_precompute import answer_precomputer, parse_question_sections
+from llm_client import llm_client, StageTimer
+from response_cache import response_cache
+from question_pool import question_pool
+from rate_limiter import rate_limiter
+from question_stream import QuestionStreamParser
+from context_rules import context_prevalidator
+from question_checker import check_question
+from structured_question import parse_question_json, render_question_text, self_check_issues
+from token_budget import token_budgeter, CALL_CHAT, CALL_GENERATION
+from conversation_memory import conversation_compactor, new_memory
 
 # 로거 설정
 logger = logging.getLogger(__name__)
 
-# Azure OpenAI 설정 (config.py import 이후에 설정)
-openai.api_key = Config.OPENAI_API_KEY
-openai.azure_endpoint = Config.AZURE_ENDPOINT
-openai.api_type = Config.OPENAI_API_TYPE
-openai.api_version = Config.OPENAI_API_VERSION
+# Azure OpenAI 호출은 llm_client의 공용 클라이언트(연결 풀·재시도·타임아웃) 사용
 DEPLOYMENT_NAME = Config.DEPLOYMENT_NAME
 
 class ExamQuestionGenerator:
@@ -56,6 +70,16 @@ class ExamQuestionGenerator:
         self.current_metadata = None  # 검색된 문제의 메타데이터
         self.question_mode = "generate"  # "generate" 또는 "exact"
         self.current_exam_name = None  # 현재 선택된 시험 이름
+        self.last_generation_timings = {}  # 마지막 문제 생성의 단계별 소요 시간(초)
+        
+        # 로컬 채점 후 백그라운드로 생성하는 AI 해설 (결과는 요청한 세션의 제너레이터가 받아 표시)
+        self._feedback_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="answer-feedback")
+        
+        # 스트리밍 문제 생성 작업 (Gradio 제너레이터 핸들러가 부분 결과를 받아 표시)
+        self._stream_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="question-stream")
+        
+        # "문제 생성" 모드용 사전 생성 문제 풀 생산자 등록
+        question_pool.set_producer(self._produce_pooled_question)
         
         # 시험 관리 데이터
         self.exams = {}  # {exam_name: {pdfs: [], subjects: []}}
@@ -64,6 +88,9 @@ class ExamQuestionGenerator:
         # PDF 중복 체크를 위한 해시 저장소
         self.pdf_hashes = {}  # {exam_name: {filename: hash}}
         
+        # 백그라운드 PDF 처리 작업과의 시험/해시 데이터 동시 수정 방지
+        self._data_lock = threading.RLock()
+        
         # 오답노트 데이터
         self.wrong_answers = {}  # {exam_name: {question_hash: {question, answer, explanation, wrong_count, last_wrong_date, metadata}}}
         
@@ -130,6 +157,15 @@ class ExamQuestionGenerator:
             except Exception as e:
                 logger.warning(f"⚠️ 벡터 DB 삭제 실패: {e}")
             
+            # 2-1. PDF 처리기 인덱스와 수집 체크포인트도 삭제 (같은 PDF를 다시 올리면 처음부터 수집)
+            try:
+                for filename, pdf_hash in self.pdf_hashes.get(exam_name, {}).items():
+                    pdf_processor.remove_ingested(pdf_hash, filename, exam_name)
+                pdf_processor._save_metadata()
+                pdf_processor.remove_checkpoints(exam_name)
+            except Exception as e:
+                logger.warning(f"⚠️ 수집 데이터 삭제 실패: {e}")
+            
             # 3. 메모리 데이터 삭제
             del self.exams[exam_name]
             self.exam_names.remove(exam_name)
@@ -146,7 +182,13 @@ class ExamQuestionGenerator:
             if exam_name in self.recent_questions:
                 del self.recent_questions[exam_name]
             
-            # 7. 모든 데이터 파일 저장 (업데이트된 상태로)
+            # 7. 미리 생성해 둔 문제 풀도 비움
+            question_pool.clear(exam_name)
+            
+            # 8. 챗봇 의미 기반 캐시 삭제
+            response_cache.clear_exam(exam_name)
+            
+            # 9. 모든 데이터 파일 저장 (업데이트된 상태로)
             self._save_exam_data()
             self._save_pdf_hashes()
             self._save_wrong_answers()
@@ -194,33 +236,40 @@ class ExamQuestionGenerator:
             uploaded_date = pdf.get("uploaded_at", "").split("T")[0] if pdf.get("uploaded_at") else "날짜 없음"
             result += f"{i}. 📄 {pdf.get('filename', '알 수 없는 파일')}\n"
             result += f"   📊 청크 수: {pdf.get('chunks_count', 0)}개\n"
+            if pdf.get("profile"):
+                result += f"   ⚙️ 처리 프로필: {pdf.get('profile')}\n"
             result += f"   📅 업로드: {uploaded_date}\n\n"
         
         logger.debug(f"🔍 [DEBUG] 생성된 결과: {result}")
         return result
     
+    def get_exam_profile(self, exam_name: str) -> str:
+        """시험별 Docling 처리 프로필 반환 (없으면 기본 프로필)"""
+        return pdf_processor.resolve_profile(self.exams.get(exam_name, {}).get("ingest_profile"))
+    
+    def set_exam_profile(self, exam_name: str, profile: str) -> str:
+        """시험별 Docling 처리 프로필 저장"""
+        if not exam_name or exam_name not in self.exams:
+            return f"❌ '{exam_name}' 시험을 찾을 수 없습니다."
+        
+        if profile not in DOCLING_PROFILES:
+            return "❌ 저장할 처리 프로필을 선택해주세요."
+        
+        self.exams[exam_name]["ingest_profile"] = profile
+        self._save_exam_data()
+        logger.info(f"✅ [콘솔 로그] 시험 처리 프로필 저장: {exam_name} → {profile}")
+        return f"✅ '{exam_name}' 시험의 기본 처리 프로필이 '{DOCLING_PROFILES[profile]['label']}'(으)로 저장되었습니다."
+    
     def update_exam_list(self):
         """시험 목록 업데이트 (Gradio용)"""
         return gr.Dropdown(choices=self.get_exam_list())
     
     def calculate_pdf_hash(self, pdf_file) -> str:
-        """PDF 파일의 해시값 계산"""
+        """PDF 파일의 해시값 계산 (파일 전체를 메모리에 올리지 않고 블록 단위로 계산)"""
         
         try:
-            if isinstance(pdf_file, str):
-                # 파일 경로인 경우, 파일을 읽어서 해시 계산
-                with open(pdf_file, 'rb') as f:
-                    content = f.read()
-            elif hasattr(pdf_file, 'read'):
-                # 파일 객체인 경우
-                pdf_file.seek(0)  # 파일 포인터를 처음으로
-                content = pdf_file.read()
-            else:
-                # 바이트 데이터인 경우
-                content = pdf_file
-            
-            # SHA-256 해시 계산
-            return hashlib.sha256(content).hexdigest()
+            # 파일 경로/파일 객체/바이트 데이터 모두 스트리밍으로 SHA-256 해시 계산
+            return BlobStore.hash_stream(pdf_file)
         except Exception as e:
             logger.warning(f"⚠️ 해시 계산 중 오류: {e}")
             # 오류 발생 시 파일명 기반 해시 생성
@@ -230,16 +279,16 @@ class ExamQuestionGenerator:
                 return hashlib.sha256(str(pdf_file).encode('utf-8')).hexdigest()
     
     def is_pdf_duplicate(self, exam_name: str, filename: str, pdf_hash: str) -> bool:
-        """PDF 중복 체크"""
+        """PDF 중복 체크 (같은 파일명이라도 내용이 바뀐 개정판은 중복이 아님)"""
         if exam_name not in self.pdf_hashes:
             return False
         
-        # 파일명과 해시 모두 체크
-        for stored_filename, stored_hash in self.pdf_hashes[exam_name].items():
-            if stored_filename == filename or stored_hash == pdf_hash:
-                return True
-        
-        return False
+        return pdf_hash in self.pdf_hashes[exam_name].values()
+    
+    def find_previous_revision(self, exam_name: str, filename: str, pdf_hash: str) -> Optional[str]:
+        """같은 파일명으로 이미 처리된 이전 버전의 해시 (개정판이 아니면 None)"""
+        stored_hash = self.pdf_hashes.get(exam_name, {}).get(filename)
+        return stored_hash if stored_hash and stored_hash != pdf_hash else None
     
     def _save_pdf_hashes(self):
         """PDF 해시 정보 저장"""
@@ -311,29 +360,31 @@ class ExamQuestionGenerator:
             print(f"❌ 오답노트 데이터 로드 실패: {e}")
             self.wrong_answers = {}
         
-    def upload_pdf(self, pdf_file, exam_name: str) -> tuple[str, gr.Dropdown]:
-        """PDF 파일 업로드 및 벡터 DB 구축"""
+    def _ensure_exam(self, exam_name: str):
+        """시험이 없으면 자동 생성"""
+        with self._data_lock:
+            if exam_name not in self.exams:
+                self.exams[exam_name] = {
+                    "pdfs": [],
+                    "subjects": [],
+                    "created_at": datetime.now().isoformat()
+                }
+                self.exam_names.append(exam_name)
+                # 시험 데이터 저장
+                self._save_exam_data()
+    
+    def _prepare_upload(self, pdf_file, exam_name: str, profile: str = "default") -> tuple[Optional[Dict[str, Any]], str]:
+        """업로드 파일 검증 및 블롭 저장소 보관 (처리 작업 정보, 오류 메시지) 반환"""
         if pdf_file is None:
-            return "❌ PDF 파일을 선택해주세요.", gr.Dropdown(choices=self.get_exam_list())
+            return None, "❌ PDF 파일을 선택해주세요."
         
         if not exam_name.strip():
-            return "❌ 시험 이름을 입력해주세요.", gr.Dropdown(choices=self.get_exam_list())
+            return None, "❌ 시험 이름을 입력해주세요."
         
         # 시험이 없으면 자동 생성
-        if exam_name not in self.exams:
-            self.exams[exam_name] = {
-                "pdfs": [],
-                "subjects": [],
-                "created_at": datetime.now().isoformat()
-            }
-            self.exam_names.append(exam_name)
-            # 시험 데이터 저장
-            self._save_exam_data()
+        self._ensure_exam(exam_name)
         
         try:
-            # PDF 해시 계산
-            pdf_hash = self.calculate_pdf_hash(pdf_file)
-            
             # Gradio에서 전달된 파일 객체 처리
             filename = "uploaded_file.pdf"  # 기본값
             actual_filename = "uploaded_file.pdf"  # 실제 파일명 (사용자에게 표시용)
@@ -368,91 +419,263 @@ class ExamQuestionGenerator:
             
             print(f"📄 [PDF 업로드] 시험: {exam_name}, 파일: {filename}")
             
-            # 중복 체크
-            if self.is_pdf_duplicate(exam_name, filename, pdf_hash):
-                return f"⚠️ 중복된 PDF 파일입니다!\n\n📊 기존 정보:\n- 시험: {exam_name}\n- 파일명: {filename}\n- 해시: {pdf_hash[:16]}...\n- 상태: 이미 벡터 DB에 저장됨\n\n✅ 기존 벡터 데이터를 재사용합니다. (처리 시간 단축)", gr.Dropdown(choices=self.get_exam_list())
-            
-            # 임시 파일로 저장
-            temp_path = tempfile.mktemp(suffix='.pdf')
-            
+            # 한 번 읽으면서 해시 계산과 블롭 저장소 보관을 함께 수행 (blobs/<sha256>.pdf)
             try:
-                if isinstance(actual_file, str):
-                    # 파일 경로인 경우, 파일을 복사
-                    import shutil
-                    shutil.copy2(actual_file, temp_path)
-                elif hasattr(actual_file, 'read') and callable(getattr(actual_file, 'read', None)):
-                    # 파일 객체인 경우
-                    if hasattr(actual_file, 'seek'):
-                        actual_file.seek(0)  # type: ignore # 파일 포인터를 처음으로
-                    with open(temp_path, 'wb') as f:
-                        f.write(actual_file.read())  # type: ignore
-                elif isinstance(actual_file, (bytes, bytearray)):
-                    # 바이트 데이터인 경우
-                    with open(temp_path, 'wb') as f:
-                        f.write(actual_file)
-                else:
-                    # 기타 경우, 문자열로 변환하여 처리
-                    with open(temp_path, 'wb') as f:
-                        f.write(str(actual_file).encode('utf-8'))
+                pdf_hash, pdf_path = blob_store.put(actual_file)
             except Exception as e:
                 logger.warning(f"⚠️ 파일 처리 중 오류: {e}")
                 # 오류 발생 시 원본 파일 객체 사용
-                if isinstance(pdf_file, str):
-                    import shutil
-                    shutil.copy2(pdf_file, temp_path)
-                elif hasattr(pdf_file, 'read') and callable(getattr(pdf_file, 'read', None)):
-                    if hasattr(pdf_file, 'seek'):
-                        pdf_file.seek(0)
-                    with open(temp_path, 'wb') as f:
-                        f.write(pdf_file.read())
-                elif isinstance(pdf_file, (bytes, bytearray)):
-                    with open(temp_path, 'wb') as f:
-                        f.write(pdf_file)
-                else:
-                    with open(temp_path, 'wb') as f:
-                        f.write(str(pdf_file).encode('utf-8'))
+                pdf_hash, pdf_path = blob_store.put(pdf_file)
             
-            # PDF 처리 (실제 파일명 전달)
-            result = pdf_processor.process_pdf(temp_path, exam_name, actual_filename)
+            # 중복 체크
+            if self.is_pdf_duplicate(exam_name, actual_filename, pdf_hash):
+                return None, f"⚠️ 중복된 PDF 파일입니다!\n\n📊 기존 정보:\n- 시험: {exam_name}\n- 파일명: {filename}\n- 해시: {pdf_hash[:16]}...\n- 상태: 이미 벡터 DB에 저장됨\n\n✅ 기존 벡터 데이터를 재사용합니다. (처리 시간 단축)"
+            
+            # 같은 파일명의 개정판이면 변경된 페이지만 재처리
+            previous_hash = self.find_previous_revision(exam_name, actual_filename, pdf_hash)
+            if previous_hash:
+                print(f"🔁 [PDF 업로드] 개정판 감지: {actual_filename} ({previous_hash[:16]}... → {pdf_hash[:16]}...)")
+            
+            # 처리 프로필 결정 (업로드 선택 > 시험 기본값 > 전역 기본값)
+            if profile not in DOCLING_PROFILES:
+                profile = self.get_exam_profile(exam_name)
+            
+            return {
+                "exam_name": exam_name,
+                "filename": filename,
+                "actual_filename": actual_filename,
+                "pdf_hash": pdf_hash,
+                "pdf_path": pdf_path,
+                "profile": profile,
+                "previous_hash": previous_hash
+            }, ""
+        except Exception as e:
+            error_msg = f"PDF 업로드 중 오류 발생: {e}"
+            print(f"❌ {error_msg}")
+            return None, error_msg
+    
+    def _ingest_prepared(self, prepared: Dict[str, Any], progress_callback=None, persist: bool = True) -> Dict[str, Any]:
+        """준비된 PDF 처리 및 시험 정보 반영 (백그라운드 작업에서도 호출)"""
+        exam_name = prepared["exam_name"]
+        actual_filename = prepared["actual_filename"]
+        pdf_hash = prepared["pdf_hash"]
+        profile = prepared["profile"]
+        
+        # PDF 처리 (블롭 저장소 원본에서 변환, 실패 시 같은 해시로 재시도하면 체크포인트에서 재개)
+        result = pdf_processor.process_pdf(prepared["pdf_path"], exam_name, actual_filename,
+                                           profile=profile, progress_callback=progress_callback,
+                                           persist=persist, pdf_hash=pdf_hash,
+                                           previous_hash=prepared.get("previous_hash"))
+        
+        if not result["success"]:
+            return {"success": False, "error": f"❌ PDF 처리 실패: {result['error']}"}
+        
+        self._record_ingested(exam_name, actual_filename, pdf_hash, result, profile)
+        if persist:
+            self.schedule_answer_precompute(exam_name, actual_filename)
+        
+        revision_info = ""
+        if result.get("previous_hash"):
+            revision_info = (f"- 개정판 재사용 페이지: {result.get('reused_pages', 0)}/{result.get('pages_count', 0)}페이지 "
+                             f"(재처리 {result.get('reprocessed_pages', 0)}페이지, 재사용 청크 {result.get('reused_chunks', 0)}개)\n")
+        message = f"✅ PDF 업로드 완료!\n\n📊 처리 결과:\n- 시험: {exam_name}\n- 파일명: {actual_filename}\n- 생성된 청크: {result['chunks_count']}개\n- 추출된 문제: {result.get('questions_count', 0)}개 (정답표 연결 {result.get('answered_count', 0)}개)\n- 빠른 경로 페이지: {result.get('fast_pages', 0)}/{result.get('pages_count', 0)}페이지\n{revision_info}- 처리 프로필: {result.get('profile', profile)}\n- 해시: {pdf_hash[:16]}...\n\n📝 추출된 문제는 'extracted_questions' 폴더에 저장되었습니다.\n이제 기출문제 기반 문제 생성이 가능합니다."
+        return {"success": True, "message": message, "result": result}
+    
+    def _record_ingested(self, exam_name: str, actual_filename: str, pdf_hash: str, result: Dict[str, Any], profile: str):
+        """처리 완료된 PDF를 시험 정보와 해시 저장소에 반영 (이미 반영된 경우 건너뜀, 개정판은 기존 항목 교체)"""
+        # 시험 정보 업데이트 (실제 파일명 사용)
+        pdf_info = {
+            "filename": actual_filename,
+            "chunks_count": result["chunks_count"],
+            "profile": result.get("profile", profile),
+            "uploaded_at": datetime.now().isoformat()
+        }
+        
+        self._ensure_exam(exam_name)
+        with self._data_lock:
+            if self.pdf_hashes.get(exam_name, {}).get(actual_filename) == pdf_hash:
+                return
             
-            # 임시 파일 삭제
-            os.unlink(temp_path)
+            pdfs = [pdf for pdf in self.exams[exam_name]["pdfs"] if pdf.get("filename") != actual_filename]
+            pdfs.append(pdf_info)
+            self.exams[exam_name]["pdfs"] = pdfs
             
-            if result["success"]:
-                # 시험 정보 업데이트 (실제 파일명 사용)
-                pdf_info = {
-                    "filename": actual_filename,
-                    "chunks_count": result["chunks_count"],
-                    "uploaded_at": datetime.now().isoformat()
-                }
-                self.exams[exam_name]["pdfs"].append(pdf_info)
-                
-                print(f"✅ [DEBUG] PDF 정보 추가: {pdf_info}")
-                print(f"✅ [DEBUG] 현재 {exam_name}의 PDF 개수: {len(self.exams[exam_name]['pdfs'])}")
-                
-                # PDF 해시 저장 (실제 파일명 사용)
-                if exam_name not in self.pdf_hashes:
-                    self.pdf_hashes[exam_name] = {}
-                self.pdf_hashes[exam_name][actual_filename] = pdf_hash
-                
-                # 해시 정보 영구 저장
-                self._save_pdf_hashes()
-                
-                # 시험 데이터 저장
-                self._save_exam_data()
-                print(f"✅ [DEBUG] 시험 데이터 저장 완료")
-                
-                return f"✅ PDF 업로드 완료!\n\n📊 처리 결과:\n- 시험: {exam_name}\n- 파일명: {actual_filename}\n- 생성된 청크: {result['chunks_count']}개\n- 추출된 문제: {result.get('questions_count', 0)}개\n- 해시: {pdf_hash[:16]}...\n\n📝 추출된 문제는 'extracted_questions' 폴더에 저장되었습니다.\n이제 기출문제 기반 문제 생성이 가능합니다.", gr.Dropdown(choices=self.get_exam_list())
-            else:
-                return f"❌ PDF 처리 실패: {result['error']}", gr.Dropdown(choices=self.get_exam_list())
-                
+            print(f"✅ [DEBUG] PDF 정보 추가: {pdf_info}")
+            print(f"✅ [DEBUG] 현재 {exam_name}의 PDF 개수: {len(self.exams[exam_name]['pdfs'])}")
+            
+            # PDF 해시 저장 (실제 파일명 사용)
+            if exam_name not in self.pdf_hashes:
+                self.pdf_hashes[exam_name] = {}
+            self.pdf_hashes[exam_name][actual_filename] = pdf_hash
+            
+            # 해시 정보 영구 저장
+            self._save_pdf_hashes()
+            
+            # 시험 데이터 저장
+            self._save_exam_data()
+            print(f"✅ [DEBUG] 시험 데이터 저장 완료")
+    
+    def _unrecord_ingested(self, exam_name: str, actual_filename: str, pdf_hash: str):
+        """_record_ingested 반영 취소 (인덱스 저장에 실패한 일괄 수집 파일을 다시 처리할 수 있도록)"""
+        with self._data_lock:
+            if self.pdf_hashes.get(exam_name, {}).get(actual_filename) != pdf_hash:
+                return
+            del self.pdf_hashes[exam_name][actual_filename]
+            self.exams[exam_name]["pdfs"] = [pdf for pdf in self.exams[exam_name]["pdfs"]
+                                             if pdf.get("filename") != actual_filename]
+            self._save_pdf_hashes()
+            self._save_exam_data()
+    
+    def resume_pending_ingests(self) -> int:
+        """중단된 PDF 처리 작업을 체크포인트에서 재개 (시작 시 호출, 재개한 작업 수 반환)"""
+        resumed = 0
+        for state in pdf_processor.list_checkpoints():
+            exam_name = state["subject"]
+            filename = state["filename"]
+            pdf_hash = state["pdf_hash"]
+            
+            if state.get("stage") == "committed":
+                # 인덱스 저장 후 시험 정보 반영 전에 중단된 경우
+                if self.pdf_hashes.get(exam_name, {}).get(filename) != pdf_hash:
+                    logger.info(f"🔄 [체크포인트] 시험 정보 반영 복구: {exam_name} / {filename}")
+                    self._record_ingested(exam_name, filename, pdf_hash, state.get("result", {"chunks_count": 0}), state.get("profile"))
+                continue
+            
+            if state.get("stage") is None and pdf_processor.checkpoint_source(pdf_hash, exam_name) is None:
+                logger.warning(f"⚠️ [체크포인트] 원본이 없어 재개할 수 없습니다: {filename}")
+                continue
+            
+            prepared = {
+                "exam_name": exam_name,
+                "filename": filename,
+                "actual_filename": filename,
+                "pdf_hash": pdf_hash,
+                "pdf_path": blob_store.get(pdf_hash) or "",
+                "profile": state.get("profile"),
+                "previous_hash": state.get("previous_hash")
+            }
+            self._ensure_exam(exam_name)
+            _, created = ingestion_queue.submit(
+                f"{exam_name} / {filename} (재개)",
+                lambda progress_callback, prepared=prepared: self._ingest_prepared(prepared, progress_callback),
+                dedupe_key=f"{exam_name}:{pdf_hash}"
+            )
+            resumed += int(created)
+        
+        if resumed:
+            logger.info(f"🔄 [체크포인트] 중단된 PDF 처리 작업 {resumed}건 재개")
+        return resumed
+    
+    def schedule_answer_precompute(self, exam_name: str, filename: str) -> bool:
+        """추출된 문제의 정답·해설 사전 계산을 백그라운드 작업으로 등록 (등록 여부 반환)"""
+        if not Config.PRECOMPUTE_ANSWERS or not DEPLOYMENT_NAME:
+            return False
+        
+        bank_file = pdf_processor.question_bank_file(filename)
+        if not bank_file.exists() or answer_precomputer.pending_count(bank_file) == 0:
+            return False
+        
+        _, created = precompute_queue.submit(
+            f"{exam_name} / {filename} (정답·해설)",
+            lambda progress_callback: answer_precomputer.precompute_bank(bank_file, progress_callback),
+            dedupe_key=f"precompute:{bank_file.name}"
+        )
+        return created
+    
+    def resume_answer_precompute(self) -> int:
+        """정답·해설 계산이 끝나지 않은 문제 은행 작업 재개 (시작 시 호출, 등록한 작업 수 반환)"""
+        resumed = 0
+        for exam_name, exam in list(self.exams.items()):
+            for pdf in exam.get("pdfs", []):
+                resumed += int(self.schedule_answer_precompute(exam_name, pdf.get("filename", "")))
+        if resumed:
+            logger.info(f"🧠 [사전 계산] 정답·해설 계산 작업 {resumed}건 재개")
+        return resumed
+    
+    def upload_pdf(self, pdf_file, exam_name: str, profile: str = "default") -> tuple[str, gr.Dropdown]:
+        """PDF 파일 업로드 및 벡터 DB 구축 (동기 처리)"""
+        prepared, error_msg = self._prepare_upload(pdf_file, exam_name, profile)
+        if prepared is None:
+            return error_msg, gr.Dropdown(choices=self.get_exam_list())
+        
+        try:
+            outcome = self._ingest_prepared(prepared)
+            return outcome.get("message") or outcome.get("error"), gr.Dropdown(choices=self.get_exam_list())
         except Exception as e:
             error_msg = f"PDF 업로드 중 오류 발생: {e}"
             print(f"❌ {error_msg}")
             return error_msg, gr.Dropdown(choices=self.get_exam_list())
     
-    def generate_question(self, exam_name: str, question_mode: str = "generate") -> str:
-        """시험 문제 생성"""
+    def submit_pdf_upload(self, pdf_file, exam_name: str, profile: str = "default") -> tuple[str, gr.Dropdown]:
+        """PDF 업로드를 백그라운드 수집 큐에 등록 (즉시 반환)"""
+        prepared, error_msg = self._prepare_upload(pdf_file, exam_name, profile)
+        if prepared is None:
+            return error_msg, gr.Dropdown(choices=self.get_exam_list())
+        
+        job, created = ingestion_queue.submit(
+            f"{exam_name} / {prepared['actual_filename']}",
+            lambda progress_callback: self._ingest_prepared(prepared, progress_callback),
+            dedupe_key=f"{exam_name}:{prepared['pdf_hash']}"
+        )
+        
+        if not created:
+            # 동일 파일이 이미 처리 중 (블롭은 내용 주소 기반이라 그대로 둠)
+            return f"⚠️ 동일한 PDF가 이미 처리 중입니다. (작업 ID: {job.job_id})", gr.Dropdown(choices=self.get_exam_list())
+        
+        return f"📥 PDF 처리 작업이 등록되었습니다.\n\n- 작업 ID: {job.job_id}\n- 시험: {exam_name}\n- 파일명: {prepared['actual_filename']}\n- 처리 프로필: {prepared['profile']}\n\n처리 중에도 문제 풀이와 챗봇을 계속 사용할 수 있습니다.\n진행 상황은 아래 '처리 작업 현황'에서 확인하세요.", gr.Dropdown(choices=self.get_exam_list())
+    
+    def format_ingest_jobs(self) -> str:
+        """백그라운드 PDF 처리 작업 현황 포맷팅"""
+        jobs = sorted(ingestion_queue.list_jobs() + precompute_queue.list_jobs(),
+                      key=lambda job: job.created_at, reverse=True)[:10]
+        if not jobs:
+            return "등록된 처리 작업이 없습니다."
+        
+        lines = [f"진행 중: {ingestion_queue.active_count()}건 (동시 처리 {ingestion_queue.max_workers}건)"
+                 f" / 정답·해설 계산: {precompute_queue.active_count()}건\n"]
+        for job in jobs:
+            status = job.to_dict()
+            line = f"[{status['job_id']}] {status['stage_label']} - {status['label']} ({status['elapsed']:.1f}초)"
+            if job.finished and job.stage == "failed":
+                line += f"\n    {status['message']}"
+            lines.append(line)
+        return "\n".join(lines)
+    
+    def format_system_status(self) -> str:
+        """모델 호출 속도 제한기와 문제 풀 상태 포맷팅 (레인별 대기 시간·대기열, 풀 적중률·보충 시간)"""
+        limiter = rate_limiter.metrics()
+        lines = [f"🚦 모델 호출: 진행 중 {limiter['in_flight']}건"
+                 + (f", 남은 요청 {limiter['available_requests']}" if limiter["available_requests"] is not None else "")
+                 + (f", 남은 토큰 {limiter['available_tokens']}" if limiter["available_tokens"] is not None else "")]
+        for lane, stats in limiter["lanes"].items():
+            lines.append(f"    {lane}: {stats['requests']}건, 평균 대기 {stats['avg_wait']:.2f}초"
+                         f" (최대 {stats['max_wait']:.2f}초), 대기열 {stats['queued']}건")
+        
+        if Config.QUESTION_POOL_ENABLED:
+            pool = question_pool.metrics()
+            lines.append(f"⚡ 문제 풀: 적중률 {pool['hit_rate']:.0%} ({pool['hits']}/{pool['hits'] + pool['misses']}),"
+                         f" 보충 {pool['refills']}건 (평균 {pool['avg_refill_seconds']:.1f}초, 최대 {pool['max_refill_seconds']:.1f}초),"
+                         f" 실패 {pool['failures']}건, 생산 중 {pool['in_flight']}건, 보관 {sum(pool['pool_sizes'].values())}개")
+        return "\n".join(lines)
+    
+    def generate_question_stream(self, exam_name: str, question_mode: str = "generate") -> Iterator[str]:
+        """시험 문제 생성 (스트리밍: 문제 본문을 생성되는 대로 표시하고, 검토가 끝나면 최종 문제로 교체)"""
+        partials: "queue.Queue[str]" = queue.Queue()
+        future = self._stream_executor.submit(self.generate_question, exam_name, question_mode, partials.put)
+        while not future.done():
+            try:
+                partial = partials.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            # 밀린 조각은 건너뛰고 가장 최신 상태만 표시
+            while not partials.empty():
+                partial = partials.get_nowait()
+            yield partial
+        yield future.result()
+    
+    def generate_question(self, exam_name: str, question_mode: str = "generate",
+                          on_partial: Optional[Callable[[str], None]] = None) -> str:
+        """시험 문제 생성 (on_partial이 있으면 생성 중인 문제 본문을 조각마다 전달)"""
         print(f"\n🔍 [콘솔 로그] 문제 생성 요청 - 시험: {exam_name}, 모드: {question_mode}")
         
         if not exam_name:
@@ -492,130 +715,25 @@ class ExamQuestionGenerator:
         
         print(f"📊 [콘솔 로그] 선택된 난이도: {difficulty}, 문제 유형: {question_type}")
         
+        # 문제 생성 전체 마감 시간 (검색·검증·생성·검토 단계 모두 포함)
+        timer = StageTimer()
+        deadline = time.monotonic() + Config.GENERATION_DEADLINE_SECONDS
+        context_candidates = None
+        prompt = None
+        
         # RAG 기반 문제 생성
         if question_mode == "generate":
-            # 다양한 검색 쿼리 생성
-            search_queries = [
-                f"{difficulty} {question_type}",
-                f"{question_type} {difficulty}",
-                f"{exam_name} {difficulty}",
-                f"{exam_name} {question_type}",
-                f"기출문제 {difficulty}",
-                f"기출문제 {question_type}",
-                f"{difficulty} 문제",
-                f"{question_type} 문제"
-            ]
-            
-            # 랜덤하게 검색 쿼리 선택 (더 나은 랜덤화)
-            random.shuffle(search_queries)
-            search_query = search_queries[0]
-            print(f"🔍 [콘솔 로그] 검색 쿼리: {search_query}")
-            
-            # 벡터 DB에서 검색
-            similar_questions = vector_store.search_similar_questions(search_query, subject=exam_name, n_results=5)
-            
-            # 추출된 문제에서도 검색
-            extracted_questions = pdf_processor.search_extracted_questions_semantic(search_query, exam_name, n_results=3)
-            
-            # 결과 합치기
-            all_questions = similar_questions + extracted_questions
-            # 점수 기준으로 정렬
-            all_questions = sorted(all_questions, key=lambda x: x.get('score', 0), reverse=True)[:5]
-            
-            # 그림 포함 문제 필터링
-            filtered_questions = []
-            for question in all_questions:
-                question_content = question.get("content", "")
-                # 그림 관련 키워드 체크
-                if any(keyword in question_content for keyword in ["그림", "도표", "차트", "이미지", "사진", "화면", "스크린샷"]):
-                    print(f"⚠️ [콘솔 로그] RAG 그림 포함 문제 필터링")
-                    continue
-                filtered_questions.append(question)
-            
-            if not filtered_questions:
-                print(f"⚠️ [콘솔 로그] RAG 필터링 후 문제가 없어 일반 생성으로 전환")
-                prompt = ExamPrompts.get_question_generation_prompt(
-                    exam_name, difficulty, question_type, exam_name
-                )
-                self.current_context = None
-                self.current_metadata = None
-                print("🔄 [콘솔 로그] 일반 문제 생성 중...")
-            
-            all_questions = filtered_questions
+            # 미리 생성해 둔 문제가 있으면 바로 출제하고, 이 시험의 풀은 백그라운드에서 계속 채움
+            pooled = question_pool.pop(exam_name, difficulty, question_type)
+            question_pool.warm(exam_name, self.difficulties, self.question_types)
+            if pooled:
+                question_only = self._apply_generated_item(pooled)
+                print("⚡ [콘솔 로그] 문제 풀에서 바로 출제 (모델 호출 없음)")
+                return question_only
             
-            if all_questions:
-                # 컨텍스트 구성
-                context = "\n\n".join([q["content"] for q in all_questions])
-                self.current_context = context
-                # 메타데이터 저장 (출처 정보용)
-                self.current_metadata = [q["metadata"] for q in all_questions]
-                
-                # 컨텍스트 품질 검증
-                print("🔍 [콘솔 로그] 컨텍스트 품질 검증 중...")
-                validation_result = self.validate_context(context, self.current_metadata)
-                
-                if validation_result["valid"]:
-                    print("✅ [콘솔 로그] 컨텍스트 검증 통과")
-                    prompt = ExamPrompts.get_rag_question_generation_prompt(
-                        exam_name, difficulty, question_type, context, exam_name, self.current_metadata
-                    )
-                    print("🔄 [콘솔 로그] RAG 기반 문제 생성 중...")
-                else:
-                    print(f"⚠️ [콘솔 로그] 컨텍스트 검증 실패: {validation_result['reason']}")
-                    # 다른 검색 쿼리로 재시도
-                    alternative_queries = [
-                        f"{exam_name} 기출문제",
-                        f"{difficulty} {question_type} 문제",
-                        f"{question_type} 문제",
-                        f"{difficulty} 문제"
-                    ]
-                    
-                    alt_validation_success = False
-                    for alt_query in alternative_queries:
-                        print(f"🔍 [콘솔 로그] 대체 검색 쿼리 시도: {alt_query}")
-                        
-                        # 벡터 DB에서 검색
-                        alt_questions = vector_store.search_similar_questions(alt_query, subject=exam_name, n_results=3)
-                        
-                        # 추출된 문제에서도 검색
-                        alt_extracted = pdf_processor.search_extracted_questions_semantic(alt_query, exam_name, n_results=2)
-                        
-                        # 결과 합치기
-                        alt_all_questions = alt_questions + alt_extracted
-                        alt_all_questions = sorted(alt_all_questions, key=lambda x: x.get('score', 0), reverse=True)[:3]
-                        
-                        if alt_all_questions:
-                            alt_context = "\n\n".join([q["content"] for q in alt_all_questions])
-                            alt_metadata = [q["metadata"] for q in alt_all_questions]
-                            
-                            alt_validation = self.validate_context(alt_context, alt_metadata)
-                            if alt_validation["valid"]:
-                                print("✅ [콘솔 로그] 대체 컨텍스트 검증 통과")
-                                self.current_context = alt_context
-                                self.current_metadata = alt_metadata
-                                prompt = ExamPrompts.get_rag_question_generation_prompt(
-                                    exam_name, difficulty, question_type, alt_context, exam_name, alt_metadata
-                                )
-                                print("🔄 [콘솔 로그] 대체 RAG 기반 문제 생성 중...")
-                                alt_validation_success = True
-                                break
-                    
-                    if not alt_validation_success:
-                        print("⚠️ [콘솔 로그] 모든 컨텍스트 검증 실패, 일반 생성으로 전환")
-                        prompt = ExamPrompts.get_question_generation_prompt(
-                            exam_name, difficulty, question_type, exam_name
-                        )
-                        self.current_context = None
-                        self.current_metadata = None
-                        print("🔄 [콘솔 로그] 일반 문제 생성 중...")
-            else:
-                # RAG 결과가 없으면 일반 생성
-                prompt = ExamPrompts.get_question_generation_prompt(
-                    exam_name, difficulty, question_type, exam_name
-                )
-                self.current_context = None
-                self.current_metadata = None
-                print("🔄 [콘솔 로그] 일반 문제 생성 중...")
+            # 풀이 비어 있으면 직접 생성 (검증은 파이프라인에서 동시 수행)
+            with timer.stage("검색"):
+                context_candidates = self._generation_candidates(exam_name, difficulty, question_type)
         
         elif question_mode == "exact":
             # 추출된 기출문제에서 랜덤 선택 (모든 PDF에서 균등하게 선택)
@@ -628,16 +746,10 @@ class ExamQuestionGenerator:
                 print(f"❌ [콘솔 로그] {exam_name} 시험의 추출된 문제가 없습니다.")
                 return "❌ 해당 시험의 추출된 기출문제가 없습니다. PDF를 먼저 업로드해주세요."
             
-            # 문제 필터링 (그림 포함 문제 제외) - 완화된 필터링
-            filtered_questions = []
-            for question in extracted_questions:
-                question_text = question.get("text", "")
-                # 그림 관련 키워드 체크 (더 정확한 필터링)
-                # 단순히 "그림"이라는 단어만 있으면 필터링하지 않고, 실제로 그림이 필요한 문제만 필터링
-                if any(keyword in question_text for keyword in ["다음 그림", "위의 그림", "아래 그림", "그림과 같이", "그림에서 보는 바와 같이"]):
-                    print(f"⚠️ [콘솔 로그] 그림 포함 문제 필터링: {question.get('number', 'unknown')}번")
-                    continue
-                filtered_questions.append(question)
+            # 문제 필터링 (그림 의존 문제 제외, 수집 시 계산된 requires_figure 사용)
+            filtered_questions = [question for question in extracted_questions if not requires_figure(question)]
+            if len(filtered_questions) < len(extracted_questions):
+                print(f"⚠️ [콘솔 로그] 그림 포함 문제 필터링: {len(extracted_questions) - len(filtered_questions)}개")
             
             if not filtered_questions:
                 print(f"❌ [콘솔 로그] 필터링 후 사용 가능한 문제가 없습니다.")
@@ -777,218 +889,486 @@ class ExamQuestionGenerator:
                 "pdf_sources": [pdf_source_display],  # 실제 출처 PDF 파일명 저장
                 "extraction_date": selected_question.get("extraction_date", ""),
                 "start_line": selected_question.get("start_line", 0),
-                "end_line": selected_question.get("end_line", 0)
+                "end_line": selected_question.get("end_line", 0),
+                "correct_option": selected_question.get("correct_option")
             }
             self.current_metadata = [metadata]
             logger.info(f"📄 [문제 생성] 최종 PDF 출처: {pdf_source_display}")
             
+            # 사전 계산된 정답·해설이 있으면 모델 호출 없이 바로 출제
+            precomputed = answer_precomputer.lookup(selected_question)
+            if precomputed:
+                self.current_question = precomputed["question"]
+                self.current_answer = precomputed["answer"]
+                self.current_explanation = precomputed["explanation"]
+                question_only = self._get_question_only(self.current_question)
+                print("⚡ [콘솔 로그] 사전 계산된 기출문제 출제 (모델 호출 없음)")
+                return question_only
+            
             # 기출문제 그대로 출제 프롬프트 사용
             prompt = ExamPrompts.get_exact_question_prompt(question_text, exam_name)
             logger.info("🔄 [문제 생성] 추출된 기출문제 그대로 출제 중...")
         
         try:
-            print("🤖 [콘솔 로그] Azure OpenAI API 호출 중...")
-            response = openai.chat.completions.create(
-                model=str(DEPLOYMENT_NAME),
-                messages=[
-                    {"role": "system", "content": ExamPrompts.get_system_prompts(exam_name)["question_generator"]},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
+            return llm_client.run(
+                self._run_generation_pipeline(exam_name, question_mode, prompt, context_candidates,
+                                              difficulty, question_type, timer, deadline, on_partial),
+                timeout=max(1.0, deadline - time.monotonic()) + 5
             )
-            result = response.choices[0].message.content
-            if result:
-                # 결과를 파싱하여 저장
-                self._parse_question_result(result)
+        except (asyncio.TimeoutError, TimeoutError):
+            error_msg = f"⏱️ 문제 생성 시간({Config.GENERATION_DEADLINE_SECONDS:.0f}초)이 초과되었습니다. 다시 시도해주세요."
+            print(f"❌ [콘솔 로그] {error_msg} (단계별 소요: {timer.summary()})")
+            return error_msg
+        except Exception as e:
+            error_msg = f"문제 생성 중 오류가 발생했습니다: {e}"
+            print(f"❌ [콘솔 로그] {error_msg}")
+            return error_msg
+        finally:
+            self.last_generation_timings = dict(timer.stages, 전체=timer.total())
+            logger.info(f"⏱️ [문제 생성] 단계별 소요: {timer.summary()}")
+    
+    def _generation_candidates(self, exam_name: str, difficulty: str, question_type: str) -> List[tuple]:
+        """문제 생성용 기본·대체 컨텍스트 후보 검색 (로컬 검색이므로 빠름)"""
+        # 다양한 검색 쿼리 생성
+        search_queries = [
+            f"{difficulty} {question_type}",
+            f"{question_type} {difficulty}",
+            f"{exam_name} {difficulty}",
+            f"{exam_name} {question_type}",
+            f"기출문제 {difficulty}",
+            f"기출문제 {question_type}",
+            f"{difficulty} 문제",
+            f"{question_type} 문제"
+        ]
+        
+        # 랜덤하게 검색 쿼리 선택 (더 나은 랜덤화)
+        random.shuffle(search_queries)
+        search_query = search_queries[0]
+        print(f"🔍 [콘솔 로그] 검색 쿼리: {search_query}")
+        
+        candidates = []
+        primary = self._retrieve_context(search_query, exam_name, n_vector=5, n_extracted=3, limit=5)
+        if primary:
+            candidates.append(primary)
+            alternative_queries = [
+                f"{exam_name} 기출문제",
+                f"{difficulty} {question_type} 문제",
+                f"{question_type} 문제",
+                f"{difficulty} 문제"
+            ]
+            for alt_query in alternative_queries:
+                alternative = self._retrieve_context(alt_query, exam_name, n_vector=3, n_extracted=2, limit=3)
+                if alternative:
+                    candidates.append(alternative)
+        return candidates
+    
+    def _produce_pooled_question(self, exam_name: str, difficulty: str, question_type: str) -> Optional[Dict[str, Any]]:
+        """문제 풀 보충용 문제 생산 (검토까지 마친 문제만 반환)"""
+        if not DEPLOYMENT_NAME or exam_name not in self.exams:
+            return None
+        
+        timer = StageTimer()
+        deadline = time.monotonic() + Config.GENERATION_DEADLINE_SECONDS
+        with timer.stage("검색"):
+            candidates = self._generation_candidates(exam_name, difficulty, question_type)
+        item = llm_client.run(
+            self._agenerate_item(exam_name, difficulty, question_type, timer, deadline, context_candidates=candidates),
+            timeout=Config.GENERATION_DEADLINE_SECONDS + 5
+        )
+        logger.info(f"⏱️ [문제 풀] {exam_name}/{difficulty}/{question_type} 생산 단계별 소요: {timer.summary()}")
+        return item if item and item["reviewed"] else None
+    
+    def _retrieve_context(self, query: str, exam_name: str, n_vector: int, n_extracted: int, limit: int) -> Optional[tuple]:
+        """벡터 DB와 추출된 문제에서 컨텍스트 검색 ((컨텍스트, 메타데이터), 결과가 없으면 None)"""
+        # 벡터 DB에서 검색 (그림 의존 문제는 수집 시 계산된 requires_figure로 제외)
+        similar_questions = vector_store.search_similar_questions(query, subject=exam_name, n_results=n_vector, exclude_figures=True)
+        
+        # 추출된 문제에서도 검색
+        extracted_questions = pdf_processor.search_extracted_questions_semantic(query, exam_name, n_results=n_extracted, exclude_figures=True)
+        
+        # 결과 합치기 (점수 기준 정렬)
+        all_questions = sorted(similar_questions + extracted_questions, key=lambda x: x.get('score', 0), reverse=True)[:limit]
+        
+        # 생성 프롬프트 토큰 예산 안에 들어가는 조각만 사용 (점수 순)
+        packed = token_budgeter.pack(CALL_GENERATION, [
+            ExamPrompts.get_system_prompts(exam_name)["question_generator"],
+            ExamPrompts.get_rag_question_generation_prompt(exam_name, "", "", "", exam_name)
+        ], all_questions)
+        all_questions = packed["pieces"]
+        if not all_questions:
+            return None
+        return "\n\n".join([q["content"] for q in all_questions]), [q["metadata"] for q in all_questions]
+    
+    async def _select_valid_context(self, candidates: List[tuple], deadline: float) -> Optional[tuple]:
+        """후보 컨텍스트를 동시에 검증 (기본 컨텍스트가 통과하면 우선 사용, 아니면 먼저 통과한 대체 컨텍스트)"""
+        async def validate(index: int, context: str, metadata: List) -> tuple:
+            return index, await self.avalidate_context(context, metadata)
+        
+        tasks = [asyncio.ensure_future(validate(i, context, metadata)) for i, (context, metadata) in enumerate(candidates)]
+        try:
+            _, primary = await asyncio.wait_for(tasks[0], max(0.1, deadline - time.monotonic()))
+            if primary["valid"]:
+                print("✅ [콘솔 로그] 컨텍스트 검증 통과")
+                return candidates[0]
+            print(f"⚠️ [콘솔 로그] 컨텍스트 검증 실패: {primary.get('reason', primary.get('issues'))}")
+            
+            for next_done in asyncio.as_completed(tasks[1:], timeout=max(0.1, deadline - time.monotonic())):
+                index, result = await next_done
+                if result["valid"]:
+                    print(f"✅ [콘솔 로그] 대체 컨텍스트 검증 통과 ({index}번째 후보)")
+                    return candidates[index]
+        except asyncio.TimeoutError:
+            print("⚠️ [콘솔 로그] 컨텍스트 검증 시간 초과")
+        finally:
+            # 결과를 기다리지 않는 나머지 검증 요청은 취소
+            for task in tasks:
+                task.cancel()
+        return None
+    
+    async def _run_generation_pipeline(self, exam_name: str, question_mode: str, prompt: Optional[str],
+                                       context_candidates: Optional[List[tuple]], difficulty: str, question_type: str,
+                                       timer: StageTimer, deadline: float,
+                                       on_partial: Optional[Callable[[str], None]] = None) -> str:
+        """컨텍스트 검증 → 문제 생성 → 검토 → 수정 비동기 파이프라인 (마감 시간 초과 시 검토 단계는 건너뜀)"""
+        if question_mode == "exact":
+            # 기출문제 정답표에서 연결된 공식 정답이 있으면 모델 답 대신 사용
+            official_option = self.current_metadata[0].get("correct_option") if self.current_metadata else None
+            item = await self._agenerate_item(exam_name, difficulty, question_type, timer, deadline, prompt=prompt,
+                                              context=self.current_context, metadata=self.current_metadata,
+                                              official_option=official_option, on_partial=on_partial)
+        else:
+            item = await self._agenerate_item(exam_name, difficulty, question_type, timer, deadline,
+                                              context_candidates=context_candidates, on_partial=on_partial)
+        if not item:
+            error_msg = "문제 생성에 실패했습니다."
+            print(f"❌ [콘솔 로그] {error_msg}")
+            return error_msg
+        
+        question_only = self._apply_generated_item(item)
+        print("✅ [콘솔 로그] 문제 생성 완료")
+        print(f"📝 [콘솔 로그] 최종 문제:\n{question_only}")
+        return question_only
+    
+    async def _agenerate_item(self, exam_name: str, difficulty: str, question_type: str, timer: StageTimer, deadline: float,
+                              prompt: Optional[str] = None, context_candidates: Optional[List[tuple]] = None,
+                              context: Optional[str] = None, metadata: Optional[List] = None,
+                              official_option: Optional[int] = None,
+                              on_partial: Optional[Callable[[str], None]] = None) -> Optional[Dict[str, Any]]:
+        """문제 하나 생성·검토 (생성기의 현재 문제 상태는 바꾸지 않고 결과만 반환, 문제 풀 생산자와 공유)"""
+        # 새로 만드는 문제만 요청한 문제 유형으로 검사 (기출문제 그대로 출제는 원문 유형을 따름)
+        expected_type = question_type if prompt is None else None
+        if prompt is None:
+            selected = None
+            if context_candidates:
+                print("🔍 [콘솔 로그] 컨텍스트 품질 검증 중... (후보 {}개 동시 검증)".format(len(context_candidates)))
+                with timer.stage("컨텍스트 검증"):
+                    selected = await self._select_valid_context(context_candidates, deadline)
+            
+            if selected:
+                context, metadata = selected
+                prompt = ExamPrompts.get_rag_question_generation_prompt(
+                    exam_name, difficulty, question_type, context, exam_name, metadata
+                )
+                print("🔄 [콘솔 로그] RAG 기반 문제 생성 중...")
+            else:
+                if context_candidates:
+                    print("⚠️ [콘솔 로그] 모든 컨텍스트 검증 실패, 일반 생성으로 전환")
+                # RAG 결과가 없거나 검증을 통과하지 못하면 일반 생성
+                prompt = ExamPrompts.get_question_generation_prompt(
+                    exam_name, difficulty, question_type, exam_name
+                )
+                context, metadata = None, None
+                print("🔄 [콘솔 로그] 일반 문제 생성 중...")
+        
+        print("🤖 [콘솔 로그] Azure OpenAI API 호출 중...")
+        # 응답을 스트리밍으로 받아 정답·해설이 나오기 전에 문제 본문부터 전달 (출처 줄은 최종 결과에만 표시)
+        parser = QuestionStreamParser()
+        
+        async def stream_question() -> str:
+            messages = [
+                {"role": "system", "content": ExamPrompts.get_system_prompts(exam_name)["question_generator"]},
+                {"role": "user", "content": prompt}
+            ]
+            token_budgeter.log_prompt(CALL_GENERATION, messages)
+            async for delta in llm_client.astream(messages=messages, temperature=0.7):
+                parser.feed(delta)
+                if on_partial and not parser.question_done:
+                    on_partial(parser.question_text())
+            parser.finish()
+            return parser.text
+        
+        # 구조화 생성 모드는 자체 검토 결과까지 JSON 한 번으로 받으므로 스트리밍하지 않음
+        self_issues = None
+        with timer.stage("문제 생성"):
+            if Config.STRUCTURED_GENERATION:
+                data = await asyncio.wait_for(self._agenerate_structured(exam_name, prompt, expected_type),
+                                              max(0.1, deadline - time.monotonic()))
+                if not data:
+                    return None
+                self_issues = self_check_issues(data)
+                parser.feed(render_question_text(data, difficulty, question_type))
+                parser.finish()
+                result = parser.text
+            else:
+                result = await asyncio.wait_for(stream_question(), max(0.1, deadline - time.monotonic()))
+        if not result:
+            return None
+        if on_partial:
+            on_partial(parser.question_text() + "\n\n🔍 _문제 검토 중..._")
+        
+        # 정답과 해설 추출 (사전 계산과 같은 파서 사용)
+        sections = parse_question_sections(result)
+        item = {
+            "question": result,
+            "answer": sections["answer"] or None,
+            "explanation": sections["explanation"] or None,
+            "context": context,
+            "metadata": metadata,
+            "difficulty": difficulty,
+            "question_type": question_type,
+            "reviewed": False
+        }
+        print(f"🔍 [콘솔 로그] 정답 파싱 완료: {item['answer']}")
+        
+        # 기계적인 결함은 정적 검사로 바로 고치거나 거부하고, 확신이 낮을 때만 Review Agent 검토
+        check = None
+        if Config.QUESTION_CHECK_ENABLED:
+            with timer.stage("정적 검사"):
+                check = check_question(item["question"], item["answer"], item["explanation"], expected_type)
+            item.update(question=check["question"], answer=check["answer"] or item["answer"], explanation=check["explanation"] or item["explanation"])
+            if check["fixes"]:
+                print(f"🔧 [콘솔 로그] 정적 검사 자동 수정: {', '.join(check['fixes'])}")
+        
+        # 정적 검사에서 확실한 결함이 나왔거나 구조화 생성의 자체 검토가 부적합이면 바로 수정 적용
+        reject_issues = (check["issues"] if check and check["status"] == "reject" else []) + (self_issues or [])
+        
+        try:
+            if reject_issues:
+                # 결함이 확실하므로 검토 호출 없이 바로 수정 적용
+                print(f"⚠️ [콘솔 로그] 문제 검사 실패: {', '.join(reject_issues)} - 수정 적용 중...")
+                with timer.stage("수정"):
+                    corrected_result = await asyncio.wait_for(review_agent.aapply_corrections(
+                        question=item["question"],
+                        answer=item["answer"] or "",
+                        explanation=item["explanation"] or "",
+                        suggestions=reject_issues
+                    ), max(0.1, deadline - time.monotonic()))
                 
-                #Review Agent로 문제 검토
+                if corrected_result:
+                    recheck = check_question(
+                        corrected_result.get("question") or item["question"],
+                        corrected_result.get("answer") or item["answer"],
+                        corrected_result.get("explanation") or item["explanation"],
+                        expected_type
+                    )
+                    item.update(question=recheck["question"], answer=recheck["answer"] or item["answer"], explanation=recheck["explanation"] or item["explanation"])
+                    item["reviewed"] = recheck["status"] != "reject"
+                    print(f"{'✅' if item['reviewed'] else '⚠️'} [콘솔 로그] 문제 수정 완료 (재검사: {recheck['status']})")
+                else:
+                    print("⚠️ [콘솔 로그] 문제 수정 실패, 원본 문제 사용")
+            elif check and check["confidence"] >= Config.QUESTION_CHECK_MIN_CONFIDENCE:
+                print(f"✅ [콘솔 로그] 정적 검사 통과 (신뢰도 {check['confidence']:.1f}), LLM 검토 생략")
+                item["reviewed"] = True
+            elif Config.STRUCTURED_GENERATION:
+                # 생성 호출에서 자체 검토를 이미 마쳤으므로 별도 검토 호출 없음
+                print("✅ [콘솔 로그] 자체 검토 통과, LLM 검토 생략")
+                item["reviewed"] = True
+            else:
                 print("🔍 [콘솔 로그] 문제 검토 시작...")
-                review_result = review_agent.review_question(
-                    question=self.current_question or "",
-                    answer=self.current_answer or "",
-                    explanation=self.current_explanation or "",
-                    exam_name=exam_name
-                )
+                with timer.stage("검토"):
+                    review_result = await asyncio.wait_for(review_agent.areview_question(
+                        question=item["question"],
+                        answer=item["answer"] or "",
+                        explanation=item["explanation"] or "",
+                        exam_name=exam_name
+                    ), max(0.1, deadline - time.monotonic()))
                 
                 # 검토 결과에 따른 처리
                 if not review_result.get("is_valid", False) and review_result.get("suggestions"):
                     print("⚠️ [콘솔 로그] 문제 검토에서 개선점 발견, 수정 적용 중...")
-                    
+                
                     # 수정 제안 적용
-                    corrected_result = review_agent.apply_corrections(
-                        question=self.current_question or "",
-                        answer=self.current_answer or "",
-                        explanation=self.current_explanation or "",
-                        suggestions=review_result["suggestions"]
-                    )
-                    
+                    with timer.stage("수정"):
+                        corrected_result = await asyncio.wait_for(review_agent.aapply_corrections(
+                            question=item["question"],
+                            answer=item["answer"] or "",
+                            explanation=item["explanation"] or "",
+                            suggestions=review_result["suggestions"]
+                        ), max(0.1, deadline - time.monotonic()))
+                
                     if corrected_result:
                         # 수정된 문제로 업데이트
-                        self.current_question = corrected_result.get("question", self.current_question)
-                        self.current_answer = corrected_result.get("answer", self.current_answer)
-                        self.current_explanation = corrected_result.get("explanation", self.current_explanation)
+                        item["question"] = corrected_result.get("question", item["question"])
+                        item["answer"] = corrected_result.get("answer", item["answer"])
+                        item["explanation"] = corrected_result.get("explanation", item["explanation"])
                         print("✅ [콘솔 로그] 문제 수정 완료")
                     else:
                         print("⚠️ [콘솔 로그] 문제 수정 실패, 원본 문제 사용")
                 else:
                     print(f"✅ [콘솔 로그] 문제 검토 통과 (점수: {review_result.get('score', 0)})")
-                
-                question_only = self._get_question_only(self.current_question or result)
-                print("✅ [콘솔 로그] 문제 생성 완료")
-                print(f"📝 [콘솔 로그] 최종 문제:\n{question_only}")
-                return question_only
-            else:
-                error_msg = "문제 생성에 실패했습니다."
-                print(f"❌ [콘솔 로그] {error_msg}")
-                return error_msg
-        except Exception as e:
-            error_msg = f"문제 생성 중 오류가 발생했습니다: {e}"
-            print(f"❌ [콘솔 로그] {error_msg}")
-            return error_msg
-    
-    def _parse_question_result(self, result: str):
-        """문제 결과를 파싱하여 저장"""
-        self.current_question = result
+                item["reviewed"] = True
+        except asyncio.TimeoutError:
+            print("⏱️ [콘솔 로그] 마감 시간 내 검토를 마치지 못해 생성된 문제를 그대로 사용")
         
-        # 정답과 해설 추출
-        lines = result.split('\n')
-        answer_section = False
-        explanation_section = False
-        
-        for line in lines:
-            if "=== 정답 ===" in line:
-                answer_section = True
-                explanation_section = False
-                continue
-            elif "=== 해설 ===" in line:
-                answer_section = False
-                explanation_section = True
-                continue
-            elif "===" in line:
-                answer_section = False
-                explanation_section = False
-                continue
-            
-            if answer_section and line.strip():
-                self.current_answer = line.strip()
-            elif explanation_section and line.strip():
-                if not self.current_explanation:
-                    self.current_explanation = line.strip()
-                else:
-                    self.current_explanation += "\n" + line.strip()
+        if official_option in OPTION_NUMERALS:
+            if item["answer"] and OPTION_NUMERALS[official_option] not in item["answer"]:
+                logger.warning(f"⚠️ [문제 생성] 모델 정답({item['answer']})과 정답표({OPTION_NUMERALS[official_option]})가 다름 - 정답표 사용")
+            item["answer"] = OPTION_NUMERALS[official_option]
         
-        print(f"🔍 [콘솔 로그] 정답 파싱 완료: {self.current_answer}")
+        item["question"] = item["question"] or result
+        return item
+    
+    async def _agenerate_structured(self, exam_name: str, prompt: str, question_type: Optional[str]) -> Optional[Dict[str, Any]]:
+        """JSON 한 번으로 문제·정답·해설·자체 검토 생성 (스키마 검증에 실패했을 때만 수리 호출)"""
+        system_prompt = ExamPrompts.get_system_prompts(exam_name)["question_generator"]
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": ExamPrompts.get_structured_question_prompt(prompt)}
+        ]
+        token_budgeter.log_prompt(CALL_GENERATION, messages)
+        raw = await llm_client.chat(messages=messages, temperature=0.7, response_format={"type": "json_object"})
+        data, errors = parse_question_json(raw, question_type)
+        if not errors:
+            return data
+        
+        print(f"⚠️ [콘솔 로그] JSON 스키마 검증 실패: {', '.join(errors)} - 수리 요청 중...")
+        raw = await llm_client.chat(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": ExamPrompts.get_json_repair_prompt(raw or "", errors)}
+            ],
+            temperature=0,
+            response_format={"type": "json_object"},
+        )
+        data, errors = parse_question_json(raw, question_type)
+        if errors:
+            print(f"❌ [콘솔 로그] JSON 수리 실패: {', '.join(errors)}")
+            return None
+        return data
+    
+    def _apply_generated_item(self, item: Dict[str, Any]) -> str:
+        """생성된 문제를 현재 문제로 설정하고 문제와 보기만 반환"""
+        self.current_question = item["question"]
+        # 파싱된 정답이 없으면 이전 값 유지 (기존 동작과 동일)
+        if item["answer"]:
+            self.current_answer = item["answer"]
+        self.current_explanation = item["explanation"]
+        self.current_context = item["context"]
+        self.current_metadata = item["metadata"]
+        return self._get_question_only(self.current_question)
     
     def _get_question_only(self, result: str) -> str:
         """문제와 보기만 반환 (출처 정보 포함)"""
-        lines = result.split('\n')
-        question_lines = []
-        include_line = True
-        in_problem_info = False
-        
-        for line in lines:
-            if "=== 정답 ===" in line:
-                include_line = False
-                break
-            if "=== 문제 정보 ===" in line:
-                in_problem_info = True
-                question_lines.append(line)
-                continue
-            elif "===" in line and in_problem_info:
-                in_problem_info = False
-                question_lines.append(line)
-                continue
-            
-            if include_line:
-                # 불필요한 텍스트 제거
-                if any(skip_text in line for skip_text in [
-                    "아래와 같이 요청하신 형식에 맞추어 정리해드립니다",
-                    "위 컨텍스트를 참고하여",
-                    "위 기출문제를",
-                    "다음 형식으로 응답해주세요",
-                    "출처: 기출문제 기반",
-                    "출처: 기출문제"
-                ]):
-                    continue
-                
-                question_lines.append(line)
-                
-                # 문제 정보 섹션에 출처 정보 추가
-                if in_problem_info and "출처:" in line:
-                    # 기존 출처 정보가 있으면 건너뛰기
-                    continue
-                elif in_problem_info and "유형:" in line:
-                    # 유형 다음에 출처 정보 추가
-                    source_info = self._get_source_display_info()
-                    if source_info:
-                        question_lines.append(f"출처: {source_info}")
-        
-        # Gradio Markdown에서 줄바꿈이 제대로 표시되도록 처리
-        result_text = '\n'.join(question_lines)
-        
-        # === 문제 === 다음에 줄바꿈 추가
-        result_text = result_text.replace("=== 문제 ===", "=== 문제 ===\n")
-        result_text = result_text.replace("=== 보기 ===", "\n=== 보기 ===\n")
+        parser = QuestionStreamParser(source_info=self._get_source_display_info)
+        parser.feed(result)
+        parser.finish()
+        return parser.question_text()
+    
+    def evaluate_answer(self, user_answer: str, explain: bool = True) -> Iterator[str]:
+        """사용자 답변 평가 (제너레이터: 로컬 채점 결과를 바로 표시하고, 백그라운드 AI 해설이 끝나면 함께 표시)"""
+        result, feedback = self._grade_answer(user_answer, explain)
+        if feedback is None:
+            yield result
+            return
         
-        return result_text
+        yield result + "\n\n💡 AI 해설을 생성하고 있습니다..."
+        try:
+            explanation = feedback.result()
+        except Exception as e:
+            logger.warning(f"⚠️ AI 해설 생성 실패: {e}")
+            explanation = None
+        if not explanation:
+            yield result + "\n\n⚠️ AI 해설을 가져오지 못했습니다."
+            return
+        print("✅ [콘솔 로그] AI 해설 생성 완료")
+        yield f"{result}\n\n---\n#### 🤖 AI 해설\n{explanation}"
     
-    def evaluate_answer(self, user_answer: str) -> str:
-        """사용자 답변 평가"""
+    def _grade_answer(self, user_answer: str, explain: bool = True) -> tuple[str, Optional[Future]]:
+        """답변 채점 (객관식은 로컬 채점 후 AI 해설 작업도 반환, 그 외는 AI 평가 결과만 반환)"""
         print(f"\n💭 [콘솔 로그] 답변 평가 요청 - 사용자 답변: '{user_answer}'")
         
         if not self.current_question:
             error_msg = "먼저 문제를 생성해주세요."
             print(f"❌ [콘솔 로그] {error_msg}")
-            return error_msg
+            return error_msg, None
         
         if not self.current_answer:
             error_msg = "정답 정보를 찾을 수 없습니다."
             print(f"❌ [콘솔 로그] {error_msg}")
-            return error_msg
+            return error_msg, None
         
-        # RAG 기반 평가
-        if self.current_context:
-            prompt = ExamPrompts.get_rag_answer_evaluation_prompt(
-                self.current_question, user_answer, self.current_context, self.current_metadata or []
-            )
-        else:
-            prompt = ExamPrompts.get_answer_evaluation_prompt(
-                self.current_question, user_answer
-            )
+        # 객관식 답은 정답 보기와 바로 비교 (AI 호출 없이 즉시 판정)
+        local_grade = grade_choice(user_answer, self.current_answer, self.current_question)
+        if local_grade is not None:
+            return self._evaluate_locally(user_answer, local_grade, explain)
         
         try:
-            print("🤖 [콘솔 로그] Azure OpenAI API 호출 중...")
-            response = openai.chat.completions.create(
-                model=str(DEPLOYMENT_NAME),
-                messages=[
-                    {"role": "system", "content": ExamPrompts.get_system_prompts(self.current_exam_name or "정보시스템감리사")["answer_evaluator"]},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
+            result = self._request_answer_evaluation(
+                user_answer, self.current_question, self.current_context,
+                self.current_metadata, self.current_exam_name
             )
-            result = response.choices[0].message.content
             if result:
                 # 오답 여부 확인 및 저장
                 if self._is_wrong_answer(result) and self.current_exam_name:
                     print("❌ [콘솔 로그] 오답 감지, 오답노트에 저장")
-                    self.add_wrong_answer(
-                        exam_name=self.current_exam_name,
-                        question_content=self.current_question or "",
-                        correct_answer=self.current_answer or "",
-                        explanation=self.current_explanation or "",
-                        metadata=self.current_metadata[0] if self.current_metadata else {}
-                    )
+                    self._record_wrong_answer()
                 
                 print(f"✅ [콘솔 로그] 답변 평가 완료")
-                return result
+                return result, None
             else:
                 error_msg = "답변 평가에 실패했습니다."
                 print(f"❌ [콘솔 로그] {error_msg}")
-                return error_msg
+                return error_msg, None
         except Exception as e:
             error_msg = f"답변 평가 중 오류가 발생했습니다: {e}"
             print(f"❌ [콘솔 로그] {error_msg}")
-            return error_msg
+            return error_msg, None
+    
+    def _request_answer_evaluation(self, user_answer: str, question: str, context: Optional[str],
+                                   metadata: Optional[List[Dict[str, Any]]], exam_name: Optional[str]) -> Optional[str]:
+        """AI 답변 평가 요청 (백그라운드 해설 생성에서도 호출하므로 평가 시점의 문제 정보를 인자로 받음)"""
+        # RAG 기반 평가
+        if context:
+            prompt = ExamPrompts.get_rag_answer_evaluation_prompt(question, user_answer, context, metadata or [])
+        else:
+            prompt = ExamPrompts.get_answer_evaluation_prompt(question, user_answer)
+        
+        print("🤖 [콘솔 로그] Azure OpenAI API 호출 중...")
+        return llm_client.complete(
+            messages=[
+                {"role": "system", "content": ExamPrompts.get_system_prompts(exam_name or "정보시스템감리사")["answer_evaluator"]},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+        )
+    
+    def _record_wrong_answer(self):
+        """현재 문제를 오답노트에 저장"""
+        self.add_wrong_answer(
+            exam_name=self.current_exam_name,
+            question_content=self.current_question or "",
+            correct_answer=self.current_answer or "",
+            explanation=self.current_explanation or "",
+            metadata=self.current_metadata[0] if self.current_metadata else {}
+        )
+    
+    def _evaluate_locally(self, user_answer: str, grade: Dict[str, Any], explain: bool = True) -> tuple[str, Optional[Future]]:
+        """로컬 채점 결과와 오답노트 반영 (AI 해설은 설정 시 백그라운드로 요청해 작업 반환)"""
+        print(f"⚡ [콘솔 로그] 로컬 채점 - 선택: {grade['selected']}, 정답: {grade['correct']}, "
+              f"결과: {'정답' if grade['is_correct'] else '오답'}")
+        
+        if not grade["is_correct"] and self.current_exam_name:
+            print("❌ [콘솔 로그] 오답 감지, 오답노트에 저장")
+            self._record_wrong_answer()
+        
+        verdict = format_verdict(grade, self.current_explanation or "")
+        if explain and Config.GRADING_LLM_FEEDBACK and DEPLOYMENT_NAME:
+            future = self._feedback_executor.submit(
+                self._request_answer_evaluation, user_answer, self.current_question,
+                self.current_context, self.current_metadata, self.current_exam_name
+            )
+            return verdict, future
+        return verdict, None
     
     def _is_wrong_answer(self, evaluation_result: str) -> bool:
         """평가 결과에서 오답 여부 확인"""
@@ -1280,27 +1660,28 @@ class ExamQuestionGenerator:
         try:
             # 관련 컨텍스트 검색
             similar_chunks = vector_store.search_similar_questions(message, subject=None, n_results=2)
+            system_prompt = ExamPrompts.get_system_prompts("정보시스템감리사")["chat_assistant"]
+            # 토큰 예산 안에서 점수가 높은 조각만 남기기 (예산을 넘으면 대화 기록부터 줄임)
+            packed = token_budgeter.pack(CALL_CHAT, [system_prompt, ChatPrompts.get_rag_conversation_prompt(message, "", [])],
+                                         similar_chunks, history[-5:])
             context = ""
-            if similar_chunks:
-                context = "\n\n".join([chunk["content"] for chunk in similar_chunks])
+            if packed["pieces"]:
+                context = "\n\n".join([chunk["content"] for chunk in packed["pieces"]])
             
             if context:
-                prompt = ChatPrompts.get_rag_conversation_prompt(message, context, history)
+                prompt = ChatPrompts.get_rag_conversation_prompt(message, context, packed["history"])
                 print("🔄 [콘솔 로그] RAG 기반 대화 중...")
             else:
-                prompt = ChatPrompts.get_conversation_prompt(message, history)
+                prompt = ChatPrompts.get_conversation_prompt(message, packed["history"])
                 print("🔄 [콘솔 로그] 일반 대화 중...")
             
             print("🤖 [콘솔 로그] Azure OpenAI API 호출 중...")
-            response = openai.chat.completions.create(
-                model=str(DEPLOYMENT_NAME),
-                messages=[
-                    {"role": "system", "content": ExamPrompts.get_system_prompts("정보시스템감리사")["chat_assistant"]},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-            )
-            ai_response = response.choices[0].message.content
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ]
+            token_budgeter.log_prompt(CALL_CHAT, messages, packed)
+            ai_response = llm_client.complete(messages=messages, temperature=0.7)
             if ai_response:
                 print(f"🤖 [콘솔 로그] AI 응답: {ai_response}")
                 history.append({"role": "user", "content": message})
@@ -1319,29 +1700,39 @@ class ExamQuestionGenerator:
             return history, ""
     
     def validate_context(self, context: str, metadata: Optional[List] = None) -> dict:
+        """컨텍스트 품질 검증 (동기 호출용)"""
+        return llm_client.run(self.avalidate_context(context, metadata))
+    
+    async def avalidate_context(self, context: str, metadata: Optional[List] = None) -> dict:
         """컨텍스트 품질 검증"""
         logger.info(f"🔍 [콘솔 로그] 컨텍스트 검증 시작")
         
         if not DEPLOYMENT_NAME:
             return {"valid": False, "reason": "DEPLOYMENT_NAME 환경 변수가 설정되지 않았습니다."}
         
+        # 구조 기준(문제 번호, 보기, 정답 정보, 길이)이 확실하면 규칙으로 바로 판정
+        if Config.CONTEXT_RULES_ENABLED:
+            ruled = context_prevalidator.check(context, metadata)
+            if ruled is not None:
+                return ruled
+        
         try:
             prompt = ExamPrompts.get_context_validation_prompt(context, metadata or [])
             
             logger.info("🤖 [콘솔 로그] 컨텍스트 검증 API 호출 중...")
-            response = openai.chat.completions.create(
-                model=str(DEPLOYMENT_NAME),
+            response = await llm_client.cached_chat(
                 messages=[
                     {"role": "system", "content": "당신은 기출문제 컨텍스트 품질 검증 전문가입니다. 정확하고 객관적인 검증을 해주세요."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
             )
-            result = response.choices[0].message.content
+            result = response["content"]
             
             if result:
                 # 검증 결과 파싱
                 validation_result = self._parse_validation_result(result)
+                validation_result["cache_hit"] = response["cache_hit"]
                 logger.info(f"✅ [콘솔 로그] 컨텍스트 검증 완료: {validation_result}")
                 return validation_result
             else:
@@ -1551,6 +1942,25 @@ class ExamQuestionGenerator:
                     except Exception as e:
                         logger.warning(f"⚠️ 벡터 DB 파일 삭제 실패 {file_path}: {e}")
             
+            # 2-1. 수집 체크포인트 삭제
+            checkpoint_dir = Path("ingest_checkpoints")
+            if checkpoint_dir.exists():
+                import shutil
+                shutil.rmtree(checkpoint_dir, ignore_errors=True)
+                checkpoint_dir.mkdir(exist_ok=True)
+                logger.info(f"🗑️ 삭제된 체크포인트 폴더: {checkpoint_dir}")
+            
+            # 2-2. PDF 원본 블롭 저장소 삭제
+            if blob_store.root.exists():
+                import shutil
+                shutil.rmtree(blob_store.root, ignore_errors=True)
+                blob_store.root.mkdir(exist_ok=True)
+                logger.info(f"🗑️ 삭제된 원본 저장소 폴더: {blob_store.root}")
+            
+            # 2-3. LLM 응답 캐시·문제 풀 삭제
+            response_cache.clear()
+            question_pool.clear()
+            
             # 3. 데이터 파일들 삭제
             data_files = ["exam_data.json", "pdf_hashes.json", "wrong_answers.json"]
             for file_name in data_files:
@@ -1631,12 +2041,12 @@ class ExamQuestionGenerator:
         
         return unique_chunks
     
-    def _create_hybrid_prompt(self, message: str, context: str, history: list, exam_name: str) -> str:
-        """하이브리드 답변을 위한 프롬프트 생성"""
+    def _create_hybrid_prompt(self, message: str, context: str, history: list, exam_name: str, summary: str = "") -> str:
+        """하이브리드 답변을 위한 프롬프트 생성 (history는 그대로 넣을 최근 대화, summary는 그 이전 대화 요약)"""
         conversation_context = ""
         if history:
             conversation_parts = []
-            for h in history[-5:]:
+            for h in history:
                 try:
                     if isinstance(h, dict):
                         if h.get('role') == 'user':
@@ -1652,6 +2062,8 @@ class ExamQuestionGenerator:
             
             conversation_context = "\n".join(conversation_parts)
         
+        summary_section = f"=== 이전 대화 요약 ===\n{summary}\n\n" if summary else ""
+        
         return f"""
 다음 {exam_name} 기출문제 컨텍스트와 당신의 지식을 결합하여 답변해주세요.
 
@@ -1664,7 +2076,7 @@ class ExamQuestionGenerator:
 === 기출문제 컨텍스트 ===
 {context}
 
-=== 대화 기록 ===
+{summary_section}=== 대화 기록 ===
 {conversation_context}
 
 사용자: {message}
@@ -1675,6 +2087,10 @@ class ExamQuestionGenerator:
 # 인스턴스 생성
 generator = ExamQuestionGenerator()
 
+# PDF 수집 중 배치가 인덱스에 반영되는 즉시 RAG 검색 대상에 포함
+pdf_processor.add_batch_listener(vector_store.add_indexed_batch)
+pdf_processor.add_removal_listener(vector_store.remove_ingested)
+
 def create_gradio_interface():
     """Gradio 인터페이스 생성"""
     
@@ -1740,6 +2156,14 @@ def create_gradio_interface():
                             type="filepath",
                             file_count="single"
                         )
+                        
+                        ingest_profile = gr.Dropdown(
+                            choices=[("시험 기본값", "default")] + [(f"{info['label']} - {name}", name) for name, info in DOCLING_PROFILES.items()],
+                            value="default",
+                            label="PDF 처리 프로필",
+                            interactive=True
+                        )
+                        save_profile_btn = gr.Button("시험 기본 프로필로 저장", variant="secondary", size="sm")
                         upload_btn = gr.Button("PDF 업로드", variant="primary")
                         
                         upload_output = gr.Textbox(
@@ -1747,6 +2171,21 @@ def create_gradio_interface():
                             lines=8,
                             interactive=False
                         )
+                        
+                        ingest_jobs_output = gr.Textbox(
+                            label="처리 작업 현황",
+                            value=generator.format_ingest_jobs,
+                            lines=6,
+                            interactive=False
+                        )
+                        system_status_output = gr.Textbox(
+                            label="시스템 상태",
+                            value=generator.format_system_status,
+                            lines=4,
+                            interactive=False
+                        )
+                        # 2초마다 작업 현황 폴링
+                        ingest_timer = gr.Timer(2)
             
             # 탭 2: 문제 생성 및 답변
             with gr.TabItem("📝 문제 풀이"):
@@ -1826,7 +2265,7 @@ def create_gradio_interface():
                     inputs=[],
                     outputs=question_output
                 ).then(
-                    fn=generator.generate_question,  # 실제 문제 생성
+                    fn=generator.generate_question_stream,  # 실제 문제 생성 (생성되는 대로 표시)
                     inputs=[selected_exam, question_mode],
                     outputs=question_output
                 ).then(
@@ -1846,7 +2285,7 @@ def create_gradio_interface():
                     inputs=[],
                     outputs=evaluation_output
                 ).then(
-                    fn=generator.evaluate_answer,  # 실제 답변 평가
+                    fn=generator.evaluate_answer,  # 실제 답변 평가 (채점 결과 후 AI 해설 순서로 표시)
                     inputs=[user_answer_input],
                     outputs=evaluation_output
                 )
@@ -1879,6 +2318,8 @@ def create_gradio_interface():
                     lines=2
                 )
                 clear_btn = gr.Button("대화 초기화")
+                # 세션별 이전 대화 요약 (conversation_memory.py)
+                chat_memory = gr.State(new_memory())
                 
                 def update_chat_exam_display(exam_name):
                     """채팅 시험 표시 업데이트"""
@@ -1887,7 +2328,8 @@ def create_gradio_interface():
                     else:
                         return "시험을 선택해주세요"
                 
-                def respond(message, history, exam_name):
+                def respond(message, history, exam_name, chat_memory):
+                    """AI 챗봇 답변 (제너레이터: 답변을 생성되는 대로 표시, 오래된 대화는 세션 요약으로 압축)"""
                     # AI 챗봇 설정 가져오기
                     ai_config = Config.get_ai_chatbot_config()
                     debug_logs = ai_config["debug_logs"]
@@ -1901,17 +2343,32 @@ def create_gradio_interface():
                         logger.error(f"❌ [AI 챗봇] {error_msg}")
                         history.append({"role": "user", "content": message})
                         history.append({"role": "assistant", "content": error_msg})
-                        return history, ""
+                        yield history, ""
+                        return
                     
                     if not exam_name:
                         error_msg = "❌ 시험을 먼저 선택해주세요. 기출문제 검색을 위해 시험이 필요합니다."
                         logger.error(f"❌ [AI 챗봇] 시험이 선택되지 않음")
                         history.append({"role": "user", "content": message})
                         history.append({"role": "assistant", "content": error_msg})
-                        return history, ""
+                        yield history, ""
+                        return
                     
                     # RAG 기반 검색 및 답변
+                    streaming = False  # 답변 말풍선을 히스토리에 추가했는지 여부
                     try:
+                        # 의미 기반 캐시: 대화 첫 질문이 같은 시험의 이전 질문과 충분히 비슷하면 그 답변 재사용
+                        question_embedding = None
+                        if Config.LLM_CACHE_ENABLED and Config.LLM_CACHE_SEMANTIC_ENABLED and not history:
+                            question_embedding = vector_store.embedding_model.encode([message])[0]
+                            cached = response_cache.semantic_get(exam_name, question_embedding)
+                            if cached:
+                                logger.info(f"♻️ [AI 챗봇] 의미 기반 캐시 적중 (유사도 {cached['similarity']:.3f}, 이전 질문: '{cached['question']}')")
+                                history.append({"role": "user", "content": message})
+                                history.append({"role": "assistant", "content": f"{cached['content']}\n\n♻️ _캐시된 답변 (유사 질문: \"{cached['question']}\")_"})
+                                yield history, ""
+                                return
+                        
                         if debug_logs:
                             logger.info(f"🔍 [AI 챗봇] '{exam_name}' 시험에서 관련 기출문제 검색 중...")
                             logger.info(f"🔍 [AI 챗봇] 검색 쿼리 최적화 시작...")
@@ -1950,6 +2407,20 @@ def create_gradio_interface():
                         unique_extracted = generator._deduplicate_chunks(all_extracted_questions)
                         top_extracted = sorted(unique_extracted, key=lambda x: x.get('score', 0), reverse=True)[:5]
                         
+                        # 최근 대화는 그대로, 그 이전 대화는 세션 요약으로 사용
+                        summary, recent_history = conversation_compactor.context_for(history, chat_memory)
+                        
+                        # 토큰 예산 안에서 점수가 높은 조각만 남기기 (예산을 넘으면 대화 기록부터 줄임)
+                        packed = token_budgeter.pack(
+                            CALL_CHAT,
+                            [generator._create_hybrid_prompt(message, "", [], exam_name, summary), message],
+                            similar_chunks + top_extracted,
+                            recent_history
+                        )
+                        selected_ids = {id(chunk) for chunk in packed["pieces"]}
+                        similar_chunks = [chunk for chunk in similar_chunks if id(chunk) in selected_ids]
+                        top_extracted = [chunk for chunk in top_extracted if id(chunk) in selected_ids]
+                        
                         # 벡터 DB 결과와 추출된 문제 결과 합치기
                         combined_context = ""
                         
@@ -1980,59 +2451,73 @@ def create_gradio_interface():
                             logger.info(f"🤖 [AI 챗봇] Azure OpenAI API 호출 시작...")
                         
                         # 하이브리드 프롬프트 생성
-                        hybrid_prompt = generator._create_hybrid_prompt(message, combined_context, history, exam_name)
+                        hybrid_prompt = generator._create_hybrid_prompt(message, combined_context, packed["history"], exam_name, summary)
                         
                         if debug_logs:
                             logger.info(f"📝 [AI 챗봇] 하이브리드 프롬프트 생성 완료")
                         
-                        # Azure OpenAI API 호출
-                        response = openai.chat.completions.create(
-                            model=str(DEPLOYMENT_NAME),
-                            messages=[
-                                {"role": "system", "content": hybrid_prompt},
-                                {"role": "user", "content": message}
-                            ],
+                        # Azure OpenAI 스트리밍 호출 (같은 프롬프트·검색 결과면 정확 일치 캐시 재사용)
+                        history.append({"role": "user", "content": message})
+                        history.append({"role": "assistant", "content": ""})
+                        streaming = True
+                        assistant_message = ""
+                        cache_hit = False
+                        chat_messages = [
+                            {"role": "system", "content": hybrid_prompt},
+                            {"role": "user", "content": message}
+                        ]
+                        token_budgeter.log_prompt(CALL_CHAT, chat_messages, packed)
+                        for piece in llm_client.cached_stream(
+                            messages=chat_messages,
                             temperature=ai_config["temperature"],
                             max_tokens=ai_config["max_tokens"],
                             top_p=ai_config["top_p"],
                             frequency_penalty=ai_config["frequency_penalty"],
                             presence_penalty=ai_config["presence_penalty"]
-                        )
+                        ):
+                            assistant_message += piece["delta"]
+                            cache_hit = piece["cache_hit"]
+                            history[-1]["content"] = assistant_message
+                            yield history, ""
                         
                         if debug_logs:
-                            logger.info(f"✅ [AI 챗봇] Azure OpenAI API 응답 수신")
+                            logger.info(f"✅ [AI 챗봇] Azure OpenAI API 응답 수신 완료 (캐시: {cache_hit})")
                         
-                        if response and response.choices:
-                            content = response.choices[0].message.content
-                            assistant_message = content.strip() if content else "❌ 답변을 생성할 수 없습니다."
-                            
+                        assistant_message = assistant_message.strip()
+                        if assistant_message:
                             if debug_logs:
                                 logger.info(f"💬 [AI 챗봇] 생성된 답변: {assistant_message[:100]}...")
                             
-                            # 히스토리에 메시지 추가
-                            history.append({"role": "user", "content": message})
-                            history.append({"role": "assistant", "content": assistant_message})
+                            # 새로 생성한 첫 질문 답변은 의미 기반 캐시에 저장
+                            if question_embedding is not None and not cache_hit:
+                                response_cache.semantic_put(exam_name, message, question_embedding, assistant_message)
                             
-                            if debug_logs:
-                                logger.info(f"📝 [AI 챗봇] 히스토리에 메시지 추가 완료")
+                            if cache_hit:
+                                assistant_message += "\n\n♻️ _캐시된 답변_"
+                            history[-1]["content"] = assistant_message
+                            
+                            # 최근 대화 밖으로 밀려난 메시지는 응답이 끝난 뒤 백그라운드로 요약에 반영
+                            conversation_compactor.schedule(history, chat_memory)
                         else:
-                            error_msg = "❌ 답변을 생성할 수 없습니다."
                             logger.error(f"❌ [AI 챗봇] 답변 생성 실패")
-                            history.append({"role": "user", "content": message})
-                            history.append({"role": "assistant", "content": error_msg})
+                            history[-1]["content"] = "❌ 답변을 생성할 수 없습니다."
                         
                         if debug_logs:
                             logger.info(f"✅ [AI 챗봇] 함수 종료 - 최종 히스토리 길이: {len(history)}")
-                        return history, ""
+                        yield history, ""
                         
                     except Exception as e:
                         error_msg = f"❌ 오류가 발생했습니다: {e}"
                         logger.error(f"❌ [AI 챗봇] 오류: {e}")
                         logger.error(f"❌ [AI 챗봇] 오류 타입: {type(e)}")
                         logger.error(f"❌ [AI 챗봇] 오류 상세: {traceback.format_exc()}")
-                        history.append({"role": "user", "content": message})
-                        history.append({"role": "assistant", "content": error_msg})
-                        return history, ""
+                        if streaming:
+                            # 스트리밍 도중 실패하면 받은 부분 뒤에 오류 표시
+                            history[-1]["content"] = f"{history[-1]['content']}\n\n{error_msg}".strip()
+                        else:
+                            history.append({"role": "user", "content": message})
+                            history.append({"role": "assistant", "content": error_msg})
+                        yield history, ""
                 
                 # 이벤트 연결
                 chat_exam_select.change(
@@ -2041,8 +2526,8 @@ def create_gradio_interface():
                     outputs=[chat_exam_display]
                 )
                 
-                msg.submit(respond, [msg, chatbot, chat_exam_select], [chatbot, msg])
-                clear_btn.click(lambda: [], None, chatbot, queue=False)
+                msg.submit(respond, [msg, chatbot, chat_exam_select, chat_memory], [chatbot, msg])
+                clear_btn.click(lambda: ([], new_memory()), None, [chatbot, chat_memory], queue=False)
             
             # 탭 4: 오답노트
             with gr.TabItem("📝 오답노트"):
@@ -2159,7 +2644,7 @@ def create_gradio_interface():
                     generator.current_exam_name = exam_name
                     generator.current_metadata = [cur["metadata"]] if cur.get("metadata") else None
                     generator.current_context = cur["question"]
-                    result = generator.evaluate_answer(user_answer)
+                    result, _ = generator._grade_answer(user_answer, explain=False)
                     is_wrong = generator._is_wrong_answer(result)
                     if not is_wrong:
                         # Remove from wrong list
@@ -2333,10 +2818,20 @@ def create_gradio_interface():
             outputs=chat_exam_select
         )
         
+        save_profile_btn.click(
+            fn=generator.set_exam_profile,
+            inputs=[exam_name_input, ingest_profile],
+            outputs=[upload_output]
+        )
+        
         upload_btn.click(
-            fn=generator.upload_pdf,
-            inputs=[pdf_upload, exam_name_input],
+            fn=generator.submit_pdf_upload,
+            inputs=[pdf_upload, exam_name_input, ingest_profile],
             outputs=[upload_output, exam_list]
+        ).then(
+            fn=generator.format_ingest_jobs,
+            inputs=[],
+            outputs=[ingest_jobs_output]
         ).then(
             fn=update_selected_exam,
             inputs=[],
@@ -2351,6 +2846,13 @@ def create_gradio_interface():
             outputs=chat_exam_select
         )
         
+        # 처리 작업 현황 및 시스템 상태 주기적 갱신
+        ingest_timer.tick(
+            fn=lambda: (generator.format_ingest_jobs(), generator.format_system_status()),
+            inputs=[],
+            outputs=[ingest_jobs_output, system_status_output]
+        )
+        
         # 시험 선택 시 PDF 목록 자동 업데이트
         exam_list.change(
             fn=generator.format_pdf_list,
@@ -2388,6 +2890,10 @@ if __name__ == "__main__":
     logger.info("🌐 [콘솔 로그] Gradio 웹 인터페이스 실행 중...")
     logger.info(f"🔧 [설정] 포트: {port}, ngrok 사용: {use_ngrok}")
     
+    # 중단된 PDF 처리 작업 및 정답·해설 사전 계산 재개 (백그라운드)
+    generator.resume_pending_ingests()
+    generator.resume_answer_precompute()
+    
     # ngrok 설정
     ngrok_url = None
     
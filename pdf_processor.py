@@ -4,26 +4,45 @@ Docling을 사용한 PDF 텍스트 추출 및 FAISS 벡터 DB 구축
 """
 
 import os
+import itertools
+import shutil
 import tempfile
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, Callable
 import numpy as np
 from pathlib import Path
 import hashlib
 from datetime import datetime
 import json
 import re
+import time
 import logging
 
+from config import Config
+from question_scanner import get_scanner, QUESTION_FORMAT_PROFILES
+from figure_rules import detect_figure_dependency, requires_figure, IMAGE_PLACEHOLDER
+from blob_store import blob_store
+from answer_key import parse_answer_key, link_answer_key
+
 # 로거 설정
 logger = logging.getLogger(__name__)
 
 # Docling 관련 import
 try:
-    from docling.document_converter import DocumentConverter
+    from docling.document_converter import DocumentConverter, PdfFormatOption
+    from docling.datamodel.base_models import InputFormat
+    from docling.datamodel.pipeline_options import PdfPipelineOptions
 except ImportError:
     logger.error("Docling이 설치되지 않았습니다. pip install docling을 실행해주세요.")
     DocumentConverter = None
 
+# pdfplumber 관련 import (텍스트 레이어 빠른 경로)
+try:
+    import pdfplumber
+except ImportError:
+    logger.warning("pdfplumber가 설치되지 않았습니다. 모든 페이지를 Docling으로 처리합니다.")
+    pdfplumber = None
+
 # FAISS 관련 import
 try:
     import faiss
@@ -34,6 +53,19 @@ except ImportError:
     faiss = None
     SentenceTransformer = None
 
+# Docling 파이프라인 속도 프로필
+# - fast: OCR/표 구조 인식 생략 (텍스트 레이어가 있는 PDF용)
+# - tables: 표 구조 인식만 사용
+# - full: Docling 기본 설정 (OCR + 표 구조 인식)
+DOCLING_PROFILES = {
+    "fast": {"do_ocr": False, "do_table_structure": False, "label": "빠름 (텍스트 전용)"},
+    "tables": {"do_ocr": False, "do_table_structure": True, "label": "표 인식"},
+    "full": {"do_ocr": True, "do_table_structure": True, "label": "전체 (OCR + 표 인식)"},
+}
+
+# 수집 체크포인트 단계 (순서대로 완료, vectors는 청크 분할·임베딩·인덱스 반영을 배치 단위로 스트리밍)
+CHECKPOINT_STAGES = ["markdown", "questions", "vectors", "committed"]
+
 class PDFProcessor:
     """PDF 처리 및 벡터화 클래스"""
     
@@ -45,12 +77,27 @@ class PDFProcessor:
         self.questions_dir = Path("extracted_questions")
         self.questions_dir.mkdir(exist_ok=True)
         
+        # 수집 단계별 체크포인트 디렉토리 ({pdf_hash}_{시험 해시}/state.json 등, 같은 PDF라도 시험별로 따로 수집)
+        self.checkpoint_path = Path("ingest_checkpoints")
+        self.checkpoint_path.mkdir(exist_ok=True)
+        
         # 벡터 모델 초기화
         self.embedding_model = None
         self.index = None
         self.documents = []
         self.metadata = []
         
+        # 스레드별·프로필별 Docling 변환기 (최초 사용 시 생성, 병렬 수집 작업 간 공유하지 않음)
+        self._docling_local = threading.local()
+        
+        # 인덱스/메타데이터 동시 수정 방지 (백그라운드 수집 작업용)
+        self._index_lock = threading.RLock()
+        
+        # 인덱스에 반영된 청크 키 ({subject}:{pdf_hash}:{chunk_index}) 및 배치 반영 알림 대상
+        self._indexed_keys = set()
+        self._batch_listeners = []
+        self._removal_listeners = []
+        
         self._initialize_models()
     
     def _initialize_models(self):
@@ -81,120 +128,550 @@ class PDFProcessor:
         except Exception as e:
             logger.error(f"❌ 벡터 모델 초기화 실패: {e}")
     
-    def process_pdf(self, pdf_file_path: str, subject: str = "정보시스템감리사", original_filename: str = None) -> Dict[str, Any]:
-        """PDF 파일 처리 및 벡터화"""
-        logger.info(f"\n📄 [PDF 처리] 파일: {pdf_file_path}")
+    def process_pdf(self, pdf_file_path: str, subject: str = "정보시스템감리사", original_filename: str = None,
+                    profile: Optional[str] = None,
+                    progress_callback: Optional[Callable[[str], None]] = None,
+                    persist: bool = True, pdf_hash: Optional[str] = None,
+                    previous_hash: Optional[str] = None) -> Dict[str, Any]:
+        """PDF 파일 처리 및 벡터화 (완료된 체크포인트 단계는 건너뛰고 재개, persist=False면 인덱스 저장은 호출자가 일괄 수행,
+        previous_hash가 있으면 개정 전 PDF의 변경되지 않은 페이지와 벡터를 재사용)"""
+        profile = self.resolve_profile(profile)
+        logger.info(f"\n📄 [PDF 처리] 파일: {pdf_file_path} (프로필: {profile})")
         
-        if DocumentConverter is None:
+        if DocumentConverter is None and pdfplumber is None:
             return {"success": False, "error": "Docling 라이브러리가 설치되지 않았습니다."}
         
         try:
-            # Docling GPU 설정
-            import os
-            import torch
-            if torch.cuda.is_available():
-                os.environ['DOCLING_ACCELERATOR'] = 'cuda'
-                logger.info(f"🔧 [INFO] Docling GPU 설정: cuda")
-            else:
-                os.environ['DOCLING_ACCELERATOR'] = 'cpu'
-                logger.info(f"🔧 [INFO] Docling GPU 설정: cpu")
-            
-            converter = DocumentConverter()
-            result = converter.convert(pdf_file_path)
-            # 전체 텍스트 추출 (Markdown 기준)
-            full_text = result.document.export_to_markdown()
-            
-            # 문제 추출 및 저장
-            extracted_questions = self._extract_questions_from_text(full_text, subject, original_filename)
-            
-            # 추출된 문제를 TXT 파일로 저장
-            if extracted_questions:
-                self._save_questions(extracted_questions, subject, original_filename)
-            
-            # 텍스트 청크 분할 및 벡터화는 기존 로직 재사용
-            text_chunks = self._extract_and_chunk_text_from_text(full_text, subject)
-            if not text_chunks:
-                return {"success": False, "error": "PDF에서 텍스트를 추출할 수 없습니다."}
-            
             # 실제 파일명 사용 (없으면 임시 파일명 사용)
             filename_to_use = original_filename if original_filename is not None else str(Path(pdf_file_path).name)
-            self._vectorize_and_store(text_chunks, subject, filename_to_use)
-            self._save_metadata()
-            logger.info(f"✅ PDF 처리 완료 - {len(text_chunks)}개 청크 생성")
-            return {
+            
+            pdf_hash = pdf_hash or self._calculate_file_hash(pdf_file_path)
+            checkpoint_id = self.checkpoint_id(pdf_hash, subject)
+            checkpoint_dir = self.checkpoint_path / checkpoint_id
+            state = self._load_checkpoint(checkpoint_id)
+            if state.get("stage") == "committed":
+                logger.info(f"✅ [체크포인트] 이미 처리 완료된 PDF: {filename_to_use}")
+                return dict(state.get("result", {}), success=True)
+            if state:
+                logger.info(f"🔄 [체크포인트] '{state.get('stage') or '시작'}' 단계 이후부터 재개: {filename_to_use}")
+            else:
+                state = {
+                    "pdf_hash": pdf_hash,
+                    "checkpoint_id": checkpoint_id,
+                    "subject": subject,
+                    "filename": filename_to_use,
+                    "profile": profile,
+                    "previous_hash": previous_hash,
+                    "stage": None,
+                    "created_at": datetime.now().isoformat()
+                }
+                checkpoint_dir.mkdir(exist_ok=True)
+                # 블롭 저장소에 없는 원본만 변환 전 장애 복구를 위해 보관 (Markdown 단계 완료 후 삭제)
+                if blob_store.get(pdf_hash) is None:
+                    shutil.copyfile(pdf_file_path, checkpoint_dir / "source.pdf")
+                self._write_checkpoint(state)
+            previous_hash = state.get("previous_hash")
+            if previous_hash:
+                logger.info(f"🔁 [개정판] 이전 버전({previous_hash[:16]}) 기준 변경 페이지만 재처리: {filename_to_use}")
+            
+            # 1단계: 전체 텍스트 추출 (Markdown 기준, 텍스트 레이어 빠른 경로 우선)
+            if self._stage_done(state, "markdown"):
+                full_text = (checkpoint_dir / "markdown.md").read_text(encoding="utf-8")
+                page_stats = state.get("page_stats", [])
+            else:
+                self._report_progress(progress_callback, "converting")
+                source_path = pdf_file_path if pdf_file_path and os.path.exists(pdf_file_path) else self.checkpoint_source(pdf_hash, subject)
+                if source_path is None:
+                    return {"success": False, "error": "원본 PDF를 찾을 수 없습니다. 다시 업로드해주세요."}
+                reuse_pages = self._load_page_cache(self.checkpoint_id(previous_hash, subject)) if previous_hash else {}
+                full_text, page_stats = self._convert_pdf_to_markdown(source_path, profile, reuse_pages)
+                (checkpoint_dir / "markdown.md").write_text(full_text, encoding="utf-8")
+                self._write_page_cache(checkpoint_id, full_text, page_stats)
+                state["page_stats"] = page_stats
+                self._advance_checkpoint(state, "markdown")
+                (checkpoint_dir / "source.pdf").unlink(missing_ok=True)
+            
+            # 2단계: 문제 추출 및 TXT 저장
+            if self._stage_done(state, "questions"):
+                extracted_questions = self._read_checkpoint_json(checkpoint_id, "questions.json")
+            else:
+                self._report_progress(progress_callback, "extracting")
+                # 정답표 줄은 문제 경계 후보에서 제외하고 문제별 correct_option으로 연결
+                answer_key = parse_answer_key(full_text)
+                extracted_questions = self._extract_questions_from_text(full_text, subject, original_filename,
+                                                                        excluded_lines=set(answer_key["lines"]))
+                self._flag_figure_questions(extracted_questions, full_text, page_stats)
+                self._link_answer_key(extracted_questions, answer_key["answers"])
+                if extracted_questions:
+                    self._save_questions(extracted_questions, subject, original_filename, answer_key["answers"])
+                self._write_checkpoint_json(checkpoint_id, "questions.json", extracted_questions)
+                self._advance_checkpoint(state, "questions")
+            
+            # 3단계: 청크 분할 → 배치 임베딩 → 인덱스 반영 (스트리밍, 배치마다 체크포인트 기록)
+            if self._stage_done(state, "vectors"):
+                # 임베딩 완료 후 저장 전에 중단된 경우 체크포인트에서 인덱스 복원
+                chunks_count = self._restore_checkpoint_batches(state, filename_to_use)
+            else:
+                self._report_progress(progress_callback, "chunking")
+                chunk_iter = self._iter_text_chunks(full_text, subject, extracted_questions)
+                self._report_progress(progress_callback, "embedding")
+                chunks_count = self._stream_chunks_to_index(chunk_iter, state, filename_to_use)
+                if not chunks_count:
+                    return {"success": False, "error": "PDF에서 텍스트를 추출할 수 없습니다."}
+                self._advance_checkpoint(state, "vectors")
+            
+            # 4단계: 인덱스 저장 (개정판이면 이전 버전 벡터를 먼저 제거)
+            self._report_progress(progress_callback, "indexing")
+            if previous_hash:
+                self.remove_ingested(previous_hash, filename_to_use, subject)
+            
+            reused_pages = sum(1 for page in page_stats if page["path"] == "reused")
+            result = {
                 "success": True,
-                "chunks_count": len(text_chunks),
+                "chunks_count": chunks_count,
                 "questions_count": len(extracted_questions),
+                "answered_count": sum(1 for question in extracted_questions if question.get("correct_option")),
+                "pages_count": len(page_stats),
+                "fast_pages": sum(1 for page in page_stats if page["path"] == "fast"),
+                "reused_pages": reused_pages,
+                "reprocessed_pages": len(page_stats) - reused_pages,
+                "reused_chunks": state.get("reused_chunks", 0),
+                "previous_hash": previous_hash,
+                "page_stats": page_stats,
+                "profile": profile,
                 "subject": subject,
-                "filename": filename_to_use
+                "filename": filename_to_use,
+                "pdf_hash": pdf_hash,
+                "checkpoint_id": checkpoint_id
             }
+            if persist:
+                if not self._save_metadata():
+                    return {"success": False, "error": "벡터 인덱스 저장에 실패했습니다. 다시 시도하면 저장 단계부터 재개합니다."}
+                self.commit_checkpoint(checkpoint_id, result)
+            logger.info(f"✅ PDF 처리 완료 - {chunks_count}개 청크 생성")
+            return result
         except Exception as e:
             error_msg = f"PDF 처리 중 오류 발생: {e}"
             logger.error(f"❌ {error_msg}")
             return {"success": False, "error": error_msg}
     
-    def _extract_questions_from_text(self, full_text: str, subject: str, original_filename: str = None) -> List[Dict[str, Any]]:
-        """텍스트에서 문제만 최대한 많이 추출 (슬라이딩 윈도우 방식으로 연속성 검증)"""
-        import re
+    @staticmethod
+    def _calculate_file_hash(file_path: str) -> str:
+        """파일 SHA-256 해시 계산"""
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                sha256.update(block)
+        return sha256.hexdigest()
+    
+    @staticmethod
+    def _stage_done(state: Dict[str, Any], stage: str) -> bool:
+        """체크포인트 단계 완료 여부"""
+        completed = state.get("stage")
+        return completed in CHECKPOINT_STAGES and CHECKPOINT_STAGES.index(completed) >= CHECKPOINT_STAGES.index(stage)
+    
+    @staticmethod
+    def checkpoint_id(pdf_hash: str, subject: str) -> str:
+        """체크포인트 디렉토리 이름 (PDF 해시 + 시험 이름 해시, 같은 PDF를 다른 시험에 올리면 따로 수집)"""
+        return f"{pdf_hash}_{hashlib.md5(subject.encode('utf-8')).hexdigest()[:8]}"
+    
+    def _load_checkpoint(self, checkpoint_id: str) -> Dict[str, Any]:
+        """체크포인트 상태 로드 (없으면 빈 딕셔너리)"""
+        state_file = self.checkpoint_path / checkpoint_id / "state.json"
+        if not state_file.exists():
+            return {}
+        try:
+            with open(state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ 체크포인트 로드 실패 ({checkpoint_id[:16]}): {e}")
+            return {}
+    
+    def _write_checkpoint(self, state: Dict[str, Any]):
+        """체크포인트 상태 저장 (임시 파일 교체 방식)"""
+        state["updated_at"] = datetime.now().isoformat()
+        self._write_checkpoint_json(state["checkpoint_id"], "state.json", state)
+    
+    def _advance_checkpoint(self, state: Dict[str, Any], stage: str):
+        """체크포인트 단계 완료 기록"""
+        state["stage"] = stage
+        self._write_checkpoint(state)
+        logger.info(f"💾 [체크포인트] {state['filename']}: '{stage}' 단계 완료")
+    
+    def _write_checkpoint_json(self, checkpoint_id: str, name: str, data: Any):
+        """체크포인트 JSON 파일 저장"""
+        target = self.checkpoint_path / checkpoint_id / name
+        tmp_file = target.with_suffix(".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, target)
+    
+    def _read_checkpoint_json(self, checkpoint_id: str, name: str) -> Any:
+        """체크포인트 JSON 파일 로드"""
+        with open(self.checkpoint_path / checkpoint_id / name, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def commit_checkpoint(self, checkpoint_id: str, result: Dict[str, Any]):
+        """인덱스 저장 완료 기록 후 중간 산출물 정리 (청크 오프셋 기준인 markdown.md와 개정판 비교용 pages.json은 유지)"""
+        state = self._load_checkpoint(checkpoint_id)
+        if not state:
+            return
+        state["result"] = {key: value for key, value in result.items() if key not in ("success", "page_stats")}
+        self._advance_checkpoint(state, "committed")
+        for name in ("source.pdf", "questions.json", "chunks.jsonl", "vectors.f32"):
+            (self.checkpoint_path / checkpoint_id / name).unlink(missing_ok=True)
+        # 개정판으로 대체된 이전 버전 체크포인트 삭제
+        previous_hash = state.get("previous_hash")
+        if previous_hash and previous_hash != state["pdf_hash"]:
+            shutil.rmtree(self.checkpoint_path / self.checkpoint_id(previous_hash, state["subject"]), ignore_errors=True)
+    
+    def remove_checkpoints(self, subject: str) -> int:
+        """시험의 모든 수집 체크포인트 삭제 (시험 제거 시, 삭제 수 반환)"""
+        removed = 0
+        for state in self.list_checkpoints():
+            if state.get("subject") == subject:
+                shutil.rmtree(self.checkpoint_path / state["checkpoint_id"], ignore_errors=True)
+                removed += 1
+        return removed
+    
+    def _write_page_cache(self, checkpoint_id: str, full_text: str, page_stats: List[Dict[str, Any]]):
+        """페이지별 해시와 Markdown 저장 (개정판 수집 시 변경되지 않은 페이지 재사용용)"""
         lines = full_text.split('\n')
+        pages = []
+        for i, stat in enumerate(page_stats):
+            if not stat.get("hash"):
+                continue
+            # 페이지 사이는 빈 줄 하나로 이어져 있으므로 다음 페이지 시작 줄 직전까지가 해당 페이지
+            line_end = page_stats[i + 1]["line_start"] - 1 if i + 1 < len(page_stats) else len(lines)
+            pages.append({
+                "page": stat["page"],
+                "hash": stat["hash"],
+                "markdown": '\n'.join(lines[stat["line_start"]:line_end]),
+                "path": stat["path"],
+                "score": stat["score"],
+                "image_count": stat.get("image_count", 0)
+            })
+        self._write_checkpoint_json(checkpoint_id, "pages.json", pages)
+    
+    def _load_page_cache(self, checkpoint_id: str) -> Dict[str, Dict[str, Any]]:
+        """이전 버전의 페이지 해시별 Markdown 로드 (없으면 빈 딕셔너리)"""
+        try:
+            pages = self._read_checkpoint_json(checkpoint_id, "pages.json")
+        except FileNotFoundError:
+            logger.info(f"ℹ️ [개정판] 이전 버전 페이지 정보 없음 ({checkpoint_id[:16]}) - 전체 페이지 재처리")
+            return {}
+        except Exception as e:
+            logger.warning(f"⚠️ [개정판] 페이지 정보 로드 실패 ({checkpoint_id[:16]}): {e}")
+            return {}
+        return {page["hash"]: page for page in pages}
+    
+    def get_cached_markdown(self, pdf_hash: str, subject: str) -> Optional[str]:
+        """체크포인트에 보관된 Markdown 원문 (청크 start_pos/end_pos 기준)"""
+        markdown_file = self.checkpoint_path / self.checkpoint_id(pdf_hash, subject) / "markdown.md"
+        return markdown_file.read_text(encoding="utf-8") if markdown_file.exists() else None
+    
+    def list_checkpoints(self) -> List[Dict[str, Any]]:
+        """모든 체크포인트 상태 목록"""
+        states = []
+        for state_file in sorted(self.checkpoint_path.glob("*/state.json")):
+            state = self._load_checkpoint(state_file.parent.name)
+            if state:
+                state.setdefault("checkpoint_id", state_file.parent.name)
+                states.append(state)
+        return states
+    
+    def checkpoint_source(self, pdf_hash: str, subject: str) -> Optional[str]:
+        """재처리에 사용할 원본 PDF 경로 (블롭 저장소 우선, 없으면 체크포인트 보관본, 둘 다 없으면 None)"""
+        blob_path = blob_store.get(pdf_hash)
+        if blob_path:
+            return blob_path
+        source = self.checkpoint_path / self.checkpoint_id(pdf_hash, subject) / "source.pdf"
+        return str(source) if source.exists() else None
+    
+    @staticmethod
+    def _report_progress(progress_callback: Optional[Callable[[str], None]], stage: str):
+        """단계별 진행 상황 전달 (콜백 오류는 처리에 영향 없음)"""
+        if progress_callback is None:
+            return
+        try:
+            progress_callback(stage)
+        except Exception as e:
+            logger.warning(f"⚠️ 진행 상황 전달 실패 ({stage}): {e}")
+    
+    @staticmethod
+    def resolve_profile(profile: Optional[str] = None) -> str:
+        """Docling 프로필 이름 확인 (알 수 없는 값은 기본 프로필 사용)"""
+        if profile in DOCLING_PROFILES:
+            return profile
+        if profile:
+            logger.warning(f"⚠️ 알 수 없는 Docling 프로필 '{profile}' - 기본 프로필 '{Config.DOCLING_PROFILE}' 사용")
+        return Config.DOCLING_PROFILE if Config.DOCLING_PROFILE in DOCLING_PROFILES else "full"
+    
+    @staticmethod
+    def resolve_question_format(format_profile: Optional[str] = None) -> str:
+        """문제 형식 프로필 이름 확인 (알 수 없는 값은 기본 프로필 사용)"""
+        if format_profile in QUESTION_FORMAT_PROFILES:
+            return format_profile
+        if format_profile:
+            logger.warning(f"⚠️ 알 수 없는 문제 형식 프로필 '{format_profile}' - 기본 프로필 사용")
+        return Config.QUESTION_FORMAT_PROFILE if Config.QUESTION_FORMAT_PROFILE in QUESTION_FORMAT_PROFILES else "default"
+    
+    def _convert_pdf_to_markdown(self, pdf_file_path: str, profile: str = "full",
+                                 reuse_pages: Optional[Dict[str, Dict[str, Any]]] = None) -> tuple:
+        """페이지별 텍스트 레이어 품질 검사 후 Markdown 변환 (실패 페이지만 Docling 사용, reuse_pages에 해시가 있는 페이지는 재사용)"""
+        page_stats = []
+        page_texts = {}
+        reuse_pages = reuse_pages or {}
+        page_hashes = self._page_hashes(pdf_file_path)
         
-        # 3자리까지 숫자 + 다양한 구분자 패턴 (줄 앞 공백 허용)
-        question_patterns = [
-            # 가장 일반적인 패턴들 (우선순위 높음)
-            r'^\s*(\d{1,3})\.\s+',  # 108. (기본형, 공백 필수)
-            r'^\s*-\s*(\d{1,3})\.\s+',  # - 108. (대시 접두사, 공백 필수)
-            r'^\s*(\d{1,3})\)\s+',  # 108) (공백 필수)
-            r'^\s*-\s*(\d{1,3})\)\s+',  # - 108) (대시 접두사, 공백 필수)
-            
-            # 문제 번호만 있는 경우
-            r'^\s*(\d{1,3})\.\s*$',  # 108. (줄 끝)
-            r'^\s*-\s*(\d{1,3})\.\s*$',  # - 108. (줄 끝)
-            
-            # 괄호형
-            r'^\s*\((\d{1,3})\)\s*',  # (108)
-            r'^\s*\[(\d{1,3})\]\s*',  # [108]
-            r'^\s*【(\d{1,3})】\s*',  # 【108】
-            r'^\s*〈(\d{1,3})〉\s*',  # 〈108〉
-            
-            # 키워드형
-            r'^\s*문제\s*(\d{1,3})\s*[\.\)]?\s*',  # 문제 108. 
-            r'^\s*(\d{1,3})\s*번\s*[\.\)]?\s*',  # 108번.
-            r'^\s*문항\s*(\d{1,3})\s*[\.\)]?\s*',  # 문항 108.
-            
-            # 특정 키워드와 함께 시작하는 패턴들
-            r'^\s*(\d{1,3})\.\s*다음\s*중',
-            r'^\s*(\d{1,3})\.\s*올바른\s*것은',
-            r'^\s*(\d{1,3})\.\s*틀린\s*것은',
-            r'^\s*(\d{1,3})\.\s*적절한\s*것은',
-            r'^\s*(\d{1,3})\.\s*가장\s*적절한',
-            
-            # 대시 접두사가 있는 키워드 패턴들
-            r'^\s*-\s*(\d{1,3})\.\s*다음\s*중',
-            r'^\s*-\s*(\d{1,3})\.\s*올바른\s*것은',
-            r'^\s*-\s*(\d{1,3})\.\s*틀린\s*것은',
-            r'^\s*-\s*(\d{1,3})\.\s*적절한\s*것은',
-            r'^\s*-\s*(\d{1,3})\.\s*가장\s*적절한',
-        ]
+        def reuse_page(page_no: int) -> bool:
+            cached = reuse_pages.get(page_hashes[page_no - 1]) if page_no <= len(page_hashes) else None
+            if cached is None:
+                return False
+            page_texts[page_no] = cached["markdown"]
+            page_stats.append({"page": page_no, "path": "reused", "score": cached["score"], "reason": "unchanged",
+                               "image_count": cached["image_count"], "seconds": 0.0})
+            return True
         
-        # 1단계: 모든 가능한 문제 번호 위치 찾기
-        potential_questions = []
+        probed = False
+        if pdfplumber is not None and Config.PDF_FAST_PATH:
+            try:
+                with pdfplumber.open(pdf_file_path) as pdf:
+                    for page_no, page in enumerate(pdf.pages, 1):
+                        if reuse_page(page_no):
+                            continue
+                        started = time.perf_counter()
+                        try:
+                            probe = self._probe_page_text(page)
+                        except Exception as e:
+                            # 텍스트 레이어를 읽을 수 없는 페이지는 Docling으로 처리
+                            logger.warning(f"⚠️ [PDF 변환] {page_no}페이지 텍스트 레이어 검사 실패 - Docling 사용: {e}")
+                            probe = {"passed": False, "text": "", "score": 0.0, "reason": "probe_error", "image_count": 0}
+                        stat = {
+                            "page": page_no,
+                            "path": "fast" if probe["passed"] else "docling",
+                            "score": round(probe["score"], 3),
+                            "reason": probe["reason"],
+                            "image_count": probe["image_count"],
+                            "seconds": time.perf_counter() - started
+                        }
+                        if probe["passed"]:
+                            page_texts[page_no] = probe["text"]
+                        page_stats.append(stat)
+                probed = True
+            except Exception as e:
+                # pdfplumber가 문서를 열지 못하면 전체 페이지를 Docling으로 처리
+                logger.warning(f"⚠️ [PDF 변환] pdfplumber 문서 열기 실패 - 전체 페이지 Docling 사용: {e}")
+                page_stats.clear()
+                page_texts.clear()
         
-        for line_idx, line in enumerate(lines):
-            line = line.strip('\r')
-            if not line:
-                continue
+        if not probed:
+            reason = "probe_error" if pdfplumber is not None and Config.PDF_FAST_PATH else "probe_disabled"
+            for page_no in range(1, self._count_pdf_pages(pdf_file_path) + 1):
+                if not reuse_page(page_no):
+                    page_stats.append({"page": page_no, "path": "docling", "score": 0.0, "reason": reason, "seconds": 0.0})
+        
+        if len(page_hashes) == len(page_stats):
+            for stat, page_hash in zip(page_stats, page_hashes):
+                stat["hash"] = page_hash
+        
+        # 빠른 경로를 통과하지 못한 페이지만 Docling으로 변환
+        docling_pages = [stat["page"] for stat in page_stats if stat["path"] == "docling"]
+        if docling_pages:
+            page_texts.update(self._convert_pages_with_docling(pdf_file_path, docling_pages, page_stats, profile))
+        
+        if page_stats:
+            full_text = "\n\n".join(page_texts.get(stat["page"], "") for stat in page_stats)
+            
+            # 페이지별 시작 줄 및 그림 수 기록 (문제 위치 기준 그림 판정용)
+            line_start = 0
+            for stat in page_stats:
+                page_text = page_texts.get(stat["page"], "")
+                stat["line_start"] = line_start
+                if stat["path"] == "docling":
+                    stat["image_count"] = page_text.count(IMAGE_PLACEHOLDER)
+                line_start += page_text.count('\n') + 2
+        else:
+            # 페이지 수를 알 수 없는 경우 문서 전체를 Docling으로 변환
+            started = time.perf_counter()
+            full_text = self._get_docling_converter(profile).convert(pdf_file_path).document.export_to_markdown()
+            page_stats = [{"page": 1, "path": "docling", "score": 0.0, "reason": "unknown_pages",
+                           "image_count": full_text.count(IMAGE_PLACEHOLDER), "line_start": 0,
+                           "seconds": time.perf_counter() - started}]
+        
+        fast_count = sum(1 for stat in page_stats if stat["path"] == "fast")
+        docling_count = sum(1 for stat in page_stats if stat["path"] == "docling")
+        fast_seconds = sum(stat["seconds"] for stat in page_stats if stat["path"] == "fast")
+        docling_seconds = sum(stat["seconds"] for stat in page_stats if stat["path"] == "docling")
+        logger.info(f"⚡ [PDF 변환] 빠른 경로 {fast_count}/{len(page_stats)}페이지 "
+                    f"(빠른 경로 {fast_seconds:.2f}초, Docling {docling_count}페이지 {docling_seconds:.2f}초)")
+        if reuse_pages:
+            logger.info(f"🔁 [개정판] 변경 없는 페이지 재사용 {len(page_stats) - fast_count - docling_count}/{len(page_stats)}페이지")
+        for stat in page_stats:
+            logger.debug(f"📄 [PDF 변환] {stat['page']}페이지: {stat['path']} "
+                         f"(점수: {stat['score']}, 사유: {stat['reason']}, {stat['seconds']:.3f}초)")
+        
+        return full_text, page_stats
+    
+    def _probe_page_text(self, page) -> Dict[str, Any]:
+        """pdfplumber 텍스트 레이어 품질 검사 (표/스캔/그림/깨진 인코딩 페이지는 불통과)"""
+        text = page.extract_text() or ""
+        compact = re.sub(r'\s+', '', text)
+        result = {"passed": False, "text": text, "score": 0.0, "reason": "", "image_count": len(page.images)}
+        
+        # 이미지 면적 비율 (스캔 페이지 및 그림 감지)
+        page_area = float(page.width * page.height) or 1.0
+        image_area = sum(abs((img["x1"] - img["x0"]) * (img["bottom"] - img["top"])) for img in page.images)
+        image_ratio = min(image_area / page_area, 1.0)
+        
+        if len(compact) < Config.PDF_FAST_PATH_MIN_CHARS:
+            result["reason"] = "scan" if image_ratio > 0 else "empty"
+            return result
+        
+        # 깨진 인코딩 감지: (cid:N) 글리프, 대체 문자, 사용자 정의 영역 문자
+        cid_count = len(re.findall(r'\(cid:\d+\)', text))
+        valid_chars = len(re.findall(r'[가-힣ㄱ-ㅎㅏ-ㅣA-Za-z0-9①-⑳.,:;!?()\[\]{}<>"\'`~@#$%^&*_+=/\\|·•…‘’“”「」『』【】〈〉《》※○●□■△▲▽▼◇◆→←↑↓-]', compact))
+        result["score"] = max(valid_chars - cid_count * 6, 0) / len(compact)
+        
+        if result["score"] < Config.PDF_FAST_PATH_MIN_SCORE:
+            result["reason"] = "garbled"
+            return result
+        
+        if image_ratio >= Config.PDF_FAST_PATH_MAX_IMAGE_RATIO:
+            result["reason"] = "figure"
+            return result
+        
+        # 표 구조는 Docling TableFormer가 더 정확하므로 Docling으로 위임
+        if any(len(table.rows) >= 2 and len(table.rows[0].cells) >= 2 for table in page.find_tables()):
+            result["reason"] = "table"
+            return result
+        
+        result["passed"] = True
+        result["reason"] = "text_layer"
+        return result
+    
+    def _page_hashes(self, pdf_file_path: str) -> List[str]:
+        """페이지별 내용 해시 (콘텐츠 스트림과 이미지 리소스 기준, 조회 실패 시 빈 목록)"""
+        try:
+            from PyPDF2 import PdfReader
+            hashes = []
+            for page in PdfReader(pdf_file_path).pages:
+                sha256 = hashlib.sha256()
+                contents = page.get_contents()
+                # 콘텐츠 스트림이 여러 개면 ArrayObject로 반환되므로 스트림별로 해시
+                streams = contents if isinstance(contents, list) else [contents] if contents is not None else []
+                for stream in streams:
+                    sha256.update(stream.get_object().get_data())
+                resources = page.get("/Resources")
+                xobjects = resources.get_object().get("/XObject") if resources is not None else None
+                if xobjects is not None:
+                    xobjects = xobjects.get_object()
+                    for name in sorted(xobjects):
+                        xobject = xobjects[name].get_object()
+                        sha256.update(f"{name}:{xobject.get('/Length')}:{xobject.get('/Width')}x{xobject.get('/Height')}".encode())
+                hashes.append(sha256.hexdigest())
+            return hashes
+        except Exception as e:
+            logger.warning(f"⚠️ 페이지 해시 계산 실패: {e}")
+            return []
+    
+    def _count_pdf_pages(self, pdf_file_path: str) -> int:
+        """PDF 페이지 수 조회"""
+        try:
+            from PyPDF2 import PdfReader
+            return len(PdfReader(pdf_file_path).pages)
+        except Exception as e:
+            logger.warning(f"⚠️ 페이지 수 조회 실패: {e}")
+            return 0
+    
+    def _get_docling_converter(self, profile: str = "full"):
+        """프로필별 Docling 변환기 반환 (스레드별로 최초 호출 시 생성)"""
+        converters = getattr(self._docling_local, "converters", None)
+        if converters is None:
+            converters = self._docling_local.converters = {}
+        
+        if profile not in converters:
+            # Docling GPU 설정
+            import torch
+            if torch.cuda.is_available():
+                os.environ['DOCLING_ACCELERATOR'] = 'cuda'
+                logger.info(f"🔧 [INFO] Docling GPU 설정: cuda")
+            else:
+                os.environ['DOCLING_ACCELERATOR'] = 'cpu'
+                logger.info(f"🔧 [INFO] Docling GPU 설정: cpu")
             
-            for pattern_idx, pattern in enumerate(question_patterns):
-                match = re.match(pattern, line)
-                if match:
-                    detected_number = match.group(1)
-                    if detected_number.isdigit() and 1 <= int(detected_number) <= 999:
-                        potential_questions.append({
-                            "line_idx": line_idx,
-                            "number": int(detected_number),
-                            "line": line
-                        })
-                        break
+            if profile == "full":
+                # 기존 동작 유지 (Docling 기본 설정)
+                converters[profile] = DocumentConverter()
+            else:
+                pipeline_options = PdfPipelineOptions()
+                pipeline_options.do_ocr = DOCLING_PROFILES[profile]["do_ocr"]
+                pipeline_options.do_table_structure = DOCLING_PROFILES[profile]["do_table_structure"]
+                converters[profile] = DocumentConverter(
+                    format_options={InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)}
+                )
+            logger.info(f"🔧 [INFO] Docling 변환기 생성: {profile} ({DOCLING_PROFILES[profile]['label']})")
+        return converters[profile]
+    
+    def _convert_pages_with_docling(self, pdf_file_path: str, pages: List[int], page_stats: List[Dict[str, Any]],
+                                    profile: str = "full") -> Dict[int, str]:
+        """지정한 페이지만 Docling으로 변환 (연속 구간 단위)"""
+        if DocumentConverter is None:
+            # Docling이 없으면 텍스트 레이어 결과라도 사용
+            logger.warning(f"⚠️ Docling 미설치 - {len(pages)}개 페이지를 텍스트 레이어로 대체합니다.")
+            texts = {}
+            with pdfplumber.open(pdf_file_path) as pdf:
+                for page_no in pages:
+                    texts[page_no] = pdf.pages[page_no - 1].extract_text() or ""
+            return texts
+        
+        # 연속된 페이지를 하나의 구간으로 묶기
+        ranges = []
+        for page_no in sorted(pages):
+            if ranges and page_no == ranges[-1][1] + 1:
+                ranges[-1][1] = page_no
+            else:
+                ranges.append([page_no, page_no])
+        
+        converter = self._get_docling_converter(profile)
+        stats_by_page = {stat["page"]: stat for stat in page_stats}
+        texts = {}
+        full_result = None  # page_range 미지원 버전의 전체 변환 결과 (문서당 한 번만 변환)
+        
+        for start, end in ranges:
+            started = time.perf_counter()
+            if full_result is not None:
+                result = full_result
+            else:
+                try:
+                    result = converter.convert(pdf_file_path, page_range=(start, end))
+                except TypeError:
+                    # page_range를 지원하지 않는 Docling 버전은 전체를 한 번 변환 후 구간별로 페이지 추출
+                    logger.info("ℹ️ Docling page_range 미지원 - 문서 전체를 한 번 변환 후 페이지별로 추출")
+                    result = full_result = converter.convert(pdf_file_path)
+            
+            for page_no in range(start, end + 1):
+                texts[page_no] = result.document.export_to_markdown(page_no=page_no)
+            
+            # 구간 변환 시간을 페이지 수로 나누어 기록
+            elapsed = (time.perf_counter() - started) / (end - start + 1)
+            for page_no in range(start, end + 1):
+                if page_no in stats_by_page:
+                    stats_by_page[page_no]["seconds"] += elapsed
+        
+        return texts
+    
+    def _extract_questions_from_text(self, full_text: str, subject: str, original_filename: str = None,
+                                     format_profile: Optional[str] = None,
+                                     excluded_lines: Optional[set] = None) -> List[Dict[str, Any]]:
+        """텍스트에서 문제만 최대한 많이 추출 (슬라이딩 윈도우 방식으로 연속성 검증, excluded_lines는 정답표 등 문제가 아닌 줄)"""
+        lines = full_text.split('\n')
+        excluded_lines = excluded_lines or set()
+        
+        # 1단계: 모든 가능한 문제 번호 위치 찾기 (형식 프로필별 단일 정규식으로 한 번만 스캔)
+        scanner = get_scanner(self.resolve_question_format(format_profile))
+        potential_questions = [q for q in scanner.scan(lines) if q["line_idx"] not in excluded_lines]
+        logger.info(f"🔎 문제 경계 규칙별 일치 ({scanner.profile}): {scanner.rule_counts(potential_questions)}")
         
         # 2단계: 중복 제거 및 번호순 정렬
         # 같은 번호의 중복 문제 제거 (가장 먼저 발견된 것만 유지)
@@ -223,6 +700,10 @@ class PDFProcessor:
             # 문제 텍스트 추출
             question_lines = []
             for line_idx in range(start_line_idx, min(end_line_idx + 1, len(lines))):
+                if line_idx in excluded_lines:
+                    # 정답표가 시작되면 문제 본문 종료
+                    end_line_idx = line_idx - 1
+                    break
                 line = lines[line_idx].strip('\r')
                 if line:  # 빈 줄이 아닌 경우만 추가
                     question_lines.append(line)
@@ -233,7 +714,8 @@ class PDFProcessor:
                     "number": str(verified_q["number"]),
                     "text": question_text,
                     "start_line": start_line_idx,
-                    "end_line": end_line_idx
+                    "end_line": end_line_idx,
+                    "rule": verified_q["rule"]
                 })
         
         logger.info(f"📝 문제 추출 완료: {len(questions)}개")
@@ -268,26 +750,18 @@ class PDFProcessor:
 문제의 시작과 끝을 명확히 구분해주세요.
 """
 
-            # Azure OpenAI API 호출
-            import openai
-            from config import Config
-            
-            # OpenAI 설정
-            openai.api_key = Config.OPENAI_API_KEY
-            openai.azure_endpoint = Config.AZURE_ENDPOINT
-            openai.api_type = Config.OPENAI_API_TYPE
-            openai.api_version = Config.OPENAI_API_VERSION
-            
-            response = openai.chat.completions.create(
-                model=Config.DEPLOYMENT_NAME,
-                messages=[
-                    {"role": "system", "content": "당신은 기출문제 텍스트에서 문제를 정확히 추출하는 전문가입니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-            )
-            
-            result = response.choices[0].message.content
+            # Azure OpenAI API 호출 (공용 클라이언트, 수집 작업이므로 백그라운드 레인)
+            from llm_client import llm_client
+            from rate_limiter import rate_limiter, PRIORITY_BACKGROUND
+            
+            with rate_limiter.lane(PRIORITY_BACKGROUND):
+                result = llm_client.complete(
+                    messages=[
+                        {"role": "system", "content": "당신은 기출문제 텍스트에서 문제를 정확히 추출하는 전문가입니다."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.3,
+                )
             if not result:
                 return []
             
@@ -340,7 +814,55 @@ class PDFProcessor:
             logger.error(f"❌ AI 문제 추출 오류: {e}")
             return []
     
-    def _save_questions(self, questions: List[Dict[str, Any]], subject: str, original_filename: str = None):
+    def _flag_figure_questions(self, questions: List[Dict[str, Any]], full_text: str, page_stats: List[Dict[str, Any]]):
+        """문제별 requires_figure 계산 (키워드 규칙 + 문제 위치 주변 Docling 그림 요소 + 페이지 이미지)"""
+        lines = full_text.split('\n')
+        lookbehind = Config.FIGURE_LOOKBEHIND_LINES
+        image_lines = [line_idx for line_idx, line in enumerate(lines) if IMAGE_PLACEHOLDER in line]
+        page_starts = [(stat["line_start"], stat) for stat in page_stats if "line_start" in stat]
+        question_starts = sorted(question.get("start_line", 0) for question in questions)
+        
+        for question in questions:
+            start_line = question.get("start_line", 0)
+            end_line = question.get("end_line", start_line)
+            next_start = next((line for line in question_starts if line > start_line), len(lines))
+            
+            # 문제 바로 앞(지문 위 그림)부터 문제 끝까지의 그림 (다음 문제 바로 앞 그림은 다음 문제 소속)
+            owned_images = [line_idx for line_idx in image_lines
+                            if start_line - lookbehind <= line_idx <= end_line and line_idx < next_start - lookbehind]
+            page_stat = next((stat for line_start, stat in reversed(page_starts) if line_start <= start_line), None)
+            if page_stat:
+                question["page"] = page_stat["page"]
+            
+            if owned_images:
+                reason = "picture"
+            else:
+                question_text = question["text"].replace(IMAGE_PLACEHOLDER, "")
+                reason = detect_figure_dependency(question_text, bool(page_stat and page_stat.get("image_count")))
+            question["requires_figure"] = reason is not None
+            question["figure_reason"] = reason
+        
+        figure_count = sum(1 for question in questions if question["requires_figure"])
+        logger.info(f"🖼️ 그림 의존 문제: {figure_count}/{len(questions)}개")
+    
+    def _link_answer_key(self, questions: List[Dict[str, Any]], answers: Dict[str, int]):
+        """정답표의 문항별 정답을 추출된 문제에 연결"""
+        if not answers:
+            logger.info("ℹ️ [정답표] 정답표를 찾지 못했습니다.")
+            return
+        
+        linked = link_answer_key(questions, answers)
+        question_numbers = {question["number"] for question in questions}
+        unmatched = [number for number in answers if number not in question_numbers]
+        logger.info(f"🔑 [정답표] {len(answers)}개 정답 중 {linked}개 문제 연결"
+                    + (f" (문제 없는 번호: {', '.join(unmatched[:10])})" if unmatched else ""))
+    
+    def question_bank_file(self, filename: str) -> Path:
+        """PDF 파일명(또는 기본 이름)에 대응하는 JSON 문제 은행 경로"""
+        return self.questions_dir / f"{filename.replace('.pdf', '')}_questions.json"
+    
+    def _save_questions(self, questions: List[Dict[str, Any]], subject: str, original_filename: str = None,
+                        answer_key: Optional[Dict[str, int]] = None):
         """추출된 문제를 txt 파일로만 저장"""
         try:
             # 파일명 생성
@@ -360,116 +882,313 @@ class PDFProcessor:
                     f.write(f"=== 문제 {question['number']} ===\n")
                     f.write(f"{question['text']}\n\n")
             
+            # 문제별 속성(requires_figure, correct_option 등)은 같은 이름의 JSON 문제 은행에 저장
+            bank_file = self.question_bank_file(base_filename)
+            with open(bank_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "subject": subject,
+                    "source_file": original_filename,
+                    "extraction_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    "answer_key": answer_key or {},
+                    "questions": questions
+                }, f, ensure_ascii=False, indent=2)
+            
             logger.info(f"✅ 문제 저장: {len(questions)}개 → {txt_file.name}")
             
         except Exception as e:
             logger.error(f"❌ 문제 저장 중 오류: {e}")
     
-    def _extract_and_chunk_text_from_text(self, full_text: str, subject: str) -> List[Dict[str, Any]]:
-        """텍스트(문자열)에서 청크 분할"""
-        chunks = []
+    def _extract_and_chunk_text_from_text(self, full_text: str, subject: str,
+                                          questions: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """텍스트(문자열)에서 청크 분할 (오류 시 빈 목록)"""
         try:
-            # 표 감지 및 특별 처리
-            lines = full_text.split('\n')
-            current_chunk_lines = []
-            current_length = 0
-            in_table = False
-            table_start_line = -1
-            
-            for i, line in enumerate(lines):
-                # 표 시작/끝 감지
-                is_table_line = line.strip().startswith('|') or ('|' in line.strip() and len(line.strip()) > 10)
-                
-                if is_table_line and not in_table:
-                    # 표 시작
-                    in_table = True
-                    table_start_line = i
-                    # 표 시작 전까지의 청크 저장
-                    if current_chunk_lines and len('\n'.join(current_chunk_lines).strip()) >= 100:
-                        chunk_text = '\n'.join(current_chunk_lines)
-                        chunk_id = hashlib.md5(f"{subject}_{len(chunks)}_{chunk_text[:50]}".encode()).hexdigest()
-                        chunks.append({
-                            "id": chunk_id,
-                            "text": chunk_text.strip(),
-                            "start_pos": len(chunks) * 1000,
-                            "end_pos": len(chunks) * 1000 + len(chunk_text),
-                            "subject": subject,
-                            "created_at": datetime.now().isoformat()
-                        })
-                    current_chunk_lines = []
-                    current_length = 0
-                
-                elif not is_table_line and in_table:
-                    # 표 끝
-                    in_table = False
-                    # 표 전체를 하나의 청크로 저장
-                    table_lines = lines[table_start_line:i]
-                    table_text = '\n'.join(table_lines)
-                    if len(table_text.strip()) >= 50:
-                        chunk_id = hashlib.md5(f"{subject}_{len(chunks)}_table_{table_start_line}".encode()).hexdigest()
-                        chunks.append({
-                            "id": chunk_id,
-                            "text": table_text.strip(),
-                            "start_pos": len(chunks) * 1000,
-                            "end_pos": len(chunks) * 1000 + len(table_text),
-                            "subject": subject,
-                            "created_at": datetime.now().isoformat(),
-                            "is_table": True
-                        })
-                    current_chunk_lines = []
-                    current_length = 0
-                
-                # 현재 라인 추가
-                if not in_table:
-                    current_chunk_lines.append(line)
-                    current_length += len(line) + 1
-                    
-                    # 일반 텍스트 청크 크기 체크
-                    if current_length >= 1000:
-                        chunk_text = '\n'.join(current_chunk_lines)
-                        if len(chunk_text.strip()) >= 100:
-                            chunk_id = hashlib.md5(f"{subject}_{len(chunks)}_{chunk_text[:50]}".encode()).hexdigest()
-                            chunks.append({
-                                "id": chunk_id,
-                                "text": chunk_text.strip(),
-                                "start_pos": len(chunks) * 1000,
-                                "end_pos": len(chunks) * 1000 + len(chunk_text),
-                                "subject": subject,
-                                "created_at": datetime.now().isoformat()
-                            })
-                        current_chunk_lines = []
-                        current_length = 0
-            
-            # 마지막 청크 처리
-            if current_chunk_lines:
-                chunk_text = '\n'.join(current_chunk_lines)
-                if len(chunk_text.strip()) >= 100:
-                    chunk_id = hashlib.md5(f"{subject}_{len(chunks)}_{chunk_text[:50]}".encode()).hexdigest()
-                    chunks.append({
-                        "id": chunk_id,
-                        "text": chunk_text.strip(),
-                        "start_pos": len(chunks) * 1000,
-                        "end_pos": len(chunks) * 1000 + len(chunk_text),
-                        "subject": subject,
-                        "created_at": datetime.now().isoformat()
-                    })
-                
+            return list(self._iter_text_chunks(full_text, subject, questions))
         except Exception as e:
             logger.error(f"텍스트 추출 중 오류: {e}")
-        return chunks
+            return []
     
-    def _vectorize_and_store(self, chunks: List[Dict[str, Any]], subject: str, pdf_file_path: str):
-        """청크를 벡터화하고 FAISS에 저장"""
-        if self.embedding_model is None or self.index is None:
-            logger.error("벡터 모델이 초기화되지 않았습니다.")
-            return
+    def _iter_text_chunks(self, full_text: str, subject: str, questions: Optional[List[Dict[str, Any]]] = None):
+        """문제 경계에 맞춰 토큰 예산 이내의 청크를 순서대로 생성 (구간도 필요할 때 하나씩 만들어 청크 목록 전체를 메모리에 두지 않음, 오류는 호출자에게 전달)"""
+        budget = self._chunk_token_budget()
+        overlap = max(0, min(Config.CHUNK_OVERLAP_TOKENS, budget // 2))
+        figure_numbers = {question["number"] for question in questions or [] if question.get("requires_figure")}
+        lines = full_text.split('\n')
         
-        try:
-            # 텍스트 추출
-            texts = [chunk["text"] for chunk in chunks]
+        chunk_index = 0
+        pending = []
+        pending_tokens = 0
+        for segment in self._iter_segments(lines, questions, budget):
+            segment_tokens = sum(unit[2] for unit in segment)
+            
+            # 예산 안에서는 문제 단위 구간을 그대로 묶음
+            if pending_tokens + segment_tokens <= budget:
+                pending.extend(segment)
+                pending_tokens += segment_tokens
+                continue
+            
+            if pending:
+                chunk = self._make_chunk(chunk_index, full_text, lines, pending, subject, figure_numbers)
+                if chunk:
+                    yield chunk
+                    chunk_index += 1
+                pending, pending_tokens = [], 0
+            
+            if segment_tokens <= budget:
+                pending, pending_tokens = list(segment), segment_tokens
+                continue
             
-            # 벡터화
-            embeddings = self.embedding_model.encode(texts, show_progress_bar=False)
+            # 예산보다 큰 구간(긴 문제·표)은 겹침을 두고 분할
+            for piece in self._split_units(segment, budget, overlap):
+                chunk = self._make_chunk(chunk_index, full_text, lines, piece, subject, figure_numbers)
+                if chunk:
+                    yield chunk
+                    chunk_index += 1
+        
+        if pending:
+            chunk = self._make_chunk(chunk_index, full_text, lines, pending, subject, figure_numbers)
+            if chunk:
+                yield chunk
+    
+    def _iter_segments(self, lines: List[str], questions: Optional[List[Dict[str, Any]]], budget: int):
+        """문제 시작 줄을 경계로 한 구간(단위 목록)을 순서대로 생성 (첫 문제 앞 머리말은 번호 없는 구간)"""
+        question_starts = {}
+        for question in questions or []:
+            question_starts.setdefault(question["start_line"], question["number"])
+        
+        current_segment = []
+        current_number = None
+        offset = 0
+        for line_idx, line in enumerate(lines):
+            line_start = offset
+            offset += len(line) + 1
+            
+            if line_idx in question_starts:
+                if current_segment:
+                    yield current_segment
+                current_segment = []
+                current_number = question_starts[line_idx]
+            
+            if line.strip():
+                current_segment.extend(self._split_line_units(line, line_start, line_idx, current_number, budget))
+        if current_segment:
+            yield current_segment
+    
+    def _chunk_token_budget(self) -> int:
+        """청크당 최대 토큰 수 (미설정 시 임베딩 모델 최대 입력 길이)"""
+        if Config.CHUNK_MAX_TOKENS > 0:
+            return Config.CHUNK_MAX_TOKENS
+        max_seq_length = getattr(self.embedding_model, "max_seq_length", None) or 256
+        # [CLS], [SEP] 특수 토큰 제외
+        return max(16, max_seq_length - 2)
+    
+    def _count_tokens(self, text: str) -> int:
+        """임베딩 모델 토크나이저 기준 토큰 수 (토크나이저가 없으면 글자 수 기반 추정)"""
+        tokenizer = getattr(self.embedding_model, "tokenizer", None)
+        if tokenizer is None:
+            return max(1, len(text) // 2)
+        return len(tokenizer.encode(text, add_special_tokens=False))
+    
+    def _split_line_units(self, line: str, line_start: int, line_idx: int, number: Optional[str], budget: int) -> List[tuple]:
+        """줄을 (시작 오프셋, 끝 오프셋, 토큰 수, 줄 번호, 문제 번호) 단위로 변환 (예산보다 긴 줄은 공백 기준 분할)"""
+        tokens = self._count_tokens(line)
+        if tokens <= budget:
+            return [(line_start, line_start + len(line), tokens, line_idx, number)]
+        
+        units = []
+        step = -(-len(line) // -(-tokens // budget))
+        pos = 0
+        while pos < len(line):
+            cut = min(len(line), pos + step)
+            if cut < len(line):
+                space = line.rfind(' ', pos + step // 2, cut)
+                if space > pos:
+                    cut = space
+            units.append((line_start + pos, line_start + cut, self._count_tokens(line[pos:cut]), line_idx, number))
+            pos = cut
+        return units
+    
+    @staticmethod
+    def _split_units(units: List[tuple], budget: int, overlap: int) -> List[List[tuple]]:
+        """단위 목록을 토큰 예산 이내 조각으로 분할 (앞 조각 끝부분을 overlap 토큰만큼 다음 조각에 포함)"""
+        pieces = []
+        start = 0
+        while start < len(units):
+            end = start
+            tokens = 0
+            while end < len(units) and (tokens + units[end][2] <= budget or end == start):
+                tokens += units[end][2]
+                end += 1
+            pieces.append(units[start:end])
+            if end >= len(units):
+                break
+            
+            next_start = end
+            carried = 0
+            while next_start - 1 > start and carried + units[next_start - 1][2] <= overlap:
+                next_start -= 1
+                carried += units[next_start][2]
+            start = next_start
+        return pieces
+    
+    @staticmethod
+    def _is_table_line(line: str) -> bool:
+        """Markdown 표 줄 여부"""
+        return line.strip().startswith('|') or ('|' in line.strip() and len(line.strip()) > 10)
+    
+    def _make_chunk(self, chunk_index: int, full_text: str, lines: List[str], units: List[tuple], subject: str,
+                    figure_numbers: Optional[set] = None) -> Optional[Dict[str, Any]]:
+        """단위 목록으로 청크 딕셔너리 생성 (start_pos/end_pos는 Markdown 원문 기준 실제 오프셋)"""
+        start_pos, end_pos = units[0][0], units[-1][1]
+        raw_text = full_text[start_pos:end_pos]
+        chunk_text = raw_text.strip()
+        if len(chunk_text) < 20:
+            return None
+        start_pos += len(raw_text) - len(raw_text.lstrip())
+        end_pos = start_pos + len(chunk_text)
+        
+        chunk_lines = sorted({unit[3] for unit in units})
+        question_numbers = list(dict.fromkeys(unit[4] for unit in units if unit[4] is not None))
+        # 문제가 포함된 청크는 문제별 판정을, 문제가 없는 청크는 그림 자리 표시자를 기준으로 판단
+        if question_numbers:
+            chunk_requires_figure = any(number in (figure_numbers or ()) for number in question_numbers)
+        else:
+            chunk_requires_figure = IMAGE_PLACEHOLDER in chunk_text
+        chunk = {
+            "id": hashlib.md5(f"{subject}_{start_pos}_{chunk_text}".encode()).hexdigest(),
+            "chunk_index": chunk_index,
+            "text": chunk_text,
+            "start_pos": start_pos,
+            "end_pos": end_pos,
+            "start_line": chunk_lines[0],
+            "end_line": chunk_lines[-1],
+            "token_count": sum(unit[2] for unit in units),
+            "content_hash": hashlib.md5(chunk_text.encode()).hexdigest(),
+            "question_numbers": question_numbers,
+            "requires_figure": chunk_requires_figure,
+            "subject": subject,
+            "created_at": datetime.now().isoformat()
+        }
+        if all(self._is_table_line(lines[line_idx]) for line_idx in chunk_lines):
+            chunk["is_table"] = True
+        return chunk
+    
+    def _embed_chunks(self, chunks: List[Dict[str, Any]], reuse: Optional[Dict[str, Dict[str, Any]]] = None) -> tuple:
+        """청크 임베딩 생성 (같은 내용의 이전 버전 벡터는 인덱스에서 재사용, 인코딩은 잠금 밖에서 수행, (임베딩, 재사용 수) 반환)"""
+        if self.embedding_model is None or self.index is None:
+            raise RuntimeError("벡터 모델이 초기화되지 않았습니다.")
+        
+        embeddings = np.zeros((len(chunks), self.index.d), dtype='float32')
+        pending = list(range(len(chunks)))
+        if reuse:
+            with self._index_lock:
+                pending = []
+                for i, chunk in enumerate(chunks):
+                    meta = reuse.get(chunk.get("content_hash"))
+                    embedding_id = meta.get("embedding_id") if meta else None
+                    # 다른 작업이 이미 제거/재배치한 항목은 재사용하지 않음
+                    if embedding_id is not None and embedding_id < len(self.metadata) and self.metadata[embedding_id] is meta:
+                        embeddings[i] = self.index.reconstruct(int(embedding_id))
+                    else:
+                        pending.append(i)
+        
+        if pending:
+            texts = [chunks[i]["text"] for i in pending]
+            embeddings[pending] = self.embedding_model.encode(texts, show_progress_bar=False).astype('float32')
+        reused = len(chunks) - len(pending)
+        logger.info(f"✅ {len(chunks)}개 청크 벡터화 완료" + (f" (재사용 {reused}개)" if reused else ""))
+        return embeddings, reused
+    
+    def _revision_entries(self, previous_hash: str, filename: Optional[str], subject: Optional[str] = None) -> List[int]:
+        """PDF 버전의 인덱스 위치 목록 (subject가 있으면 그 시험만, 수집 해시가 없는 예전 항목은 파일명으로 판단, 잠금 안에서 호출)"""
+        return [i for i, meta in enumerate(self.metadata)
+                if (subject is None or meta.get("subject") == subject)
+                and (meta.get("ingest_hash") == previous_hash
+                     or (filename and not meta.get("ingest_hash") and meta.get("pdf_source") == filename))]
+    
+    def _reusable_vectors(self, previous_hash: Optional[str], filename: str, subject: str) -> Dict[str, Dict[str, Any]]:
+        """이전 버전 PDF 청크의 내용 해시별 메타데이터 (벡터 재사용용)"""
+        if not previous_hash:
+            return {}
+        with self._index_lock:
+            return {
+                self.metadata[i].get("content_hash") or hashlib.md5(self.metadata[i].get("text", "").encode()).hexdigest(): self.metadata[i]
+                for i in self._revision_entries(previous_hash, filename, subject)
+            }
+    
+    def _stream_chunks_to_index(self, chunk_iter, state: Dict[str, Any], filename: str) -> int:
+        """청크를 고정 크기 배치로 임베딩하여 바로 인덱스에 추가 (처리한 청크 수 반환)"""
+        # 이전 실행에서 체크포인트에 기록된 배치는 다시 임베딩하지 않음
+        embedded = self._restore_checkpoint_batches(state, filename)
+        batch_size = max(1, Config.EMBEDDING_BATCH_SIZE)
+        reuse = self._reusable_vectors(state.get("previous_hash"), filename, state["subject"])
+        
+        batch = []
+        for chunk in itertools.islice(chunk_iter, embedded, None):
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                embedded = self._index_batch(batch, state, filename, embedded, reuse)
+                batch = []
+        if batch:
+            embedded = self._index_batch(batch, state, filename, embedded, reuse)
+        return embedded
+    
+    def _index_batch(self, batch: List[Dict[str, Any]], state: Dict[str, Any], filename: str, embedded: int,
+                     reuse: Optional[Dict[str, Dict[str, Any]]] = None) -> int:
+        """배치 임베딩 → 체크포인트 기록 → 인덱스 반영"""
+        embeddings, reused = self._embed_chunks(batch, reuse)
+        
+        checkpoint_dir = self.checkpoint_path / state["checkpoint_id"]
+        with open(checkpoint_dir / "vectors.f32", 'ab') as f:
+            embeddings.tofile(f)
+        with open(checkpoint_dir / "chunks.jsonl", 'a', encoding='utf-8') as f:
+            for chunk in batch:
+                f.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+        
+        self._add_to_index(batch, embeddings, filename, state["pdf_hash"])
+        
+        embedded += len(batch)
+        state["embedded_chunks"] = embedded
+        state["reused_chunks"] = state.get("reused_chunks", 0) + reused
+        self._write_checkpoint(state)
+        logger.info(f"🧮 [스트리밍] {filename}: {embedded}개 청크 인덱스 반영")
+        return embedded
+    
+    def _restore_checkpoint_batches(self, state: Dict[str, Any], filename: str) -> int:
+        """체크포인트에 기록된 배치를 인덱스에 다시 반영 (기록 도중 중단된 꼬리는 잘라냄, 청크 수 반환)"""
+        embedded = state.get("embedded_chunks", 0)
+        checkpoint_dir = self.checkpoint_path / state["checkpoint_id"]
+        vectors_file = checkpoint_dir / "vectors.f32"
+        chunks_file = checkpoint_dir / "chunks.jsonl"
+        if not embedded:
+            vectors_file.unlink(missing_ok=True)
+            chunks_file.unlink(missing_ok=True)
+            return 0
+        
+        dimension = self.embedding_model.get_sentence_embedding_dimension()
+        os.truncate(vectors_file, embedded * dimension * 4)
+        vectors = np.memmap(vectors_file, dtype='float32', mode='r', shape=(embedded, dimension))
+        batch_size = max(1, Config.EMBEDDING_BATCH_SIZE)
+        
+        with open(chunks_file, 'rb+') as f:
+            for start in range(0, embedded, batch_size):
+                batch = [json.loads(f.readline().decode('utf-8')) for _ in range(min(batch_size, embedded - start))]
+                self._add_to_index(batch, np.array(vectors[start:start + len(batch)]), filename, state["pdf_hash"])
+            f.truncate(f.tell())
+        del vectors
+        
+        logger.info(f"🔄 [체크포인트] {filename}: 기록된 {embedded}개 청크 인덱스 복원")
+        return embedded
+    
+    def _add_to_index(self, chunks: List[Dict[str, Any]], embeddings: np.ndarray, pdf_file_path: str, ingest_hash: str):
+        """임베딩을 FAISS에 추가 (이미 반영된 청크는 건너뜀) 후 배치 반영 알림"""
+        with self._index_lock:
+            new_rows = [i for i, chunk in enumerate(chunks)
+                        if f"{chunk.get('subject')}:{ingest_hash}:{chunk.get('chunk_index')}" not in self._indexed_keys]
+            if not new_rows:
+                return
+            if len(new_rows) < len(chunks):
+                chunks = [chunks[i] for i in new_rows]
+                embeddings = embeddings[new_rows]
             
             # FAISS 인덱스에 추가
             self.index.add(embeddings.astype('float32'))
@@ -478,16 +1197,57 @@ class PDFProcessor:
             for i, chunk in enumerate(chunks):
                 chunk["embedding_id"] = len(self.documents) + i
                 chunk["pdf_source"] = str(Path(pdf_file_path).name)
+                chunk["ingest_hash"] = ingest_hash
                 self.documents.append(chunk["text"])
                 self.metadata.append(chunk)
-            
-            logger.info(f"✅ {len(chunks)}개 청크 벡터화 완료")
-            
-        except Exception as e:
-            logger.error(f"벡터화 중 오류: {e}")
+                self._indexed_keys.add(f"{chunk.get('subject')}:{ingest_hash}:{chunk.get('chunk_index')}")
+        
+        # 수집이 끝나기 전에도 다른 검색기에서 바로 검색되도록 배치 전달
+        for listener in list(self._batch_listeners):
+            try:
+                listener(chunks, embeddings)
+            except Exception as e:
+                logger.warning(f"⚠️ 배치 반영 알림 실패: {e}")
     
-    def search_similar_chunks(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
-        """유사한 청크 검색"""
+    def add_batch_listener(self, listener: Callable[[List[Dict[str, Any]], np.ndarray], None]):
+        """인덱스에 배치가 반영될 때마다 호출할 함수 등록"""
+        self._batch_listeners.append(listener)
+    
+    def remove_ingested(self, ingest_hash: str, filename: Optional[str] = None, subject: Optional[str] = None) -> int:
+        """특정 PDF 버전의 청크와 벡터를 인덱스에서 제거 후 제거 알림 (subject가 있으면 그 시험만, 수집 체크포인트도 삭제, 제거 수 반환)"""
+        with self._index_lock:
+            rows = self._revision_entries(ingest_hash, filename, subject)
+            if rows:
+                self.index.remove_ids(np.array(rows, dtype='int64'))
+                removed = set(rows)
+                removed_keys = {f"{self.metadata[i].get('subject')}:{self.metadata[i].get('ingest_hash')}:{self.metadata[i].get('chunk_index')}"
+                                for i in removed}
+                self.metadata = [meta for i, meta in enumerate(self.metadata) if i not in removed]
+                self.documents = [meta.get("text", "") for meta in self.metadata]
+                for i, meta in enumerate(self.metadata):
+                    meta["embedding_id"] = i
+                self._indexed_keys -= removed_keys
+                logger.info(f"🗑️ [인덱스] PDF 버전 청크 {len(rows)}개 제거 ({ingest_hash[:16]}{f', {subject}' if subject else ''})")
+        
+        # 제거한 버전을 다시 올리면 처음부터 수집하도록 체크포인트도 삭제
+        for checkpoint_dir in self.checkpoint_path.glob(f"{ingest_hash}_*"):
+            state = self._load_checkpoint(checkpoint_dir.name)
+            if subject is None or state.get("subject") == subject:
+                shutil.rmtree(checkpoint_dir, ignore_errors=True)
+        
+        for listener in list(self._removal_listeners):
+            try:
+                listener(ingest_hash, filename, subject)
+            except Exception as e:
+                logger.warning(f"⚠️ 제거 알림 실패: {e}")
+        return len(rows)
+    
+    def add_removal_listener(self, listener: Callable[[str, Optional[str], Optional[str]], None]):
+        """인덱스에서 PDF 버전이 제거될 때마다 호출할 함수 등록"""
+        self._removal_listeners.append(listener)
+    
+    def search_similar_chunks(self, query: str, n_results: int = 5, exclude_figures: bool = False) -> List[Dict[str, Any]]:
+        """유사한 청크 검색 (exclude_figures=True면 그림 의존 청크 제외)"""
         if self.embedding_model is None or self.index is None:
             return []
         
@@ -496,12 +1256,15 @@ class PDFProcessor:
             query_embedding = self.embedding_model.encode([query])
             
             # FAISS 검색
-            distances, indices = self.index.search(query_embedding.astype('float32'), n_results)
+            with self._index_lock:
+                distances, indices = self.index.search(query_embedding.astype('float32'), n_results)
             
             # 결과 포맷팅
             results = []
             for i, (distance, idx) in enumerate(zip(distances[0], indices[0])):
                 if idx < len(self.metadata):
+                    if exclude_figures and requires_figure(self.metadata[idx], self.documents[idx]):
+                        continue
                     result = {
                         "rank": i + 1,
                         "distance": float(distance),
@@ -534,23 +1297,26 @@ class PDFProcessor:
     def _save_metadata(self):
         """메타데이터를 파일로 저장"""
         try:
-            metadata_file = self.vector_db_path / "metadata.json"
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "total_chunks": len(self.documents),
-                    "metadata": self.metadata,
-                    "last_updated": datetime.now().isoformat()
-                }, f, ensure_ascii=False, indent=2)
-            
-            # FAISS 인덱스 저장
-            if self.index:
-                index_file = self.vector_db_path / "faiss_index.bin"
-                faiss.write_index(self.index, str(index_file))
+            with self._index_lock:
+                metadata_file = self.vector_db_path / "metadata.json"
+                with open(metadata_file, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        "total_chunks": len(self.documents),
+                        "metadata": self.metadata,
+                        "last_updated": datetime.now().isoformat()
+                    }, f, ensure_ascii=False, indent=2)
+                
+                # FAISS 인덱스 저장
+                if self.index:
+                    index_file = self.vector_db_path / "faiss_index.bin"
+                    faiss.write_index(self.index, str(index_file))
             
             logger.info(f"✅ 메타데이터 및 인덱스 저장 완료")
+            return True
             
         except Exception as e:
             logger.error(f"메타데이터 저장 중 오류: {e}")
+            return False
     
     def load_existing_data(self):
         """기존 데이터 로드"""
@@ -564,6 +1330,10 @@ class PDFProcessor:
                     data = json.load(f)
                     self.metadata = data.get("metadata", [])
                     self.documents = [meta.get("text", "") for meta in self.metadata]
+                    self._indexed_keys = {
+                        f"{meta.get('subject')}:{meta['ingest_hash']}:{meta.get('chunk_index')}"
+                        for meta in self.metadata if meta.get("ingest_hash")
+                    }
                 
                 # FAISS 인덱스 로드
                 if faiss:
@@ -593,6 +1363,7 @@ class PDFProcessor:
         try:
             self.documents = []
             self.metadata = []
+            self._indexed_keys = set()
             if self.index:
                 self.index.reset()
             
@@ -605,13 +1376,17 @@ class PDFProcessor:
             if index_file.exists():
                 index_file.unlink()
             
+            # 수집 체크포인트 삭제
+            shutil.rmtree(self.checkpoint_path, ignore_errors=True)
+            self.checkpoint_path.mkdir(exist_ok=True)
+            
             logger.info("✅ 모든 데이터 삭제 완료")
             
         except Exception as e:
             logger.error(f"데이터 삭제 중 오류: {e}")
     
-    def get_extracted_questions(self, subject: str) -> List[Dict[str, Any]]:
-        """특정 시험의 추출된 문제 목록 조회 (TXT 파일만 사용)"""
+    def get_extracted_questions(self, subject: str, exclude_figures: bool = False) -> List[Dict[str, Any]]:
+        """특정 시험의 추출된 문제 목록 조회 (JSON 문제 은행 우선, 없으면 TXT 파일 사용)"""
         questions = []
         
         try:
@@ -629,12 +1404,20 @@ class PDFProcessor:
             
             for txt_file in matching_files:
                 try:
-                    txt_questions = self._parse_questions_from_txt(txt_file, subject)
+                    bank_file = txt_file.with_suffix(".json")
+                    if bank_file.exists():
+                        txt_questions = self._load_question_bank(bank_file)
+                    else:
+                        txt_questions = self._parse_questions_from_txt(txt_file, subject)
                     questions.extend(txt_questions)
                 except Exception as e:
                     logger.warning(f"⚠️ TXT 파일 읽기 오류 ({txt_file}): {e}")
                     continue
             
+            # 그림 의존 문제 제외 (수집 시 계산된 requires_figure 사용)
+            if exclude_figures:
+                questions = [question for question in questions if not requires_figure(question)]
+            
             # 문제 번호 순으로 정렬
             questions.sort(key=lambda x: int(x.get("number", 0)) if x.get("number", "0").isdigit() else 0)
             
@@ -646,6 +1429,22 @@ class PDFProcessor:
             logger.error(f"❌ 추출된 문제 조회 중 오류: {e}")
             return []
     
+    def _load_question_bank(self, bank_file: Path) -> List[Dict[str, Any]]:
+        """JSON 문제 은행에서 문제 목록 로드"""
+        with open(bank_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        questions = []
+        for question in data.get("questions", []):
+            question = dict(question)
+            question.setdefault("source_file", data.get("source_file") or "unknown")
+            question.setdefault("extraction_date", data.get("extraction_date", ""))
+            question.setdefault("bank_file", str(bank_file))
+            questions.append(question)
+        
+        logger.info(f"📄 {bank_file.name}: {len(questions)}개 문제 로드")
+        return questions
+    
     def _parse_questions_from_txt(self, txt_file: Path, subject: str) -> List[Dict[str, Any]]:
         """TXT 파일에서 문제들을 파싱 (개별 문제 분리)"""
         questions = []
@@ -781,9 +1580,10 @@ class PDFProcessor:
         
         return questions
     
-    def search_extracted_questions(self, query: str, subject: str, n_results: int = 5) -> List[Dict[str, Any]]:
+    def search_extracted_questions(self, query: str, subject: str, n_results: int = 5,
+                                   exclude_figures: bool = False) -> List[Dict[str, Any]]:
         """추출된 문제에서 검색"""
-        questions = self.get_extracted_questions(subject)
+        questions = self.get_extracted_questions(subject, exclude_figures)
         if not questions:
             return []
         
@@ -818,15 +1618,16 @@ class PDFProcessor:
         
         return None
     
-    def search_extracted_questions_semantic(self, query: str, subject: str, n_results: int = 5) -> List[Dict[str, Any]]:
+    def search_extracted_questions_semantic(self, query: str, subject: str, n_results: int = 5,
+                                           exclude_figures: bool = False) -> List[Dict[str, Any]]:
         """추출된 문제에서 semantic 검색"""
-        questions = self.get_extracted_questions(subject)
+        questions = self.get_extracted_questions(subject, exclude_figures)
         if not questions:
             return []
         
         if self.embedding_model is None:
             logger.warning("⚠️ 벡터 모델이 초기화되지 않아 키워드 검색으로 대체합니다.")
-            return self.search_extracted_questions(query, subject, n_results)
+            return self.search_extracted_questions(query, subject, n_results, exclude_figures)
         
         try:
             # 쿼리 벡터화
@@ -870,6 +1671,7 @@ class PDFProcessor:
                         "subject": subject,
                         "question_number": question_data["number"],
                         "pdf_source": pdf_source,
+                        "requires_figure": requires_figure(question_data),
                         "score": result["score"],
                         "rank": result["rank"]
                     },
@@ -881,7 +1683,7 @@ class PDFProcessor:
         except Exception as e:
             logger.error(f"❌ 추출된 문제 semantic 검색 중 오류: {e}")
             # 오류 발생 시 키워드 검색으로 대체
-            return self.search_extracted_questions(query, subject, n_results)
+            return self.search_extracted_questions(query, subject, n_results, exclude_figures)
 
 # 전역 PDF 프로세서 인스턴스
 pdf_processor = PDFProcessor() 
\ No newline at end of file
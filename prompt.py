@@ -200,6 +200,46 @@ class ExamPrompts:
         유형: [문제 유형]
         """
     
+    @staticmethod
+    def get_structured_question_prompt(base_prompt: str) -> str:
+        """구조화된 문제 생성 프롬프트 (생성 프롬프트의 응답 형식을 JSON으로 바꾸고 자체 검토까지 한 번에 요청)"""
+        return f"""
+        {base_prompt}
+        
+        **응답 형식 변경**: 위의 === 구역 형식 대신 아래 JSON 객체 하나로만 응답해주세요. 코드 블록이나 다른 텍스트는 포함하지 마세요.
+        {{
+          "question": "문제 내용만 (표가 있다면 Markdown 표 포함, 보기·정답·해설 제외)",
+          "options": ["보기1", "보기2", "보기3", "보기4"],
+          "answer": 정답 보기 번호(1~4, 주관식이면 정답 문자열),
+          "explanation": "문제 해설 및 관련 개념 설명",
+          "difficulty": "난이도",
+          "question_type": "문제 유형",
+          "self_check": {{"is_valid": true, "issues": []}}
+        }}
+        
+        - 주관식 문제는 options를 빈 배열로 두세요.
+        - 응답하기 전에 작성한 문제를 직접 검토해 self_check에 기록하세요.
+          (문제 명확성, 보기 중 정답이 하나뿐인지, 정답 정확성, 해설이 정답을 뒷받침하는지)
+          문제가 있으면 is_valid를 false로 하고 issues에 구체적인 지적 사항을 적어주세요.
+        """
+    
+    @staticmethod
+    def get_json_repair_prompt(raw_response: str, errors: list) -> str:
+        """구조화된 문제 응답 수리 프롬프트 (스키마 검증 실패 시)"""
+        error_list = "\n".join(f"- {error}" for error in errors)
+        return f"""
+        다음 응답이 문제 JSON 스키마를 만족하지 않습니다. 내용은 최대한 유지하고 오류만 고쳐서 JSON 객체 하나로만 다시 응답해주세요.
+        
+        === 스키마 오류 ===
+        {error_list}
+        
+        === 원본 응답 ===
+        {raw_response}
+        
+        필수 키: question(문자열), options(문자열 배열, 객관식은 4개), answer(정답 보기 번호 또는 주관식 정답),
+        explanation(문자열), self_check({{"is_valid": true/false, "issues": [문자열]}})
+        """
+    
     @staticmethod
     def get_answer_evaluation_prompt(question: str, user_answer: str) -> str:
         """답변 평가 프롬프트"""
@@ -445,6 +485,24 @@ class ChatPrompts:
 도우미: 기출문제를 바탕으로 답변드리겠습니다.
 
 """
+    
+    @staticmethod
+    def get_conversation_summary_prompt(previous_summary: str, conversation: str, max_chars: int) -> str:
+        """대화 요약 갱신 프롬프트 (이전 요약 + 새로 밀려난 대화 → 새 요약)"""
+        return f"""
+        학습 도우미와 사용자의 대화를 이어서 요약해주세요. 이전 요약에 새 대화 내용을 합쳐 하나의 요약으로 갱신합니다.
+        
+        === 이전 요약 ===
+        {previous_summary or "(없음)"}
+        
+        === 새 대화 ===
+        {conversation}
+        
+        **요약 규칙**:
+        1. 사용자가 물어본 주제, 확인한 개념·정의, 헷갈려한 부분, 앞으로 참고해야 할 사용자 선호를 남기세요.
+        2. 답변에서 인용한 기출문제 번호·출처는 유지하고, 인사말이나 반복 설명은 생략하세요.
+        3. {max_chars}자 이내의 글머리표로 작성하고, 요약 외의 다른 텍스트는 포함하지 마세요.
+        """
 
 class AnalysisPrompts:
     """분석 관련 프롬프트 클래스"""
@@ -0,0 +1,122 @@
+"""
+생성 문제 정적 검사
+파싱된 문제·정답·해설의 기계적인 결함(보기 개수, 정답 번호, 빈 해설, 문제 구역의 정답 노출)을 로컬에서 확인합니다.
+고칠 수 있는 결함은 바로 고치고, 확실한 결함은 거부하며, 확신이 낮을 때만 LLM 검토가 필요하다고 알려 줍니다.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from answer_key import OPTION_NUMERALS
+from grading import parse_options, normalize_choice, parse_correct_option
+
+# 객관식 문제의 최소 보기 개수
+MIN_OPTIONS = 4
+
+# 이보다 짧은 해설은 빈 해설로 취급
+MIN_EXPLANATION_CHARS = 10
+
+# 문제 구역에 새어 나온 정답 표시 (괄호로 감싼 표시나 줄 끝 표시만, 예: "(정답: ③)", "[답 4번]", "… 정답 2")
+# "(정답 2개)", "정답 3개를 모두 고르시오"처럼 개수를 나타내는 문제 문구는 제외
+LEAKED_ANSWER_PATTERN = re.compile(
+    r'\s*(?:[(\[]\s*(?:정\s*답|답)\s*[:：]?\s*[①②③④⑤1-5](?!\s*개)\s*(?:번)?\s*[)\]]'
+    r'|(?:정\s*답|(?<![가-힣])답)\s*[:：]?\s*[①②③④⑤1-5](?!\s*개)\s*(?:번)?\s*\.?\s*$)'
+)
+
+# 검사를 통과했을 때의 신뢰도 (객관식은 구조를 모두 확인할 수 있지만, 주관식은 정답 내용을 확인할 수 없음)
+OBJECTIVE_CONFIDENCE = 0.9
+SUBJECTIVE_CONFIDENCE = 0.5
+UNRESOLVED_ANSWER_CONFIDENCE = 0.4
+
+
+def _split_answer_sections(question_text: str) -> Tuple[str, str]:
+    """문제 텍스트를 정답 구역 이전(문제·보기)과 이후로 분리"""
+    marker = question_text.find("=== 정답 ===")
+    if marker == -1:
+        return question_text, ""
+    return question_text[:marker], question_text[marker:]
+
+
+def _strip_leaked_answer(question_part: str) -> Tuple[str, int]:
+    """=== 문제 === 구역의 정답 표시 제거 (제거한 개수 반환, 보기 구역은 건드리지 않음)"""
+    lines = question_part.split('\n')
+    has_heading = any("=== 문제 ===" in line for line in lines)
+    in_question = not has_heading
+    removed = 0
+    cleaned: List[str] = []
+    
+    for line in lines:
+        if "===" in line:
+            in_question = "=== 문제 ===" in line
+            cleaned.append(line)
+            continue
+        if in_question and LEAKED_ANSWER_PATTERN.search(line):
+            line, count = LEAKED_ANSWER_PATTERN.subn("", line)
+            removed += count
+            if not line.strip():
+                continue
+        cleaned.append(line)
+    
+    return '\n'.join(cleaned), removed
+
+
+def check_question(question: str, answer: Optional[str], explanation: Optional[str],
+                   question_type: Optional[str] = None) -> Dict[str, Any]:
+    """생성 문제 정적 검사 (status: pass / fixed / reject, confidence가 낮으면 LLM 검토 필요)"""
+    question = question or ""
+    answer = answer or ""
+    explanation = explanation or ""
+    issues: List[str] = []
+    fixes: List[str] = []
+    
+    # 1. 문제 구역에 노출된 정답 제거
+    question_part, answer_part = _split_answer_sections(question)
+    cleaned_part, leaked = _strip_leaked_answer(question_part)
+    if leaked:
+        question = cleaned_part + answer_part
+        fixes.append(f"문제 구역에 노출된 정답 표시 {leaked}개 제거")
+    
+    # 2. 객관식 보기·정답 번호 확인
+    options = parse_options(cleaned_part)
+    objective = bool(options) or question_type == "객관식"
+    confidence = SUBJECTIVE_CONFIDENCE
+    if objective:
+        if len(options) < MIN_OPTIONS:
+            issues.append(f"보기가 {len(options)}개뿐입니다. 보기를 {MIN_OPTIONS}개 이상 제시해주세요.")
+        
+        option = parse_correct_option(answer)
+        if option is None and options:
+            # 정답을 보기 번호 대신 보기 내용으로 쓴 경우 번호로 고침
+            option = normalize_choice(answer, options)
+            if option is not None:
+                answer = f"{OPTION_NUMERALS[option]} {options[option]}".strip()
+                fixes.append(f"정답을 보기 번호({OPTION_NUMERALS[option]})로 정리")
+        
+        if option is None:
+            confidence = UNRESOLVED_ANSWER_CONFIDENCE
+        elif options and option not in options:
+            issues.append(f"정답 {OPTION_NUMERALS.get(option, option)}이(가) 보기에 없습니다. 정답을 보기 중 하나로 수정해주세요.")
+        else:
+            confidence = OBJECTIVE_CONFIDENCE
+    
+    # 3. 해설 확인
+    if len(explanation.strip()) < MIN_EXPLANATION_CHARS:
+        issues.append("해설이 비어 있습니다. 정답인 이유를 설명하는 해설을 작성해주세요.")
+    
+    if issues:
+        status = "reject"
+    elif fixes:
+        status = "fixed"
+    else:
+        status = "pass"
+    
+    return {
+        "status": status,
+        "question": question,
+        "answer": answer,
+        "explanation": explanation,
+        "issues": issues,
+        "fixes": fixes,
+        "confidence": confidence,
+        "objective": objective
+    }
@@ -0,0 +1,145 @@
+"""
+문제 풀 (Question Pool)
+시험·난이도·문제 유형별로 검증·검토를 마친 문제를 백그라운드에서 미리 생성해 두고,
+"문제 생성" 클릭 시 바로 꺼내 줍니다. 풀이 하한 아래로 줄어들면 목표 크기까지 다시 채웁니다.
+"""
+
+import time
+import threading
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from config import Config
+from rate_limiter import rate_limiter, PRIORITY_BACKGROUND
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str, str]  # (시험 이름, 난이도, 문제 유형)
+
+
+class QuestionPool:
+    """시험·난이도·유형별 사전 생성 문제 풀"""
+    
+    def __init__(self, target_size: int = 2, low_water: int = 1, max_workers: int = 2):
+        self.target_size = target_size
+        self.low_water = low_water
+        self._pools: Dict[PoolKey, deque] = {}
+        self._in_flight: Dict[PoolKey, int] = {}
+        self._producer: Optional[Callable[[str, str, str], Optional[Dict[str, Any]]]] = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="question-pool")
+        self._generation = 0  # clear() 이전에 시작된 생산 결과를 버리기 위한 세대 번호
+        self._exam_generations: Dict[str, int] = {}  # clear(exam_name) 용 시험별 세대 번호
+        self._stats = {"hits": 0, "misses": 0, "refills": 0, "failures": 0, "refill_seconds": 0.0, "max_refill_seconds": 0.0}
+    
+    def set_producer(self, producer: Callable[[str, str, str], Optional[Dict[str, Any]]]):
+        """문제 생산 함수 등록 ((시험, 난이도, 유형) → 문제 dict 또는 None)"""
+        self._producer = producer
+    
+    def pop(self, exam_name: str, difficulty: str, question_type: str) -> Optional[Dict[str, Any]]:
+        """풀에서 문제 하나 꺼내기 (없으면 None, 하한 아래로 줄면 백그라운드 보충)"""
+        key = (exam_name, difficulty, question_type)
+        with self._lock:
+            pool = self._pools.get(key)
+            item = pool.popleft() if pool else None
+            self._stats["hits" if item else "misses"] += 1
+            hits, total = self._stats["hits"], self._stats["hits"] + self._stats["misses"]
+        logger.info(f"{'⚡' if item else '🕳️'} [문제 풀] {'적중' if item else '비어 있음'} {key} (적중률 {hits}/{total})")
+        self._schedule_refill(key)
+        return item
+    
+    def warm(self, exam_name: str, difficulties: Iterable[str], question_types: Iterable[str]):
+        """시험의 모든 난이도·유형 풀을 목표 크기까지 채우도록 예약 (이미 차 있으면 아무것도 하지 않음)"""
+        for difficulty in difficulties:
+            for question_type in question_types:
+                self._schedule_refill((exam_name, difficulty, question_type), fill=True)
+    
+    def _schedule_refill(self, key: PoolKey, fill: bool = False):
+        """풀 크기(생산 중 포함)가 하한 아래면 목표 크기까지 생산 작업 예약"""
+        if not Config.QUESTION_POOL_ENABLED or self._producer is None:
+            return
+        with self._lock:
+            available = len(self._pools.get(key, ())) + self._in_flight.get(key, 0)
+            if not fill and available >= self.low_water:
+                return
+            needed = self.target_size - available
+            if needed <= 0:
+                return
+            self._in_flight[key] = self._in_flight.get(key, 0) + needed
+            generation = self._generation_of(key)
+        for _ in range(needed):
+            self._executor.submit(self._produce, key, generation)
+    
+    def _generation_of(self, key: PoolKey) -> Tuple[int, int]:
+        """풀의 현재 세대 (전체 세대, 시험별 세대, 잠금 안에서 호출)"""
+        return self._generation, self._exam_generations.get(key[0], 0)
+    
+    def _produce(self, key: PoolKey, generation: Tuple[int, int]):
+        """문제 하나 생산 후 풀에 추가 (백그라운드 레인에서 실행)"""
+        started = time.perf_counter()
+        item = None
+        try:
+            with rate_limiter.lane(PRIORITY_BACKGROUND):
+                item = self._producer(*key)
+        except Exception as e:
+            logger.warning(f"⚠️ [문제 풀] {key} 생산 실패: {e}")
+        elapsed = time.perf_counter() - started
+        
+        with self._lock:
+            if generation != self._generation_of(key):
+                return
+            self._in_flight[key] = max(0, self._in_flight.get(key, 0) - 1)
+            if not item:
+                self._stats["failures"] += 1
+                return
+            self._pools.setdefault(key, deque()).append(item)
+            self._stats["refills"] += 1
+            self._stats["refill_seconds"] += elapsed
+            self._stats["max_refill_seconds"] = max(self._stats["max_refill_seconds"], elapsed)
+            size = len(self._pools[key])
+        logger.info(f"✅ [문제 풀] {key} 보충 완료 ({elapsed:.1f}초, 현재 {size}개)")
+    
+    def clear(self, exam_name: Optional[str] = None):
+        """풀 비우기 (exam_name이 없으면 전체, 진행 중인 생산 결과는 버림)"""
+        with self._lock:
+            if exam_name is None:
+                self._pools.clear()
+                self._in_flight.clear()
+                self._generation += 1
+            else:
+                for key in [key for key in self._pools if key[0] == exam_name]:
+                    del self._pools[key]
+                for key in [key for key in self._in_flight if key[0] == exam_name]:
+                    del self._in_flight[key]
+                self._exam_generations[exam_name] = self._exam_generations.get(exam_name, 0) + 1
+        logger.info(f"🗑️ [문제 풀] {'전체' if exam_name is None else exam_name} 풀 비움")
+    
+    def metrics(self) -> Dict[str, Any]:
+        """적중률·보충 지연 시간·풀 크기 지표"""
+        with self._lock:
+            stats = dict(self._stats)
+            sizes = {" / ".join(key): len(pool) for key, pool in self._pools.items()}
+            in_flight = sum(self._in_flight.values())
+        total = stats["hits"] + stats["misses"]
+        return {
+            "hit_rate": round(stats["hits"] / total, 3) if total else 0.0,
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "refills": stats["refills"],
+            "failures": stats["failures"],
+            "avg_refill_seconds": round(stats["refill_seconds"] / stats["refills"], 2) if stats["refills"] else 0.0,
+            "max_refill_seconds": round(stats["max_refill_seconds"], 2),
+            "in_flight": in_flight,
+            "pool_sizes": sizes,
+        }
+
+
+# 전역 문제 풀 인스턴스
+question_pool = QuestionPool(
+    target_size=Config.QUESTION_POOL_SIZE,
+    low_water=Config.QUESTION_POOL_LOW_WATER,
+    max_workers=Config.QUESTION_POOL_MAX_WORKERS,
+)
@@ -0,0 +1,100 @@
+"""
+문제 경계 스캐너
+시험 형식 프로필별 문제 번호 패턴을 하나의 정규식으로 미리 컴파일하여 문서를 한 번만 훑습니다.
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List
+
+# 문제 번호 규칙 (우선순위 순, {num}은 문제 번호 캡처 위치, 줄 앞 공백은 공통 처리)
+# 대시 접두사(- 108.)는 지원하는 규칙에 (?:-\s*)? 로 통합
+QUESTION_BOUNDARY_RULES = [
+    # 가장 일반적인 패턴들 (우선순위 높음)
+    ("dot", r'(?:-\s*)?{num}\.\s+'),  # 108. / - 108. (공백 필수)
+    ("paren", r'(?:-\s*)?{num}\)\s+'),  # 108) / - 108) (공백 필수)
+    
+    # 문제 번호만 있는 경우
+    ("dot_eol", r'(?:-\s*)?{num}\.\s*$'),  # 108. (줄 끝)
+    
+    # 괄호형
+    ("round_bracket", r'\({num}\)\s*'),  # (108)
+    ("square_bracket", r'\[{num}\]\s*'),  # [108]
+    ("lenticular_bracket", r'【{num}】\s*'),  # 【108】
+    ("angle_bracket", r'〈{num}〉\s*'),  # 〈108〉
+    
+    # 키워드형
+    ("keyword_munje", r'문제\s*{num}\s*[\.\)]?\s*'),  # 문제 108.
+    ("keyword_beon", r'{num}\s*번\s*[\.\)]?\s*'),  # 108번.
+    ("keyword_munhang", r'문항\s*{num}\s*[\.\)]?\s*'),  # 문항 108.
+    
+    # 번호 뒤 공백 없이 문제 지시문이 붙은 경우 (108.다음 중)
+    ("dot_stem", r'(?:-\s*)?{num}\.\s*(?:다음\s*중|올바른\s*것은|틀린\s*것은|적절한\s*것은|가장\s*적절한)'),
+]
+
+# 시험 형식 프로필별 사용 규칙
+QUESTION_FORMAT_PROFILES = {
+    "default": [name for name, _ in QUESTION_BOUNDARY_RULES],
+    "numbered": ["dot", "paren", "dot_eol", "dot_stem"],
+    "bracketed": ["round_bracket", "square_bracket", "lenticular_bracket", "angle_bracket"],
+    "keyword": ["keyword_munje", "keyword_beon", "keyword_munhang"],
+}
+
+NUMBER_PATTERN = r'(?P<{name}>\d{{1,3}})'
+
+
+class QuestionBoundaryScanner:
+    """형식 프로필의 규칙을 하나의 정규식으로 합친 문제 경계 스캐너"""
+    
+    def __init__(self, profile: str = "default"):
+        if profile not in QUESTION_FORMAT_PROFILES:
+            raise ValueError(f"알 수 없는 문제 형식 프로필: {profile}")
+        
+        self.profile = profile
+        enabled = set(QUESTION_FORMAT_PROFILES[profile])
+        self.rules = [name for name, _ in QUESTION_BOUNDARY_RULES if name in enabled]
+        
+        # 규칙별 번호 그룹 이름으로 일치한 규칙을 식별 (m.lastgroup)
+        alternatives = [
+            "(?:" + pattern.replace("{num}", NUMBER_PATTERN.format(name=name)) + ")"
+            for name, pattern in QUESTION_BOUNDARY_RULES if name in enabled
+        ]
+        self.pattern = re.compile(r'^\s*(?:' + "|".join(alternatives) + ")")
+    
+    def scan(self, lines: List[str]) -> List[Dict[str, Any]]:
+        """문서를 한 번 훑어 문제 번호 후보 위치 반환 (줄 번호, 문제 번호, 일치 규칙)"""
+        match_line = self.pattern.match
+        candidates = []
+        
+        for line_idx, line in enumerate(lines):
+            line = line.strip('\r')
+            if not line:
+                continue
+            
+            match = match_line(line)
+            if match is None:
+                continue
+            
+            rule = match.lastgroup
+            number = int(match.group(rule))
+            if 1 <= number <= 999:
+                candidates.append({
+                    "line_idx": line_idx,
+                    "number": number,
+                    "line": line,
+                    "rule": rule
+                })
+        
+        return candidates
+    
+    @staticmethod
+    def rule_counts(candidates: List[Dict[str, Any]]) -> Dict[str, int]:
+        """규칙별 일치 횟수 (진단용)"""
+        return dict(Counter(candidate["rule"] for candidate in candidates))
+
+
+@lru_cache(maxsize=None)
+def get_scanner(profile: str = "default") -> QuestionBoundaryScanner:
+    """형식 프로필별 스캐너 반환 (프로필마다 한 번만 컴파일)"""
+    return QuestionBoundaryScanner(profile)
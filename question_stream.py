@@ -0,0 +1,94 @@
+"""
+문제 응답 스트리밍 파서
+모델 응답을 조각 단위로 받아 줄 단위로 파싱하고, "=== 정답 ===" 이전의 문제·보기 부분만 누적합니다.
+정답·해설이 생성되는 동안에도 문제 본문을 먼저 표시할 수 있습니다.
+"""
+
+from typing import Callable, List, Optional
+
+# 문제 본문에서 제거할 안내 문구
+SKIP_TEXTS = [
+    "아래와 같이 요청하신 형식에 맞추어 정리해드립니다",
+    "위 컨텍스트를 참고하여",
+    "위 기출문제를",
+    "다음 형식으로 응답해주세요",
+    "출처: 기출문제 기반",
+    "출처: 기출문제"
+]
+
+
+class QuestionStreamParser:
+    """스트리밍 응답에서 문제와 보기 부분만 점진적으로 추출"""
+    
+    def __init__(self, source_info: Optional[Callable[[], str]] = None):
+        self.source_info = source_info  # 문제 정보의 "유형:" 다음에 붙일 출처 (없으면 생략)
+        self.chunks: List[str] = []
+        self.question_done = False  # "=== 정답 ===" 도달 여부
+        self._buffer = ""
+        self._question_lines: List[str] = []
+        self._in_problem_info = False
+    
+    @property
+    def text(self) -> str:
+        """지금까지 받은 전체 응답"""
+        return "".join(self.chunks)
+    
+    def feed(self, delta: str):
+        """응답 조각 추가 (완성된 줄만 파싱)"""
+        self.chunks.append(delta)
+        if self.question_done:
+            return
+        self._buffer += delta
+        *lines, self._buffer = self._buffer.split('\n')
+        for line in lines:
+            self._process_line(line)
+            if self.question_done:
+                break
+    
+    def finish(self):
+        """응답 종료 (마지막 줄 파싱)"""
+        if not self.question_done and self._buffer:
+            self._process_line(self._buffer)
+        self._buffer = ""
+    
+    def _process_line(self, line: str):
+        """한 줄 파싱 (문제 정보 구역 처리, 안내 문구 제거)"""
+        if "=== 정답 ===" in line:
+            self.question_done = True
+            return
+        if "=== 문제 정보 ===" in line:
+            self._in_problem_info = True
+            self._question_lines.append(line)
+            return
+        elif "===" in line and self._in_problem_info:
+            self._in_problem_info = False
+            self._question_lines.append(line)
+            return
+        
+        # 불필요한 텍스트 제거
+        if any(skip_text in line for skip_text in SKIP_TEXTS):
+            return
+        
+        self._question_lines.append(line)
+        
+        # 문제 정보 섹션의 유형 다음에 출처 정보 추가
+        if self._in_problem_info and "유형:" in line and self.source_info:
+            source = self.source_info()
+            if source:
+                self._question_lines.append(f"출처: {source}")
+    
+    def question_text(self, include_partial: bool = True) -> str:
+        """현재까지의 문제·보기 (Gradio Markdown 표시용, 진행 중인 줄 포함 여부 선택)"""
+        lines = list(self._question_lines)
+        # 구역 제목이 만들어지는 중인 줄은 깜빡이지 않도록 제외
+        if include_partial and not self.question_done and self._buffer and not self._buffer.lstrip().startswith("="):
+            lines.append(self._buffer)
+        
+        # Gradio Markdown에서 줄바꿈이 제대로 표시되도록 처리
+        result_text = '\n'.join(lines)
+        
+        # === 문제 === 다음에 줄바꿈 추가
+        result_text = result_text.replace("=== 문제 ===", "=== 문제 ===\n")
+        result_text = result_text.replace("=== 보기 ===", "\n=== 보기 ===\n")
+        
+        return result_text
@@ -0,0 +1,236 @@
+"""
+Azure OpenAI 클라이언트 측 속도 제한기
+배포의 분당 요청 수(RPM)·분당 토큰 수(TPM)를 토큰 버킷으로 지키고, 동시 요청 수를 제한합니다.
+대기 중인 요청은 우선순위 레인 순서로 처리되어 대화형 요청이 백그라운드 작업(정답 사전 계산, 문제 추출)보다 먼저 나갑니다.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+import logging
+import contextvars
+from contextlib import contextmanager, asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from token_budget import count_message_tokens
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 우선순위 레인 (숫자가 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+LANE_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BACKGROUND: "background"}
+
+# 대기열 선두가 아니거나 동시 요청 한도에 걸린 경우 다시 확인하는 간격(초)
+POLL_INTERVAL = 0.05
+
+# 이 시간(초) 이상 대기한 요청은 로그로 남김
+SLOW_WAIT_SECONDS = 1.0
+
+# 현재 실행 흐름의 우선순위 레인 (스레드·태스크별로 분리)
+_current_priority: contextvars.ContextVar[int] = contextvars.ContextVar("llm_priority", default=PRIORITY_INTERACTIVE)
+
+
+def estimate_tokens(messages: List[Dict[str, Any]], max_tokens: Optional[int] = None) -> int:
+    """요청 토큰 비용 추정 (로컬 토크나이저로 센 프롬프트 토큰 + 응답 토큰)"""
+    return count_message_tokens(messages) + (max_tokens or Config.LLM_COMPLETION_TOKEN_ESTIMATE)
+
+
+class RateLimiter:
+    """RPM/TPM 토큰 버킷과 동시 요청 수 제한을 함께 적용하는 우선순위 대기열"""
+    
+    def __init__(self, rpm: int, tpm: int, max_concurrency: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        # 버킷은 가득 찬 상태로 시작 (1분치 버스트 허용)
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._waiting: List[tuple] = []  # (우선순위, 순번, 티켓) 힙
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._stats = {
+            priority: {"requests": 0, "total_wait": 0.0, "max_wait": 0.0}
+            for priority in LANE_NAMES
+        }
+    
+    @contextmanager
+    def lane(self, priority: int):
+        """블록 안의 LLM 호출을 지정한 우선순위 레인으로 처리"""
+        token = _current_priority.set(priority)
+        try:
+            yield
+        finally:
+            _current_priority.reset(token)
+    
+    @staticmethod
+    def current_priority() -> int:
+        """현재 실행 흐름의 우선순위 레인"""
+        return _current_priority.get()
+    
+    def _refill(self, now: float):
+        """경과 시간만큼 버킷 보충"""
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        if self.rpm:
+            self._requests = min(float(self.rpm), self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(float(self.tpm), self._tokens + elapsed * self.tpm / 60)
+    
+    def _try_grant(self, ticket: object, cost: int, now: float) -> float:
+        """대기열 선두 요청에 용량 할당 (할당하면 0, 아니면 다시 확인할 때까지의 대기 시간)"""
+        self._refill(now)
+        if self._waiting[0][2] is not ticket:
+            return POLL_INTERVAL
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self.max_concurrency and self._in_flight >= self.max_concurrency:
+            return POLL_INTERVAL
+        
+        # 한 요청의 비용이 버킷 크기를 넘으면 버킷 전체로 제한 (영원히 대기하지 않도록)
+        cost = min(cost, self.tpm) if self.tpm else 0
+        waits = []
+        if self.rpm and self._requests < 1:
+            waits.append((1 - self._requests) * 60 / self.rpm)
+        if self.tpm and self._tokens < cost:
+            waits.append((cost - self._tokens) * 60 / self.tpm)
+        if waits:
+            return max(waits)
+        
+        if self.rpm:
+            self._requests -= 1
+        self._tokens -= cost
+        self._in_flight += 1
+        heapq.heappop(self._waiting)
+        return 0.0
+    
+    def _enqueue(self, priority: int) -> object:
+        """대기열에 요청 추가 (락을 잡은 상태에서 호출)"""
+        ticket = object()
+        heapq.heappush(self._waiting, (priority, next(self._sequence), ticket))
+        return ticket
+    
+    def _withdraw(self, ticket: object):
+        """할당받지 못한 요청을 대기열에서 제거 (취소·오류 시)"""
+        with self._cond:
+            self._waiting = [entry for entry in self._waiting if entry[2] is not ticket]
+            heapq.heapify(self._waiting)
+            self._cond.notify_all()
+    
+    def _record_wait(self, priority: int, waited: float, cost: int):
+        """레인별 대기 시간 기록"""
+        with self._cond:
+            stats = self._stats.setdefault(priority, {"requests": 0, "total_wait": 0.0, "max_wait": 0.0})
+            stats["requests"] += 1
+            stats["total_wait"] += waited
+            stats["max_wait"] = max(stats["max_wait"], waited)
+        if waited >= SLOW_WAIT_SECONDS:
+            logger.info(f"⏳ [속도 제한] {LANE_NAMES.get(priority, priority)} 요청 {waited:.2f}초 대기 (추정 {cost} 토큰)")
+    
+    def acquire(self, cost: int, priority: Optional[int] = None) -> float:
+        """요청 용량 확보 (확보될 때까지 대기, 대기한 시간(초) 반환)"""
+        priority = self.current_priority() if priority is None else priority
+        started = time.monotonic()
+        with self._cond:
+            ticket = self._enqueue(priority)
+            try:
+                while True:
+                    delay = self._try_grant(ticket, cost, time.monotonic())
+                    if delay == 0:
+                        break
+                    self._cond.wait(delay)
+            except BaseException:
+                self._waiting = [entry for entry in self._waiting if entry[2] is not ticket]
+                heapq.heapify(self._waiting)
+                raise
+            finally:
+                # 다음 선두 요청이 바로 확인하도록 깨움
+                self._cond.notify_all()
+        waited = time.monotonic() - started
+        self._record_wait(priority, waited, cost)
+        return waited
+    
+    async def aacquire(self, cost: int, priority: Optional[int] = None) -> float:
+        """요청 용량 확보 (이벤트 루프를 막지 않고 대기, 대기한 시간(초) 반환)"""
+        priority = self.current_priority() if priority is None else priority
+        started = time.monotonic()
+        with self._cond:
+            ticket = self._enqueue(priority)
+        try:
+            while True:
+                with self._cond:
+                    delay = self._try_grant(ticket, cost, time.monotonic())
+                    if delay == 0:
+                        self._cond.notify_all()
+                        break
+                await asyncio.sleep(min(delay, POLL_INTERVAL))
+        except BaseException:
+            self._withdraw(ticket)
+            raise
+        waited = time.monotonic() - started
+        self._record_wait(priority, waited, cost)
+        return waited
+    
+    def release(self):
+        """요청 완료 (동시 요청 수 반환)"""
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._cond.notify_all()
+    
+    @contextmanager
+    def slot(self, cost: int, priority: Optional[int] = None):
+        """요청 용량을 확보하고 블록이 끝나면 반환"""
+        self.acquire(cost, priority)
+        try:
+            yield
+        finally:
+            self.release()
+    
+    @asynccontextmanager
+    async def aslot(self, cost: int, priority: Optional[int] = None):
+        """요청 용량을 확보하고 블록이 끝나면 반환 (비동기)"""
+        await self.aacquire(cost, priority)
+        try:
+            yield
+        finally:
+            self.release()
+    
+    def pause(self, seconds: float):
+        """서버가 429를 반환하면 모든 레인의 새 요청을 잠시 멈춤"""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning(f"⚠️ [속도 제한] 429 응답으로 {seconds:.2f}초 동안 새 요청 중지")
+    
+    def metrics(self) -> Dict[str, Any]:
+        """레인별 대기 시간·대기열 길이 및 버킷 상태"""
+        with self._cond:
+            self._refill(time.monotonic())
+            queued: Dict[int, int] = {}
+            for priority, _, _ in self._waiting:
+                queued[priority] = queued.get(priority, 0) + 1
+            lanes = {
+                LANE_NAMES.get(priority, str(priority)): {
+                    "requests": stats["requests"],
+                    "avg_wait": round(stats["total_wait"] / stats["requests"], 3) if stats["requests"] else 0.0,
+                    "max_wait": round(stats["max_wait"], 3),
+                    "queued": queued.get(priority, 0),
+                }
+                for priority, stats in self._stats.items()
+            }
+            return {
+                "lanes": lanes,
+                "in_flight": self._in_flight,
+                "available_requests": round(self._requests, 1) if self.rpm else None,
+                "available_tokens": int(self._tokens) if self.tpm else None,
+            }
+
+
+# 전역 속도 제한기 인스턴스 (모든 Azure OpenAI 호출이 공유)
+rate_limiter = RateLimiter(Config.LLM_RPM_LIMIT, Config.LLM_TPM_LIMIT, Config.LLM_MAX_CONCURRENT_REQUESTS)
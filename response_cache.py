@@ -0,0 +1,172 @@
+"""
+LLM 응답 캐시
+같은 배포·시스템 프롬프트·사용자 프롬프트·온도로 보낸 요청은 TTL 안에서 저장된 응답을 재사용하고(정확 일치),
+AI 챗봇은 같은 시험의 이전 질문과 임베딩이 충분히 가까우면 그 답변을 재사용합니다(의미 기반).
+"""
+
+import os
+import json
+import atexit
+import time
+import hashlib
+import tempfile
+import threading
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from config import Config
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """TTL이 있는 영구 LLM 응답 캐시 (정확 일치 + 시험별 의미 기반)"""
+    
+    def __init__(self, cache_file: str = "response_cache.json"):
+        self.cache_file = Path(cache_file)
+        self.ttl_seconds = Config.LLM_CACHE_TTL_SECONDS
+        self.max_entries = Config.LLM_CACHE_MAX_ENTRIES
+        self.semantic_threshold = Config.LLM_CACHE_SEMANTIC_THRESHOLD
+        self.flush_delay = Config.LLM_CACHE_FLUSH_SECONDS
+        self._lock = threading.Lock()
+        self._data: Optional[Dict[str, Any]] = None
+        # 변경분은 지연 저장 타이머가 묶어서 파일에 기록 (이벤트 루프에서 요청마다 파일 전체를 다시 쓰지 않도록)
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
+        atexit.register(self.flush)
+    
+    @staticmethod
+    def make_key(deployment: str, messages: List[Dict[str, str]], temperature: float, params: Optional[Dict[str, Any]] = None) -> str:
+        """캐시 키 생성 (배포 이름, 시스템·사용자 프롬프트, 온도, 기타 생성 파라미터)"""
+        payload = json.dumps(
+            [deployment, [(m.get("role"), m.get("content")) for m in messages], temperature, params or {}],
+            ensure_ascii=False, sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _load(self) -> Dict[str, Any]:
+        """캐시 파일 로드 (최초 접근 시, 락을 잡은 상태에서 호출)"""
+        if self._data is None:
+            self._data = {"exact": {}, "semantic": {}}
+            if self.cache_file.exists():
+                try:
+                    with open(self.cache_file, "r", encoding="utf-8") as f:
+                        loaded = json.load(f)
+                    self._data["exact"] = loaded.get("exact", {})
+                    self._data["semantic"] = loaded.get("semantic", {})
+                except Exception as e:
+                    logger.warning(f"⚠️ 응답 캐시 로드 실패, 새로 시작: {e}")
+        return self._data
+    
+    def _save(self, data: Dict[str, Any]):
+        """캐시 파일 저장 (임시 파일에 쓴 뒤 교체, 지연 저장 스레드에서 락 밖에서 호출)"""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_file.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_file)
+        except Exception as e:
+            logger.warning(f"⚠️ 응답 캐시 저장 실패: {e}")
+    
+    def _mark_dirty(self):
+        """변경 표시 후 지연 저장 예약 (락을 잡은 상태에서 호출)"""
+        self._dirty = True
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def flush(self):
+        """변경된 캐시를 파일에 저장 (지연 저장 타이머와 프로세스 종료 시 호출)"""
+        with self._flush_lock:
+            with self._lock:
+                self._flush_timer = None
+                if not self._dirty or self._data is None:
+                    return
+                self._dirty = False
+                # 항목 dict는 저장 후 바뀌지 않으므로 컨테이너만 복사해 락 밖에서 직렬화
+                snapshot = {
+                    "exact": dict(self._data["exact"]),
+                    "semantic": {exam_name: list(entries) for exam_name, entries in self._data["semantic"].items()},
+                }
+            self._save(snapshot)
+    
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        """TTL 경과 여부"""
+        return now - entry.get("created_at", 0) > self.ttl_seconds
+    
+    def get(self, key: str) -> Optional[str]:
+        """정확 일치 캐시 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._load()["exact"].get(key)
+            if entry is None:
+                return None
+            if self._expired(entry, time.time()):
+                del self._data["exact"][key]
+                return None
+            return entry["content"]
+    
+    def put(self, key: str, content: str):
+        """정확 일치 캐시 저장 (최대 개수를 넘으면 오래된 항목부터 제거)"""
+        with self._lock:
+            exact = self._load()["exact"]
+            exact[key] = {"content": content, "created_at": time.time()}
+            if len(exact) > self.max_entries:
+                for old_key in sorted(exact, key=lambda k: exact[k]["created_at"])[:len(exact) - self.max_entries]:
+                    del exact[old_key]
+            self._mark_dirty()
+    
+    def semantic_get(self, exam_name: str, embedding: np.ndarray) -> Optional[Dict[str, Any]]:
+        """같은 시험에서 임베딩 유사도가 임계값 이상인 이전 질문의 답변 조회 ({"content", "question", "similarity"})"""
+        with self._lock:
+            entries = self._load()["semantic"].get(exam_name, [])
+            now = time.time()
+            entries[:] = [entry for entry in entries if not self._expired(entry, now)]
+            if not entries:
+                return None
+            query = np.asarray(embedding, dtype=np.float32).ravel()
+            matrix = np.asarray([entry["embedding"] for entry in entries], dtype=np.float32)
+            similarities = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query) + 1e-12)
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.semantic_threshold:
+                return None
+            return {"content": entries[best]["content"], "question": entries[best]["question"], "similarity": float(similarities[best])}
+    
+    def semantic_put(self, exam_name: str, question: str, embedding: np.ndarray, content: str):
+        """의미 기반 캐시 저장 (시험별 최대 개수를 넘으면 오래된 항목부터 제거)"""
+        with self._lock:
+            entries = self._load()["semantic"].setdefault(exam_name, [])
+            entries.append({
+                "question": question,
+                "embedding": np.asarray(embedding, dtype=np.float32).ravel().round(6).tolist(),
+                "content": content,
+                "created_at": time.time()
+            })
+            del entries[:-Config.LLM_CACHE_SEMANTIC_MAX_PER_EXAM]
+            self._mark_dirty()
+    
+    def clear_exam(self, exam_name: str):
+        """시험의 의미 기반 캐시 삭제 (시험 제거 시, 제거된 자료로 만든 답변이 재사용되지 않도록)"""
+        with self._lock:
+            if self._load()["semantic"].pop(exam_name, None) is None:
+                return
+            self._mark_dirty()
+        logger.info(f"🗑️ 응답 캐시 삭제 완료 ({exam_name})")
+    
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._data = {"exact": {}, "semantic": {}}
+            self._dirty = False
+            if self.cache_file.exists():
+                self.cache_file.unlink()
+        logger.info("🗑️ 응답 캐시 삭제 완료")
+
+
+# 전역 응답 캐시 인스턴스
+response_cache = ResponseCache()
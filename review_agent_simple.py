@@ -4,8 +4,7 @@
 
 import logging
 from typing import Dict, Any, List
-import openai
-from config import Config
+from llm_client import llm_client
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +16,10 @@ class SimpleReviewAgent:
         logger.info(f"✅ {self.name} 초기화 완료")
     
     def review_question(self, question: str, answer: str, explanation: str, exam_name: str = "정보시스템감리사") -> Dict[str, Any]:
+        """문제 검토 (동기 호출용)"""
+        return llm_client.run(self.areview_question(question, answer, explanation, exam_name))
+    
+    async def areview_question(self, question: str, answer: str, explanation: str, exam_name: str = "정보시스템감리사") -> Dict[str, Any]:
         """문제 검토"""
         try:
             logger.info("🔍 문제 검토 시작")
@@ -24,23 +27,22 @@ class SimpleReviewAgent:
             # 검토 프롬프트 생성
             review_prompt = self._create_review_prompt(question, answer, explanation)
             
-            # Azure OpenAI 설정은 이미 mvp_main.py에서 설정됨
-            
-            # Azure OpenAI API 호출
-            response = openai.chat.completions.create(
-                model=Config.DEPLOYMENT_NAME,
+            # Azure OpenAI API 호출 (비동기 클라이언트, 같은 문제는 응답 캐시 재사용)
+            response = await llm_client.cached_chat(
                 messages=[
                     {"role": "system", "content": self._get_system_prompt()},
                     {"role": "user", "content": review_prompt}
                 ],
                 temperature=0.3,
             )
+            content = response["content"]
             
-            if response.choices[0].message.content:
+            if content:
                 # 검토 결과 파싱
-                review_result = self._parse_review_result(response.choices[0].message.content)
+                review_result = self._parse_review_result(content)
+                review_result["cache_hit"] = response["cache_hit"]
                 
-                logger.info(f"✅ 문제 검토 완료 - 점수: {review_result.get('score', 0)}")
+                logger.info(f"✅ 문제 검토 완료 - 점수: {review_result.get('score', 0)} (캐시: {response['cache_hit']})")
                 return review_result
             else:
                 logger.error("❌ 문제 검토 실패")
@@ -137,6 +139,10 @@ class SimpleReviewAgent:
         return review_result
     
     def apply_corrections(self, question: str, answer: str, explanation: str, suggestions: List[str]) -> Dict[str, str]:
+        """수정 제안 적용 (동기 호출용)"""
+        return llm_client.run(self.aapply_corrections(question, answer, explanation, suggestions))
+    
+    async def aapply_corrections(self, question: str, answer: str, explanation: str, suggestions: List[str]) -> Dict[str, str]:
         """수정 제안 적용"""
         try:
             correction_prompt = f"""
@@ -166,10 +172,7 @@ class SimpleReviewAgent:
 [수정된 해설]
 """
             
-            # Azure OpenAI 설정은 이미 mvp_main.py에서 설정됨
-            
-            response = openai.chat.completions.create(
-                model=Config.DEPLOYMENT_NAME,
+            response = await llm_client.cached_chat(
                 messages=[
                     {"role": "system", "content": "당신은 시험 문제 수정 전문가입니다. 제안된 수정사항을 반영하여 문제를 개선해주세요."},
                     {"role": "user", "content": correction_prompt}
@@ -177,8 +180,10 @@ class SimpleReviewAgent:
                 temperature=0.3,
             )
             
-            if response.choices[0].message.content:
-                return self._parse_corrected_result(response.choices[0].message.content)
+            if response["content"]:
+                corrected = self._parse_corrected_result(response["content"])
+                corrected["cache_hit"] = response["cache_hit"]
+                return corrected
             
             return {}
             
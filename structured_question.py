@@ -0,0 +1,112 @@
+"""
+구조화된 문제 생성 (JSON)
+한 번의 호출로 문제·보기·정답·해설·자체 검토 결과를 JSON으로 받아 로컬에서 스키마를 검증하고,
+기존 === 문제 === / === 보기 === / === 정답 === / === 해설 === 형식으로 바꿔 나머지 흐름(출처 표시, 채점, 정적 검사)을 그대로 사용합니다.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from answer_key import OPTION_NUMERALS
+
+# 객관식 보기 개수 (보기 번호는 ①~⑤까지만 표시 가능)
+MIN_OPTIONS = 4
+MAX_OPTIONS = len(OPTION_NUMERALS)
+
+# 응답을 감싼 코드 블록 (```json ... ```)
+CODE_FENCE_PATTERN = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+
+
+def _extract_json(raw: str) -> str:
+    """응답에서 JSON 객체 부분만 추출 (코드 블록·앞뒤 안내 문구 제거)"""
+    text = CODE_FENCE_PATTERN.sub("", raw or "")
+    start, end = text.find("{"), text.rfind("}")
+    return text[start:end + 1] if start != -1 and end > start else text
+
+
+def _option_number(answer: Any, options: List[str]) -> Optional[int]:
+    """정답 값을 보기 번호로 해석 (번호, 원문자, 보기 내용 지원, 해석할 수 없으면 None)"""
+    if isinstance(answer, bool):
+        return None
+    if isinstance(answer, int):
+        return answer if 1 <= answer <= len(options) else None
+    text = str(answer).strip()
+    for number, symbol in OPTION_NUMERALS.items():
+        if number <= len(options) and (text.startswith(symbol) or re.match(rf'^{number}\s*(?:번|\)|\.|$)', text)):
+            return number
+    matches = [i for i, option in enumerate(options, 1) if option.strip() == text]
+    return matches[0] if len(matches) == 1 else None
+
+
+def validate_question_json(data: Any, question_type: Optional[str] = None) -> List[str]:
+    """구조화된 문제 스키마 검증 (오류 메시지 목록, 비어 있으면 통과)"""
+    if not isinstance(data, dict):
+        return ["응답이 JSON 객체가 아닙니다."]
+    
+    errors = []
+    if not isinstance(data.get("question"), str) or not data["question"].strip():
+        errors.append("question은 비어 있지 않은 문자열이어야 합니다.")
+    
+    options = data.get("options", [])
+    if not isinstance(options, list) or not all(isinstance(option, str) and option.strip() for option in options):
+        errors.append("options는 비어 있지 않은 문자열의 배열이어야 합니다.")
+        options = []
+    objective = bool(options) or question_type == "객관식"
+    if objective and not MIN_OPTIONS <= len(options) <= MAX_OPTIONS:
+        errors.append(f"객관식 options는 {MIN_OPTIONS}~{MAX_OPTIONS}개여야 합니다 (현재 {len(options)}개).")
+    
+    answer = data.get("answer")
+    if answer is None or (isinstance(answer, str) and not answer.strip()):
+        errors.append("answer가 비어 있습니다.")
+    elif objective and options and _option_number(answer, options) is None:
+        errors.append(f"answer({answer})는 options 중 하나의 번호(1~{len(options)})여야 합니다.")
+    
+    if not isinstance(data.get("explanation"), str) or not data["explanation"].strip():
+        errors.append("explanation은 비어 있지 않은 문자열이어야 합니다.")
+    
+    self_check = data.get("self_check")
+    if not isinstance(self_check, dict) or not isinstance(self_check.get("is_valid"), bool):
+        errors.append("self_check는 is_valid(true/false)와 issues(배열)를 가진 객체여야 합니다.")
+    elif not isinstance(self_check.get("issues", []), list):
+        errors.append("self_check.issues는 배열이어야 합니다.")
+    
+    return errors
+
+
+def parse_question_json(raw: str, question_type: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """모델 응답을 JSON으로 파싱하고 스키마 검증 ((데이터, 오류 목록))"""
+    try:
+        data = json.loads(_extract_json(raw))
+    except (json.JSONDecodeError, TypeError) as e:
+        return None, [f"JSON 파싱 실패: {e}"]
+    errors = validate_question_json(data, question_type)
+    return (None if errors else data), errors
+
+
+def render_question_text(data: Dict[str, Any], difficulty: str, question_type: str) -> str:
+    """검증된 JSON을 기존 문제 텍스트 형식으로 변환 (보기는 원문자 번호, 정답은 "③ 보기 내용")"""
+    options = [option.strip() for option in data.get("options", [])]
+    answer = data["answer"]
+    number = _option_number(answer, options) if options else None
+    if number is not None:
+        answer = f"{OPTION_NUMERALS[number]} {options[number - 1]}"
+    
+    sections = ["=== 문제 ===", data["question"].strip(), ""]
+    if options:
+        sections += ["=== 보기 ==="] + [f"{OPTION_NUMERALS[i]} {option}" for i, option in enumerate(options, 1)] + [""]
+    sections += ["=== 정답 ===", str(answer).strip(), "",
+                 "=== 해설 ===", data["explanation"].strip(), "",
+                 "=== 문제 정보 ===",
+                 f"난이도: {data.get('difficulty') or difficulty}",
+                 f"유형: {data.get('question_type') or question_type}"]
+    return "\n".join(sections)
+
+
+def self_check_issues(data: Dict[str, Any]) -> Optional[List[str]]:
+    """자체 검토 결과 (통과면 None, 부적합이면 지적 사항 목록)"""
+    self_check = data.get("self_check") or {}
+    if self_check.get("is_valid"):
+        return None
+    issues = [str(issue).strip() for issue in self_check.get("issues", []) if str(issue).strip()]
+    return issues or ["자체 검토에서 부적합으로 판정되었습니다. 문제를 다시 검토해주세요."]
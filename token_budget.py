@@ -0,0 +1,140 @@
+"""
+프롬프트 토큰 예산
+RAG 컨텍스트 조각과 대화 기록을 로컬 토크나이저로 측정해 호출 유형별 토큰 예산 안에 담습니다.
+예산을 넘으면 오래된 대화 기록부터 줄이고, 컨텍스트는 점수가 높은 조각부터 남깁니다.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from config import Config
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# tiktoken 관련 import (없으면 글자 수 기반 추정)
+try:
+    import tiktoken
+except ImportError:
+    logger.warning("tiktoken이 설치되지 않았습니다. 글자 수 기반으로 토큰 수를 추정합니다.")
+    tiktoken = None
+
+# 메시지당 역할·구분자 토큰
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# 호출 유형 (예산 설정 키)
+CALL_CHAT = "chat"
+CALL_GENERATION = "generation"
+
+_encoding = None
+_encoding_lock = threading.Lock()
+_encoding_failed = False
+
+
+def _get_encoding():
+    """tiktoken 인코딩 (처음 사용할 때 한 번 로드, 실패하면 추정으로 전환)"""
+    global _encoding, _encoding_failed
+    if tiktoken is None or _encoding_failed:
+        return None
+    if _encoding is None:
+        with _encoding_lock:
+            if _encoding is None and not _encoding_failed:
+                try:
+                    _encoding = tiktoken.get_encoding(Config.PROMPT_TOKENIZER_ENCODING)
+                except Exception as e:
+                    logger.warning(f"⚠️ [토큰 예산] 토크나이저 로드 실패 ({Config.PROMPT_TOKENIZER_ENCODING}), 글자 수 기반 추정 사용: {e}")
+                    _encoding_failed = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """텍스트 토큰 수 (tiktoken이 없으면 ASCII 4자당 1토큰, 한글 등은 1자당 1토큰으로 추정)"""
+    text = text or ""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars)
+
+
+def count_message_tokens(messages: List[Dict[str, Any]]) -> int:
+    """채팅 메시지 목록의 프롬프트 토큰 수"""
+    total = 0
+    for message in messages:
+        content = message.get("content") or ""
+        total += count_tokens(content if isinstance(content, str) else str(content)) + MESSAGE_OVERHEAD_TOKENS
+    return total
+
+
+class TokenBudgeter:
+    """호출 유형별 프롬프트 토큰 예산에 맞춰 컨텍스트 조각과 대화 기록 선택"""
+    
+    def budget_for(self, call_type: str) -> int:
+        """호출 유형별 프롬프트 토큰 예산 (0이면 제한 없음)"""
+        return {
+            CALL_CHAT: Config.CHAT_PROMPT_TOKEN_BUDGET,
+            CALL_GENERATION: Config.GENERATION_PROMPT_TOKEN_BUDGET,
+        }.get(call_type, 0)
+    
+    def pack(self, call_type: str, fixed: List[str], pieces: List[Dict[str, Any]],
+             history: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """고정 프롬프트(시스템·템플릿·질문)를 뺀 예산에 대화 기록(먼저 줄임)과 컨텍스트 조각(점수 순) 담기"""
+        history = list(history or [])
+        budget = self.budget_for(call_type)
+        ranked = sorted(pieces, key=lambda piece: piece.get("score", 0), reverse=True)
+        if budget <= 0:
+            return {"pieces": ranked, "history": history, "budget": budget,
+                    "dropped_pieces": 0, "dropped_history": 0}
+        
+        available = budget - sum(count_tokens(text) for text in fixed)
+        piece_tokens = [count_tokens(piece.get("content", "")) for piece in ranked]
+        
+        # 1. 대화 기록: 컨텍스트를 모두 담고 남는 예산 안에서 최근 기록부터
+        remaining = available - sum(piece_tokens)
+        kept_history: List[Any] = []
+        for turn in reversed(history):
+            tokens = count_tokens(self._turn_text(turn))
+            if tokens > remaining:
+                break
+            kept_history.insert(0, turn)
+            remaining -= tokens
+        
+        # 2. 컨텍스트 조각: 점수가 높은 순으로 남은 예산에 들어가는 것만
+        remaining = available - sum(count_tokens(self._turn_text(turn)) for turn in kept_history)
+        selected = []
+        for piece, tokens in zip(ranked, piece_tokens):
+            if tokens <= remaining:
+                selected.append(piece)
+                remaining -= tokens
+        
+        return {
+            "pieces": selected,
+            "history": kept_history,
+            "budget": budget,
+            "dropped_pieces": len(ranked) - len(selected),
+            "dropped_history": len(history) - len(kept_history)
+        }
+    
+    @staticmethod
+    def _turn_text(turn: Any) -> str:
+        """대화 기록 항목의 텍스트 (딕셔너리 또는 [사용자, 도우미] 형식)"""
+        if isinstance(turn, dict):
+            return f"{turn.get('role', '')}: {turn.get('content', '')}"
+        if isinstance(turn, (list, tuple)):
+            return "\n".join(str(part) for part in turn)
+        return str(turn)
+    
+    def log_prompt(self, call_type: str, messages: List[Dict[str, Any]], packed: Optional[Dict[str, Any]] = None) -> int:
+        """최종 프롬프트 토큰 수 로그 (요청마다 한 번)"""
+        tokens = count_message_tokens(messages)
+        budget = self.budget_for(call_type)
+        detail = ""
+        if packed:
+            detail = f", 제외: 컨텍스트 {packed['dropped_pieces']}개·대화 기록 {packed['dropped_history']}개"
+        logger.info(f"🧮 [토큰 예산] {call_type}: 프롬프트 {tokens}토큰 / 예산 {budget or '제한 없음'}{detail}")
+        return tokens
+
+
+# 전역 토큰 예산 인스턴스
+token_budgeter = TokenBudgeter()
@@ -4,6 +4,7 @@ FAISS를 사용한 문서 저장 및 검색
 """
 
 import os
+import threading
 from typing import List, Dict, Any, Optional
 import json
 from pathlib import Path
@@ -12,6 +13,8 @@ from datetime import datetime
 import numpy as np
 import logging
 
+from figure_rules import requires_figure
+
 # 로거 설정
 logger = logging.getLogger(__name__)
 
@@ -38,6 +41,10 @@ class VectorStore:
         self.documents = []
         self.metadata = []
         
+        # PDF 수집 배치 반영과 검색 간 동시 접근 방지
+        self._lock = threading.RLock()
+        self._ingested_keys = set()  # 반영된 PDF 청크 키 ({subject}:{pdf_hash}:{chunk_index})
+        
         self._initialize_models()
         self._load_existing_data()
     
@@ -81,6 +88,10 @@ class VectorStore:
                     data = json.load(f)
                     self.metadata = data.get("metadata", [])
                     self.documents = [meta.get("text", "") for meta in self.metadata]
+                    self._ingested_keys = {
+                        f"{meta.get('subject')}:{meta['ingest_hash']}:{meta.get('chunk_index')}"
+                        for meta in self.metadata if meta.get("ingest_hash")
+                    }
                 
                 # FAISS 인덱스 로드
                 self.index = faiss.read_index(str(index_file))
@@ -93,6 +104,51 @@ class VectorStore:
         
         return False
     
+    def add_indexed_batch(self, chunks: List[Dict[str, Any]], embeddings: np.ndarray):
+        """PDF 수집 중 인덱스에 반영된 청크 배치를 검색 대상에 추가 (저장은 PDF 처리기가 수행)"""
+        if self.index is None:
+            return
+        
+        with self._lock:
+            rows = [i for i, chunk in enumerate(chunks)
+                    if f"{chunk.get('subject')}:{chunk.get('ingest_hash')}:{chunk.get('chunk_index')}" not in self._ingested_keys]
+            if not rows:
+                return
+            
+            self.index.add(embeddings[rows].astype('float32'))
+            for i in rows:
+                metadata = dict(chunks[i], embedding_id=len(self.documents))
+                self.documents.append(metadata["text"])
+                self.metadata.append(metadata)
+                self._ingested_keys.add(f"{metadata.get('subject')}:{metadata.get('ingest_hash')}:{metadata.get('chunk_index')}")
+        
+        logger.info(f"✅ 수집 배치 검색 반영: {len(rows)}개 청크 (총 {len(self.documents)}개)")
+    
+    def remove_ingested(self, ingest_hash: str, filename: Optional[str] = None, subject: Optional[str] = None):
+        """개정판으로 대체되었거나 시험과 함께 제거된 PDF 버전의 청크를 검색 대상에서 제거 (저장은 PDF 처리기가 수행)"""
+        if self.index is None:
+            return
+        
+        with self._lock:
+            rows = [i for i, metadata in enumerate(self.metadata)
+                    if (subject is None or metadata.get("subject") == subject)
+                    and (metadata.get("ingest_hash") == ingest_hash
+                         or (filename and not metadata.get("ingest_hash") and metadata.get("pdf_source") == filename))]
+            if not rows:
+                return
+            
+            self.index.remove_ids(np.array(rows, dtype='int64'))
+            removed = set(rows)
+            removed_keys = {f"{self.metadata[i].get('subject')}:{self.metadata[i].get('ingest_hash')}:{self.metadata[i].get('chunk_index')}"
+                            for i in removed}
+            self.metadata = [metadata for i, metadata in enumerate(self.metadata) if i not in removed]
+            self.documents = [metadata.get("text", "") for metadata in self.metadata]
+            for i, metadata in enumerate(self.metadata):
+                metadata["embedding_id"] = i
+            self._ingested_keys -= removed_keys
+        
+        logger.info(f"🗑️ 이전 버전 청크 검색 제외: {len(rows)}개 (총 {len(self.documents)}개)")
+    
     def add_exam_question(self, question_data: Dict[str, Any]):
         """시험 문제 추가"""
         if self.embedding_model is None or self.index is None:
@@ -233,8 +289,8 @@ class VectorStore:
             return None
     
     def search_similar_questions(self, query: str, subject: Optional[str] = None, 
-                               n_results: int = 5) -> List[Dict[str, Any]]:
-        """유사한 문제 검색"""
+                               n_results: int = 5, exclude_figures: bool = False) -> List[Dict[str, Any]]:
+        """유사한 문제 검색 (exclude_figures=True면 그림 의존 문서 제외)"""
         if self.embedding_model is None or self.index is None:
             logger.error("벡터 모델이 초기화되지 않았습니다.")
             return []
@@ -251,7 +307,8 @@ class VectorStore:
             search_k = min(n_results * 2, len(self.documents))
             
             # FAISS 검색
-            distances, indices = self.index.search(query_embedding.astype('float32'), search_k)
+            with self._lock:
+                distances, indices = self.index.search(query_embedding.astype('float32'), search_k)
             
             # 결과가 비어있는지 확인
             if len(distances) == 0 or len(indices) == 0:
@@ -275,6 +332,10 @@ class VectorStore:
                 if metadata.get("type") and metadata.get("type") != "exam_question":
                     continue
                 
+                # 그림 의존 필터링 (수집 시 계산된 requires_figure 사용)
+                if exclude_figures and requires_figure(metadata, self.documents[idx]):
+                    continue
+                
                 result = {
                     "id": metadata.get("id"),
                     "content": self.documents[idx],